@@ -0,0 +1,98 @@
+# Copyright © 2020 Amazon Web Services
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Measures records/sec of serializing a batch of wellbore records.
+
+    python benchmarks/serialization_benchmark.py [number of records]
+"""
+import json
+import sys
+import time
+
+import osdu_api.model.base as base
+from osdu_api.model.legal.legal_compliance import LegalCompliance
+from osdu_api.model.storage.acl import Acl
+from osdu_api.model.storage.legal import Legal
+from osdu_api.model.storage.record import Record
+from osdu_api.model.storage.record_ancestry import RecordAncestry
+
+
+def make_records(count: int) -> list:
+    acl = Acl(['data.default.viewers@opendes.example.com'], ['data.default.owners@opendes.example.com'])
+    legal = Legal(['opendes-public-usa-dataset'], ['US'], LegalCompliance.compliant.name)
+    records = []
+    for i in range(count):
+        data = {
+            'FacilityName': 'Wellbore {}'.format(i),
+            'FacilityID': 'opendes:master-data--Wellbore:{}'.format(i),
+            'WellID': 'opendes:master-data--Well:{}:'.format(i // 3),
+            'VerticalMeasurements': [
+                {'VerticalMeasurementID': 'KB', 'VerticalMeasurement': 95.5 + i % 7, 'VerticalMeasurementPathID':
+                    'opendes:reference-data--VerticalMeasurementPath:ELEV:'},
+                {'VerticalMeasurementID': 'TD', 'VerticalMeasurement': 3210.25 + i, 'VerticalMeasurementPathID':
+                    'opendes:reference-data--VerticalMeasurementPath:MD:'},
+            ],
+            'SpatialLocation': {
+                'Wgs84Coordinates': {
+                    'type': 'FeatureCollection',
+                    'features': [{'type': 'Feature', 'properties': {},
+                                  'geometry': {'type': 'Point', 'coordinates': [5.98 + i * 1e-5, 58.87 - i * 1e-5]}}]
+                }
+            },
+            'NameAliases': [{'AliasName': 'WB-{}-{}'.format(i, j), 'AliasNameTypeID': 'opendes:reference-data--AliasNameType:UWBI:'}
+                            for j in range(3)],
+            'DrillingReasons': [],
+            'KickOffWellbore': None,
+            'TrajectoryTypeID': 'opendes:reference-data--WellboreTrajectoryType:Horizontal:',
+        }
+        records.append(Record(kind='opendes:wks:master-data--Wellbore:1.0.0', acl=acl, legal=legal, data=data,
+                              id='opendes:master-data--Wellbore:{}'.format(i), ancestry=RecordAncestry([]), meta=[]))
+    return records
+
+
+def legacy_to_json(record: Record) -> str:
+    # serialization of to_JSON before the compact mode was introduced
+    return json.dumps(record, default=lambda o: o.__dict__ if type(o) is not dict else record,
+                      sort_keys=True, indent=4)
+
+
+def measure(name: str, serialize, records: list):
+    started_at = time.perf_counter()
+    body = '[{}]'.format(','.join(serialize(record) for record in records))
+    elapsed = time.perf_counter() - started_at
+    print('{:<32} {:>12,.0f} records/sec {:>12,} bytes'.format(name, len(records) / elapsed, len(body)))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    records = make_records(count)
+    print('Serializing {:,} records'.format(count))
+
+    measure('legacy to_JSON()', legacy_to_json, records)
+    measure('to_JSON()', lambda record: record.to_JSON(), records)
+
+    orjson = base.orjson
+    base.orjson = None
+    try:
+        measure('to_JSON(compact=True), json', lambda record: record.to_JSON(compact=True), records)
+    finally:
+        base.orjson = orjson
+    if orjson is not None:
+        measure('to_JSON(compact=True), orjson', lambda record: record.to_JSON(compact=True), records)
+    else:
+        print('orjson is not installed, pip install osdu_api[fast-json] to compare')
+
+
+if __name__ == '__main__':
+    main()
@@ -17,10 +17,11 @@ import logging
 from abc import ABC, abstractmethod
 from functools import partial
 from http import HTTPStatus
-from typing import Callable, Union
+from typing import Callable, Hashable, Union
 
 import requests
 
+from osdu_api.auth.token_cache import TokenCache, is_token_expiring
 from osdu_api.exceptions.exceptions import TokenRefresherNotPresentError
 
 logger = logging.getLogger()
@@ -28,8 +29,15 @@ logger = logging.getLogger()
 
 class TokenRefresher(ABC):
 
-    def __init__(self):
+    def __init__(self, token_cache: TokenCache = None, cache_key: Hashable = None):
+        """
+        If a token cache is given (e.g. osdu_api.auth.token_cache.get_token_cache()),
+        tokens are shared with every refresher and client using the same cache key,
+        and refreshed shortly before they expire instead of after a 401 or 403.
+        """
         self._access_token = ""
+        self._token_cache = token_cache
+        self._cache_key = cache_key or type(self).__name__
 
     @abstractmethod
     def refresh_token(self) -> str:
@@ -39,10 +47,19 @@ class TokenRefresher(ABC):
         pass
 
     def authorize(self):
-        self._access_token = self.refresh_token()
+        token_cache = getattr(self, "_token_cache", None)
+        if token_cache is None:
+            self._access_token = self.refresh_token()
+        else:
+            self._access_token = token_cache.get_token(self._cache_key, self.refresh_token,
+                                                       stale_token=self._access_token or None)
 
     @property
     def access_token(self) -> str:
+        token_cache = getattr(self, "_token_cache", None)
+        if token_cache is not None and \
+                (not self._access_token or is_token_expiring(self._access_token, token_cache.refresh_margin)):
+            self._access_token = token_cache.get_token(self._cache_key, self.refresh_token)
         return self._access_token
 
     @property
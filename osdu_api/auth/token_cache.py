@@ -0,0 +1,143 @@
+#  Copyright 2020 Google LLC
+#  Copyright 2020 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+"""Process wide cache of access tokens refreshed shortly before they expire."""
+
+import base64
+import json
+import logging
+import threading
+import time
+from typing import Callable, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REFRESH_MARGIN = 60.0
+DEFAULT_TTL = 300.0
+
+
+def get_token_expiry(token: str) -> Optional[float]:
+    """
+    Read the 'exp' claim of a JWT without verifying its signature.
+
+    :param token: Access token, optionally prefixed with 'Bearer '
+    :type token: str
+    :return: Expiry as a unix timestamp, None if the token is not a JWT or has no 'exp' claim
+    :rtype: Optional[float]
+    """
+    if not token:
+        return None
+    if token.startswith('Bearer '):
+        token = token[len('Bearer '):]
+    parts = token.split('.')
+    if len(parts) != 3:
+        return None
+    try:
+        payload = parts[1] + '=' * (-len(parts[1]) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload)).get('exp')
+        return float(exp) if exp is not None else None
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
+def is_token_expiring(token: str, refresh_margin: float = DEFAULT_REFRESH_MARGIN) -> bool:
+    """
+    Check if a JWT expires within refresh_margin seconds. Tokens without a known expiry are never expiring.
+    """
+    expires_at = get_token_expiry(token)
+    return expires_at is not None and expires_at - refresh_margin <= time.time()
+
+
+class _CachedToken:
+
+    def __init__(self, token: str, expires_at: float):
+        self.token = token
+        self.expires_at = expires_at
+
+
+class TokenCache:
+    """
+    Thread-safe cache of access tokens. A token is served until refresh_margin seconds before
+    the expiry found in its 'exp' claim (or default_ttl seconds for opaque tokens). Refreshes are
+    single-flight: concurrent callers asking for the same key wait for one refresh.
+    """
+
+    def __init__(self, refresh_margin: float = DEFAULT_REFRESH_MARGIN, default_ttl: float = DEFAULT_TTL):
+        """
+        :param refresh_margin: Seconds before expiry when a token is refreshed, defaults to 60
+        :type refresh_margin: float, optional
+        :param default_ttl: Lifetime in seconds of tokens without 'exp' claim, defaults to 300
+        :type default_ttl: float, optional
+        """
+        self.refresh_margin = refresh_margin
+        self.default_ttl = default_ttl
+        self._tokens = {}
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+
+    def _get_lock(self, key: Hashable) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _is_usable(self, cached: Optional[_CachedToken], stale_token: Optional[str]) -> bool:
+        return cached is not None and cached.token != stale_token \
+            and cached.expires_at - self.refresh_margin > time.time()
+
+    def get_token(self, key: Hashable, fetch_token: Callable[[], str], stale_token: str = None) -> str:
+        """
+        Get the cached token for key, calling fetch_token when it is missing, about to expire,
+        or equal to stale_token.
+
+        :param key: Cache key, e.g. (provider, data_partition_id)
+        :type key: Hashable
+        :param fetch_token: Function returning a new token
+        :type fetch_token: Callable[[], str]
+        :param stale_token: Token rejected by a service (e.g. 401); it is not served again,
+            but a token refreshed meanwhile by another caller is, defaults to None
+        :type stale_token: str, optional
+        :return: Access token
+        :rtype: str
+        """
+        cached = self._tokens.get(key)
+        if self._is_usable(cached, stale_token):
+            return cached.token
+
+        with self._get_lock(key):
+            cached = self._tokens.get(key)
+            if self._is_usable(cached, stale_token):
+                return cached.token
+            logger.debug(f"Refreshing token for {key}.")
+            token = fetch_token()
+            expires_at = get_token_expiry(token) or time.time() + self.default_ttl
+            self._tokens[key] = _CachedToken(token, expires_at)
+            return token
+
+    def invalidate(self, key: Hashable = None):
+        """
+        Forget the token of key, or all tokens when key is None.
+        """
+        if key is None:
+            self._tokens.clear()
+        else:
+            self._tokens.pop(key, None)
+
+
+_token_cache = TokenCache()
+
+
+def get_token_cache() -> TokenCache:
+    """
+    Get the process wide token cache shared by all clients.
+    """
+    return _token_cache
@@ -0,0 +1,159 @@
+#  Copyright 2020 Google LLC
+#  Copyright 2020 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+"""Token store on local disk shared by the processes of a host, e.g. the tasks of an Airflow worker."""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from typing import Callable, Hashable, Optional
+
+from osdu_api.auth.token_cache import DEFAULT_REFRESH_MARGIN, DEFAULT_TTL, get_token_expiry
+from osdu_api.utils.file_lock import FileLock
+
+logger = logging.getLogger(__name__)
+
+# directory of the token store shared by the credentials, unset disables the store
+TOKEN_STORE_DIR_ENV = "OSDU_API_TOKEN_STORE_DIR"
+
+
+class FileTokenStore:
+    """
+    Access tokens stored as one file per key in a directory, readable only by its owner.
+
+    A token is served until refresh_margin seconds before its expiry, stored with it and taken
+    from its 'exp' claim (or default_ttl seconds for opaque tokens). Tokens are replaced
+    atomically, so they are read without locking; minting a token holds an exclusive file
+    lock of its key, so concurrent processes wait for a single mint.
+    """
+
+    def __init__(self, directory: str, refresh_margin: float = DEFAULT_REFRESH_MARGIN,
+                 default_ttl: float = DEFAULT_TTL, lock_timeout: Optional[float] = 300.0):
+        """
+        :param directory: The directory of the token files, created if missing
+        :type directory: str
+        :param refresh_margin: Seconds before expiry when a token is minted again, defaults to 60
+        :type refresh_margin: float, optional
+        :param default_ttl: Lifetime in seconds of tokens without 'exp' claim, defaults to 300
+        :type default_ttl: float, optional
+        :param lock_timeout: Seconds to wait for another process minting the token, defaults to 300
+        :type lock_timeout: Optional[float], optional
+        """
+        self.directory = directory
+        self.refresh_margin = refresh_margin
+        self.default_ttl = default_ttl
+        self.lock_timeout = lock_timeout
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+
+    def _get_path(self, key: Hashable) -> str:
+        name = hashlib.sha256(repr(key).encode()).hexdigest()
+        return os.path.join(self.directory, name)
+
+    def _read(self, path: str) -> Optional[dict]:
+        try:
+            with open(path + ".json") as entry_file:
+                entry = json.load(entry_file)
+            return entry if isinstance(entry, dict) and "token" in entry and "expires_at" in entry else None
+        except (OSError, ValueError):
+            return None
+
+    def _is_usable(self, entry: Optional[dict], stale_token: Optional[str]) -> bool:
+        return entry is not None and entry["token"] != stale_token \
+            and entry["expires_at"] - self.refresh_margin > time.time()
+
+    def _write(self, path: str, token: str, expires_at: float):
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        try:
+            with os.fdopen(fd, "w") as entry_file:
+                json.dump({"token": token, "expires_at": expires_at, "created_at": time.time()}, entry_file)
+            os.replace(temp_path, path + ".json")
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def get_token(self, key: Hashable, fetch_token: Callable[[], str], stale_token: str = None) -> str:
+        """
+        Get the stored token for key, calling fetch_token when it is missing, about to expire,
+        or equal to stale_token.
+
+        :param key: Store key identifying the identity and its configuration, its repr must be
+            stable across processes, e.g. a tuple of strings
+        :type key: Hashable
+        :param fetch_token: Function minting a new token
+        :type fetch_token: Callable[[], str]
+        :param stale_token: Token rejected by a service (e.g. 401); it is not served again,
+            but a token minted meanwhile by another process is, defaults to None
+        :type stale_token: str, optional
+        :return: Access token
+        :rtype: str
+        """
+        path = self._get_path(key)
+        entry = self._read(path)
+        if self._is_usable(entry, stale_token):
+            return entry["token"]
+
+        with FileLock(path + ".lock", timeout=self.lock_timeout):
+            entry = self._read(path)
+            if self._is_usable(entry, stale_token):
+                return entry["token"]
+            logger.debug(f"Minting token for {key}.")
+            token = fetch_token()
+            expires_at = get_token_expiry(token) or time.time() + self.default_ttl
+            try:
+                self._write(path, token, expires_at)
+            except OSError as err:
+                # the token is still valid for this process
+                logger.warning(f"Token for {key} not stored: {err}")
+            return token
+
+    def invalidate(self, key: Hashable = None):
+        """
+        Remove the token of key, or all tokens when key is None. Lock files are kept.
+        """
+        if key is not None:
+            paths = [self._get_path(key) + ".json"]
+        else:
+            paths = [os.path.join(self.directory, name) for name in os.listdir(self.directory)
+                     if name.endswith(".json")]
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+
+_token_stores = {}
+_token_stores_lock = threading.Lock()
+
+
+def get_token_store() -> Optional[FileTokenStore]:
+    """
+    Get the token store in the directory of the `OSDU_API_TOKEN_STORE_DIR` env var.
+
+    :return: The token store, None if the env var is not set
+    :rtype: Optional[FileTokenStore]
+    """
+    directory = os.environ.get(TOKEN_STORE_DIR_ENV)
+    if not directory:
+        return None
+    with _token_stores_lock:
+        if directory not in _token_stores:
+            _token_stores[directory] = FileTokenStore(directory)
+        return _token_stores[directory]
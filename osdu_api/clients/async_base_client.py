@@ -0,0 +1,176 @@
+# Copyright © 2020 Amazon Web Services
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+import functools
+import time
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from osdu_api.clients.base_client import BaseClient
+from osdu_api.clients.retry_policy import RetryPolicy
+from osdu_api.configuration.base_config_manager import BaseConfigManager
+from osdu_api.model.http_method import HttpMethod
+
+try:
+    import aiohttp
+except ImportError:  # aiohttp is only required by the asyncio clients
+    aiohttp = None
+
+DEFAULT_ASYNC_LIMIT = 100
+DEFAULT_ASYNC_LIMIT_PER_HOST = 0
+
+
+class AsyncBaseClient(BaseClient):
+    """
+    Asyncio counterpart of BaseClient that is meant to be combined with service specific clients,
+    e.g. class AsyncRecordClient(AsyncBaseClient, RecordClient).
+    make_request is a coroutine, so every service method that returns the result of make_request
+    returns an awaitable resolving to a requests.Response instead.
+    """
+
+    def __init__(self, config_manager: BaseConfigManager = None, data_partition_id = None, logger = None,
+                 session: "aiohttp.ClientSession" = None, retry_policy: RetryPolicy = None):
+        """
+        Async client gets initialized with the same configuration values and bearer token
+        as BaseClient. A single aiohttp session is used for all requests of the client; it
+        is created on first use unless one is passed, and must be released with close()
+        """
+        if aiohttp is None:
+            raise ImportError("aiohttp is required for the asyncio clients, install osdu_api[async]")
+        super().__init__(config_manager, data_partition_id, logger, retry_policy=retry_policy)
+        self._session = session
+        self._owns_session = session is None
+
+    def _parse_config(self, config_manager: BaseConfigManager = None, data_partition_id = None):
+        super()._parse_config(config_manager, data_partition_id)
+        self.async_limit = self.config_manager.getint('transport', 'async_limit', DEFAULT_ASYNC_LIMIT)
+        self.async_limit_per_host = self.config_manager.getint('transport', 'async_limit_per_host',
+                                                               DEFAULT_ASYNC_LIMIT_PER_HOST)
+
+    def _create_transport(self):
+        # requests are sent through the aiohttp session instead
+        return None
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.async_limit, limit_per_host=self.async_limit_per_host,
+                                             ssl=False)
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._owns_session = True
+        return self._session
+
+    async def close(self):
+        """
+        Close the aiohttp session if it was created by this client
+        """
+        if self._owns_session and self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def _refresh_service_principal_token_async(self, stale_token: str = None):
+        """
+        Refresh the service principal token without blocking the event loop,
+        the provider logic is synchronous
+        """
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, functools.partial(self._refresh_service_principal_token, stale_token))
+
+    async def _send(self, method: HttpMethod, url: str, data, headers: dict, params: dict) -> requests.Response:
+        session = self._get_session()
+        # like requests, leave out headers without a value (e.g. no bearer token)
+        headers = {key: value for key, value in headers.items() if value is not None}
+        async with session.request(method.name, url, params=_encode_params(params), data=data,
+                                   headers=headers) as response:
+            content = await response.read()
+            return _to_requests_response(response, content)
+
+    async def make_request(self, method: HttpMethod, url: str, data = '', add_headers = {}, params = {}, bearer_token = None):
+        """
+        Makes a request through the client's aiohttp session. Takes additional headers if
+        necessary. Returns a requests.Response so responses are handled the same way as
+        with the synchronous clients
+        """
+        if bearer_token is None and self._service_principal_token_expiring():
+            await self._refresh_service_principal_token_async(stale_token=self.service_principal_token)
+
+        headers = self._build_headers(add_headers, bearer_token)
+
+        if method in (HttpMethod.GET, HttpMethod.DELETE):
+            data = None
+
+        refreshed_token = False
+        started_at = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = await self._send(method, url, data, headers, params)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as err:
+                request_sent = not isinstance(err, aiohttp.ClientConnectorError)
+                delay = self.retry_policy.get_retry_delay(method, attempt, started_at, request_sent=request_sent)
+                if delay is None:
+                    raise
+                self.logger.warning(f"{method.name} {url} failed with {err!r}, retrying in {delay:.2f}s")
+                await asyncio.sleep(delay)
+                continue
+
+            if response.status_code in (401, 403) and not refreshed_token \
+                    and bearer_token is None and self.use_service_principal:
+                refreshed_token = True
+                await self._refresh_service_principal_token_async(stale_token=self.service_principal_token)
+                headers = self._build_headers(add_headers, None)
+                attempt -= 1
+                continue
+
+            delay = self.retry_policy.get_retry_delay(method, attempt, started_at, response=response)
+            if delay is None:
+                return response
+            self.logger.warning(f"{method.name} {url} returned {response.status_code}, retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+
+def _encode_params(params: dict) -> list:
+    """
+    Encode query parameters the way requests does: list values are repeated
+    and None values are dropped
+    """
+    encoded = []
+    for key, value in (params or {}).items():
+        values = value if isinstance(value, (list, tuple)) else [value]
+        for item in values:
+            if item is not None:
+                encoded.append((key, str(item)))
+    return encoded
+
+
+def _to_requests_response(response: "aiohttp.ClientResponse", content: bytes) -> requests.Response:
+    """
+    Build a requests.Response from an aiohttp response whose body was already read
+    """
+    result = requests.Response()
+    result.status_code = response.status
+    result.reason = response.reason
+    result.url = str(response.url)
+    result.headers = CaseInsensitiveDict(response.headers)
+    result.encoding = get_encoding_from_headers(result.headers)
+    result._content = content
+    result._content_consumed = True
+    return result
@@ -16,10 +16,16 @@ import os
 from configparser import SafeConfigParser
 import logging
 import os
+import time
 import requests
 
+from osdu_api.auth.token_cache import DEFAULT_REFRESH_MARGIN, get_token_cache, is_token_expiring
 from osdu_api.configuration.base_config_manager import BaseConfigManager
 from osdu_api.configuration.config_manager import DefaultConfigManager
+from osdu_api.clients.transport import (DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE, POOLED_TRANSPORT,
+                                        SIMPLE_TRANSPORT, HttpTransport, PooledTransport, SimpleTransport,
+                                        get_shared_transport)
+from osdu_api.clients.retry_policy import RetryPolicy
 from osdu_api.model.http_method import HttpMethod
 
 
@@ -28,13 +34,17 @@ class BaseClient:
     Base client that is meant to be extended by service specific clients
     """
 
-    def __init__(self, config_manager: BaseConfigManager = None, data_partition_id = None, logger = None):
+    def __init__(self, config_manager: BaseConfigManager = None, data_partition_id = None, logger = None,
+                 transport: HttpTransport = None, retry_policy: RetryPolicy = None):
         """
         Base client gets initialized with configuration values and a bearer token
-        based on provider-specific logic
+        based on provider-specific logic. Requests are sent through the given transport,
+        or through the one selected in the [transport] section of the configuration, and
+        retried according to the given retry policy or the [retry] section of the configuration
         """
         self._parse_config(config_manager, data_partition_id)
-        self.unauth_retries = 0
+        self.transport = transport or self._create_transport()
+        self.retry_policy = retry_policy or RetryPolicy.from_config(self.config_manager)
         if self.use_service_principal:
             self._refresh_service_principal_token()
         
@@ -68,24 +78,69 @@ class BaseClient:
         self.use_service_principal = self.config_manager.getbool('environment', 'use_service_principal', False)
         if self.use_service_principal:
             self.service_principal_module_name = self.config_manager.get('provider', 'service_principal_module_name')
+        self.use_token_cache = self.config_manager.getbool('token_cache', 'enabled', True)
+        self.token_refresh_margin = self.config_manager.getfloat('token_cache', 'refresh_margin', DEFAULT_REFRESH_MARGIN)
 
         if data_partition_id is None:
             self.data_partition_id = self.config_manager.get('environment', 'data_partition_id')
         else:
             self.data_partition_id = data_partition_id
 
-    def _refresh_service_principal_token(self):
+        self.transport_type = self.config_manager.get('transport', 'type', POOLED_TRANSPORT)
+        self.pool_connections = self.config_manager.getint('transport', 'pool_connections', DEFAULT_POOL_CONNECTIONS)
+        self.pool_maxsize = self.config_manager.getint('transport', 'pool_maxsize', DEFAULT_POOL_MAXSIZE)
+        self.pool_block = self.config_manager.getbool('transport', 'pool_block', False)
+        self.share_transport = self.config_manager.getbool('transport', 'shared', True)
+
+    def _create_transport(self) -> HttpTransport:
+        """
+        Build the transport selected in the configuration. Pooled transports are shared
+        by all clients of the process with the same pool settings unless sharing is disabled
+        """
+        if self.transport_type == SIMPLE_TRANSPORT:
+            return SimpleTransport()
+        if self.transport_type != POOLED_TRANSPORT:
+            raise ValueError(f"Unknown transport type '{self.transport_type}'. "
+                             f"Expected '{POOLED_TRANSPORT}' or '{SIMPLE_TRANSPORT}'.")
+        if self.share_transport:
+            return get_shared_transport(self.pool_connections, self.pool_maxsize, self.pool_block)
+        return PooledTransport(self.pool_connections, self.pool_maxsize, self.pool_block)
+
+    def _fetch_service_principal_token(self) -> str:
         """
         The path to the logic to get a valid bearer token is dynamically injected based on
         what provider and entitlements module name is provided in the configuration yaml
         """
         entitlements_client = importlib.import_module('osdu_api.providers.%s.%s' % (self.provider, self.service_principal_module_name))
-        self.service_principal_token = entitlements_client.get_service_principal_token()
+        return entitlements_client.get_service_principal_token()
 
-    def make_request(self, method: HttpMethod, url: str, data = '', add_headers = {}, params = {}, bearer_token = None):
+    def _refresh_service_principal_token(self, stale_token: str = None):
         """
-        Makes a request using python's built in requests library. Takes additional headers if
-        necessary
+        Set the service principal token. Unless disabled in the [token_cache] section, tokens
+        are taken from the process wide token cache keyed by provider and data partition, so
+        the provider round trip only happens when no client of the process holds a valid token
+
+        :param stale_token: Token rejected by a service, it is replaced even if not expired yet
+        :type stale_token: str, optional
+        """
+        if not self.use_token_cache:
+            self.service_principal_token = self._fetch_service_principal_token()
+            return
+        key = (self.provider, self.data_partition_id, self.service_principal_module_name)
+        self.service_principal_token = get_token_cache().get_token(key, self._fetch_service_principal_token,
+                                                                   stale_token=stale_token)
+
+    def _service_principal_token_expiring(self) -> bool:
+        """
+        Check if the service principal token is about to expire according to its 'exp' claim
+        """
+        return self.use_service_principal and \
+            is_token_expiring(getattr(self, 'service_principal_token', None), self.token_refresh_margin)
+
+    def _build_headers(self, add_headers = {}, bearer_token = None) -> dict:
+        """
+        Build the headers common to all OSDU requests, falling back to the
+        service principal token when no bearer token is given
         """
         if bearer_token is None:
             bearer_token = self.service_principal_token
@@ -103,23 +158,48 @@ class BaseClient:
             for key, value in add_headers.items():
                 headers[key] = value
 
-        response = object
-
-        if (method == HttpMethod.GET):
-            response = requests.get(url=url, params=params, headers=headers, verify=False)
-        elif (method == HttpMethod.DELETE):
-            response = requests.delete(url=url, params=params, headers=headers, verify=False)
-        elif (method == HttpMethod.POST):
-            response = requests.post(url=url, params=params, data=data, headers=headers, verify=False)
-        elif (method == HttpMethod.PUT):
-            response = requests.put(url=url, params=params, data=data, headers=headers, verify=False)
-
-        if (response.status_code == 401 or response.status_code == 403) and self.unauth_retries < 1:
-            if self.use_service_principal == 'True' or self.use_service_principal == 'true':
-                self.unauth_retries += 1
-                self._refresh_service_principal_token()
-                self.make_request(method, url, data, add_headers, params, None)
-
-        self.unauth_retries = 0
+        return headers
 
-        return response
+    def make_request(self, method: HttpMethod, url: str, data = '', add_headers = {}, params = {}, bearer_token = None):
+        """
+        Makes a request through the client's transport. Takes additional headers if
+        necessary
+        """
+        if bearer_token is None and self._service_principal_token_expiring():
+            self._refresh_service_principal_token(stale_token=self.service_principal_token)
+
+        headers = self._build_headers(add_headers, bearer_token)
+
+        if method in (HttpMethod.GET, HttpMethod.DELETE):
+            data = None
+
+        refreshed_token = False
+        started_at = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = self.transport.send(method, url=url, params=params, data=data, headers=headers)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as err:
+                request_sent = not isinstance(err, requests.exceptions.ConnectTimeout)
+                delay = self.retry_policy.get_retry_delay(method, attempt, started_at, request_sent=request_sent)
+                if delay is None:
+                    raise
+                self.logger.warning(f"{method.name} {url} failed with {err!r}, retrying in {delay:.2f}s")
+                time.sleep(delay)
+                continue
+
+            if response.status_code in (401, 403) and not refreshed_token \
+                    and bearer_token is None and self.use_service_principal:
+                # the service principal token may have expired, refresh it and send again once
+                refreshed_token = True
+                self._refresh_service_principal_token(stale_token=self.service_principal_token)
+                headers = self._build_headers(add_headers, None)
+                attempt -= 1
+                continue
+
+            delay = self.retry_policy.get_retry_delay(method, attempt, started_at, response=response)
+            if delay is None:
+                return response
+            self.logger.warning(f"{method.name} {url} returned {response.status_code}, retrying in {delay:.2f}s")
+            time.sleep(delay)
@@ -28,8 +28,8 @@ class DataWorkflowClient(BaseClient):
 
     def start_workflow(self, start_workflow: StartWorkflow, bearer_token=None):
         return self.make_request(method=HttpMethod.POST, url='{}{}'.format(self.data_workflow_url, '/startWorkflow'), 
-            data=start_workflow.to_JSON(), bearer_token=bearer_token)
+            data=start_workflow.to_JSON(compact=True), bearer_token=bearer_token)
     
     def update_status(self, update_status_request: UpdateStatusRequest, bearer_token=None):
         return self.make_request(method=HttpMethod.POST, url='{}{}'.format(self.data_workflow_url, '/updateStatus'), 
-            data=update_status_request.to_JSON(), bearer_token=bearer_token)
\ No newline at end of file
+            data=update_status_request.to_JSON(compact=True), bearer_token=bearer_token)
\ No newline at end of file
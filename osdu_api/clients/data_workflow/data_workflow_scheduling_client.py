@@ -28,14 +28,14 @@ class DataWorkflowSchedulingClient(BaseClient):
 
     def create_workflow_schedule(self, workflow_schedule: WorkflowSchedule, bearer_token=None):
         return self.make_request(method=HttpMethod.POST, url='{}{}'.format(self.data_workflow_url, '/scheduling'), 
-            data=workflow_schedule.to_JSON(), bearer_token=bearer_token)
+            data=workflow_schedule.to_JSON(compact=True), bearer_token=bearer_token)
     
     def list_workflow_schedules(self, bearer_token=None):
         return self.make_request(method=HttpMethod.GET, url='{}{}'.format(self.data_workflow_url, '/scheduling'), bearer_token=bearer_token)
 
     def get_workflow_schedules(self, get_workflow_schedules_request: GetWorkflowSchedulesRequest, bearer_token=None):
         return self.make_request(method=HttpMethod.POST, url='{}{}'.format(self.data_workflow_url, '/scheduling/getSchedules'), 
-            data=get_workflow_schedules_request.to_JSON(), bearer_token=bearer_token)
+            data=get_workflow_schedules_request.to_JSON(compact=True), bearer_token=bearer_token)
 
     def delete_workflow_schedule(self, workflow_schedule_name: str, bearer_token=None):
         return self.make_request(method=HttpMethod.DELETE, url='{}{}{}'.format(self.data_workflow_url, '/scheduling/', workflow_schedule_name), bearer_token=bearer_token)
@@ -35,4 +35,4 @@ class DatasetDmsClient(BaseClient):
     
     def get_multiple_retrieval_instructions(self, get_dataset_registry_request: GetDatasetRegistryRequest, bearer_token=None):
         return self.make_request(method=HttpMethod.POST, url='{}{}'.format(self.dataset_url, '/getRetrievalInstructions'), 
-            data=get_dataset_registry_request.to_JSON(), bearer_token=bearer_token)
+            data=get_dataset_registry_request.to_JSON(compact=True), bearer_token=bearer_token)
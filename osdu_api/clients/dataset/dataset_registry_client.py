@@ -27,7 +27,7 @@ class DatasetRegistryClient(BaseClient):
 
     def register_dataset(self, dataset_registries: CreateDatasetRegistriesRequest, bearer_token=None):
         return self.make_request(method=HttpMethod.PUT, url='{}{}'.format(self.dataset_url, '/registerDataset'), 
-            data=dataset_registries.to_JSON(), bearer_token=bearer_token)
+            data=dataset_registries.to_JSON(compact=True), bearer_token=bearer_token)
     
     def get_dataset_registry(self, record_id: str, bearer_token=None):
         params = {'id': record_id}
@@ -36,4 +36,4 @@ class DatasetRegistryClient(BaseClient):
     
     def get_dataset_registries(self, get_dataset_registry_request: GetDatasetRegistryRequest, bearer_token=None):
         return self.make_request(method=HttpMethod.POST, url='{}{}'.format(self.dataset_url, '/getDatasetRegistry'), 
-            data=get_dataset_registry_request.to_JSON(), bearer_token=bearer_token)
+            data=get_dataset_registry_request.to_JSON(compact=True), bearer_token=bearer_token)
@@ -39,8 +39,8 @@ class EntitlementsClient(BaseClient):
 
     def create_group(self, group: Group, bearer_token=None):
         return self.make_request(method=HttpMethod.POST, url='{}{}'.format(self.entitlements_url, '/groups'), 
-            data=group.to_JSON(), bearer_token=bearer_token)
+            data=group.to_JSON(compact=True), bearer_token=bearer_token)
     
     def create_group_member(self, group_email:str, group_member: GroupMember, bearer_token=None):
         return self.make_request(method=HttpMethod.POST, url='{}{}{}{}'.format(self.entitlements_url, '/groups/', group_email, '/members'), 
-            data=group_member.to_JSON(), bearer_token=bearer_token)
+            data=group_member.to_JSON(compact=True), bearer_token=bearer_token)
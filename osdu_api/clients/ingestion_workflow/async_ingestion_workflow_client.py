@@ -0,0 +1,22 @@
+# Copyright © 2020 Amazon Web Services
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from osdu_api.clients.async_base_client import AsyncBaseClient
+from osdu_api.clients.ingestion_workflow.ingestion_workflow_client import IngestionWorkflowClient
+
+
+class AsyncIngestionWorkflowClient(AsyncBaseClient, IngestionWorkflowClient):
+    """
+    Asyncio version of IngestionWorkflowClient, every method returns an awaitable
+    resolving to the response of Ingestion Workflow api
+    """
@@ -32,7 +32,7 @@ class IngestionWorkflowClient(BaseClient):
 
     def create_workflow(self, create_workflow_request: CreateWorkflowRequest, bearer_token=None):
         return self.make_request(method=HttpMethod.POST, url='{}{}'.format(self.ingestion_workflow_url, '/workflow'), 
-            data=create_workflow_request.to_JSON(), bearer_token=bearer_token)
+            data=create_workflow_request.to_JSON(compact=True), bearer_token=bearer_token)
 
     def get_all_workflows_in_partition(self, bearer_token=None):
         return self.make_request(method=HttpMethod.GET, url='{}{}'.format(self.ingestion_workflow_url, '/workflow'), 
@@ -45,7 +45,7 @@ class IngestionWorkflowClient(BaseClient):
 
     def trigger_workflow(self, trigger_workflow_request: TriggerWorkflowRequest, workflow_name: str, bearer_token=None):
         return self.make_request(method=HttpMethod.POST, url='{}{}{}{}'.format(self.ingestion_workflow_url, '/workflow/', workflow_name, '/workflowRun'), 
-            data=trigger_workflow_request.to_JSON(), bearer_token=bearer_token)
+            data=trigger_workflow_request.to_JSON(compact=True), bearer_token=bearer_token)
 
     def get_workflow_runs(self, workflow_name: str, bearer_token=None):
         return self.make_request(method=HttpMethod.GET, url='{}{}{}{}'.format(self.ingestion_workflow_url, '/workflow/', workflow_name, '/workflowRun'), 
@@ -57,4 +57,4 @@ class IngestionWorkflowClient(BaseClient):
 
     def update_workflow_run(self, update_workflow_run_request: UpdateWorkflowRunRequest, workflow_name: str, run_id: str, bearer_token=None):
         return self.make_request(method=HttpMethod.PUT, url='{}{}{}{}{}'.format(self.ingestion_workflow_url, '/workflow/', workflow_name, '/workflowRun/', run_id), 
-             data=update_workflow_run_request.to_JSON(), bearer_token=bearer_token)
\ No newline at end of file
+             data=update_workflow_run_request.to_JSON(compact=True), bearer_token=bearer_token)
\ No newline at end of file
@@ -31,7 +31,7 @@ class LegalClient(BaseClient):
 
     def create_legal_tag(self, legal_tag: LegalTag, bearer_token=None):
         return self.make_request(method=HttpMethod.POST, url='{}{}'.format(self.legal_url, '/legaltags'), 
-            data=legal_tag.to_JSON(), bearer_token=bearer_token)
+            data=legal_tag.to_JSON(compact=True), bearer_token=bearer_token)
     
     def delete_legal_tag(self, legal_tag_name: str, bearer_token=None):
         return self.make_request(method=HttpMethod.DELETE, url='{}{}/{}'.format(self.legal_url, '/legaltags', legal_tag_name), bearer_token=bearer_token)
@@ -41,15 +41,15 @@ class LegalClient(BaseClient):
 
     def update_legal_tag(self, update_legal_tag: UpdateLegalTag, bearer_token=None):
         return self.make_request(method=HttpMethod.PUT, url='{}{}'.format(self.legal_url, '/legaltags'), 
-            data=update_legal_tag.to_JSON(), bearer_token=bearer_token)
+            data=update_legal_tag.to_JSON(compact=True), bearer_token=bearer_token)
 
     def get_legal_tags(self, legal_tag_names: LegalTagNames, bearer_token=None):
         return self.make_request(method=HttpMethod.POST, url='{}{}'.format(self.legal_url, '/legaltags:batchRetrieve'), 
-            data=legal_tag_names.to_JSON(), bearer_token=bearer_token)
+            data=legal_tag_names.to_JSON(compact=True), bearer_token=bearer_token)
     
     def validate_legal_tags(self, legal_tag_names: LegalTagNames, bearer_token=None):
         return self.make_request(method=HttpMethod.POST, url='{}{}'.format(self.legal_url, '/legaltags:validate'), 
-            data=legal_tag_names.to_JSON(), bearer_token=bearer_token)
+            data=legal_tag_names.to_JSON(compact=True), bearer_token=bearer_token)
     
     def get_legal_tag_properties(self, bearer_token=None):
         return self.make_request(method=HttpMethod.GET, url='{}{}'.format(self.legal_url, '/legaltags:properties'), bearer_token=bearer_token)
@@ -0,0 +1,60 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.​
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import importlib
+import json
+
+import requests
+
+from osdu_api.clients.async_base_client import AsyncBaseClient
+from osdu_api.clients.partition.partition_client import PartitionClient
+from osdu_api.model.http_method import HttpMethod
+
+
+class AsyncPartitionClient(AsyncBaseClient, PartitionClient):
+    """Asyncio version of PartitionClient
+    """
+
+    async def get_partition(self, data_partition_id: str, bearer_token:str = None) -> dict:
+        """Same as PartitionClient.get_partition but awaits the partition service response
+
+        Args:
+            data_partition_id (str): standard OSDU data partition id (osdu, opendes, etc.)
+            bearer_token (str, optional): will be used instead of service principal token
+
+        Raises:
+            Exception: only when data partition id arg is empty
+            err: only when response from partition service is bad
+
+        Returns:
+            dict: CSP-specific partition info
+        """
+        if data_partition_id is None:
+            raise Exception("data partition id cannot be empty")
+
+        if bearer_token is None:
+            await self._refresh_service_principal_token_async()
+            bearer_token = self.service_principal_token
+            self.logger.info("Successfully retrieved token")
+
+        partition_info_converter_module_name = self.config_manager.get('provider', 'partition_info_converter_module')
+        partition_info_converter = importlib.import_module('osdu_api.providers.%s.%s' % (self.provider, partition_info_converter_module_name))
+
+        response = await self.make_request(method=HttpMethod.GET, url='{}{}/{}'.format(self.partition_url, '/partitions', data_partition_id),
+            bearer_token=bearer_token)
+        try:
+            response.raise_for_status()
+        except requests.exceptions.HTTPError as err:
+            self.logger.error(f"Received status code {response.status_code} from partition service")
+            raise err
+        return partition_info_converter.convert(json.loads(response.content))
@@ -0,0 +1,172 @@
+# Copyright © 2020 Amazon Web Services
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Retry policy applied by BaseClient to every request."""
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import requests
+
+from osdu_api.configuration.base_config_manager import BaseConfigManager
+from osdu_api.model.http_method import HttpMethod
+
+IDEMPOTENT_METHODS = frozenset([HttpMethod.GET, HttpMethod.PUT, HttpMethod.DELETE])
+DEFAULT_RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+TOO_MANY_REQUESTS = 429
+
+
+class RetryPolicy:
+    """
+    Decides whether a failed request is sent again and how long to wait before doing so.
+
+    Throttled requests (429) never reached the service logic and are retried for every method.
+    Server errors and errors raised while the request may already have been processed are only
+    retried for idempotent methods (GET, PUT, DELETE) unless retry_non_idempotent is set.
+    Delays grow exponentially with full jitter, the Retry-After header of the response takes
+    precedence when present. No attempt is started once the deadline would be exceeded.
+    """
+
+    def __init__(self, max_attempts: int = 3, backoff_factor: float = 0.5, max_backoff: float = 30.0,
+                 deadline: float = 120.0, retry_statuses=DEFAULT_RETRY_STATUSES,
+                 retry_non_idempotent: bool = False, respect_retry_after: bool = True):
+        """
+        :param max_attempts: Maximum number of attempts including the first one, 1 disables retries
+        :type max_attempts: int
+        :param backoff_factor: Base delay in seconds, the n-th retry waits up to backoff_factor * 2 ** (n - 1)
+        :type backoff_factor: float
+        :param max_backoff: Upper bound of a single delay in seconds
+        :type max_backoff: float
+        :param deadline: Total time in seconds after which no more attempts are started, None for no limit
+        :type deadline: float
+        :param retry_statuses: Http statuses that are retried
+        :param retry_non_idempotent: Retry POST and PATCH requests on server errors too
+        :type retry_non_idempotent: bool
+        :param respect_retry_after: Wait for the duration given in the Retry-After header
+        :type respect_retry_after: bool
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.deadline = deadline
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_non_idempotent = retry_non_idempotent
+        self.respect_retry_after = respect_retry_after
+
+    @classmethod
+    def from_config(cls, config_manager: BaseConfigManager) -> "RetryPolicy":
+        """
+        Build the policy from the [retry] section of the configuration, missing options keep their defaults.
+
+        :param config_manager: ConfigManager to get configs
+        :type config_manager: BaseConfigManager
+        :return: Configured retry policy
+        :rtype: RetryPolicy
+        """
+        deadline = config_manager.getfloat('retry', 'deadline', 120.0)
+        retry_statuses = config_manager.get('retry', 'retry_statuses', '')
+        return cls(
+            max_attempts=config_manager.getint('retry', 'max_attempts', 3),
+            backoff_factor=config_manager.getfloat('retry', 'backoff_factor', 0.5),
+            max_backoff=config_manager.getfloat('retry', 'max_backoff', 30.0),
+            deadline=deadline if deadline > 0 else None,
+            retry_statuses=[int(status) for status in retry_statuses.split(',')] if retry_statuses.strip()
+            else DEFAULT_RETRY_STATUSES,
+            retry_non_idempotent=config_manager.getbool('retry', 'retry_non_idempotent', False),
+            respect_retry_after=config_manager.getbool('retry', 'respect_retry_after', True)
+        )
+
+    def is_retryable(self, method: HttpMethod, response: requests.Response = None, request_sent: bool = True) -> bool:
+        """
+        Check if the outcome of an attempt may be retried regardless of the attempts left.
+
+        :param method: Http method of the request
+        :type method: HttpMethod
+        :param response: Response of the attempt, None if it failed with a connection error
+        :type response: requests.Response, optional
+        :param request_sent: False if the connection failed before the request was sent
+        :type request_sent: bool
+        :return: True if the request may be sent again
+        :rtype: bool
+        """
+        safe_to_repeat = method in IDEMPOTENT_METHODS or self.retry_non_idempotent
+        if response is None:
+            return safe_to_repeat or not request_sent
+        if response.status_code not in self.retry_statuses:
+            return False
+        return safe_to_repeat or response.status_code == TOO_MANY_REQUESTS
+
+    def get_backoff(self, attempt: int) -> float:
+        """
+        Exponential backoff with full jitter for the given (1-based) attempt that just failed.
+        """
+        return random.uniform(0, min(self.max_backoff, self.backoff_factor * 2 ** (attempt - 1)))
+
+    @staticmethod
+    def get_retry_after(response: requests.Response) -> Optional[float]:
+        """
+        Parse the Retry-After header given either as seconds or as an http date.
+
+        :return: Delay in seconds or None when the header is absent or invalid
+        :rtype: float
+        """
+        if response is None:
+            return None
+        retry_after = response.headers.get('Retry-After')
+        if not retry_after:
+            return None
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError, IndexError):
+            return None
+        return max(0.0, retry_at.timestamp() - time.time())
+
+    def get_retry_delay(self, method: HttpMethod, attempt: int, started_at: float,
+                        response: requests.Response = None, request_sent: bool = True) -> Optional[float]:
+        """
+        Get the delay before the next attempt.
+
+        :param method: Http method of the request
+        :type method: HttpMethod
+        :param attempt: Number of the attempt that just finished, starting at 1
+        :type attempt: int
+        :param started_at: time.monotonic() value when the first attempt started
+        :type started_at: float
+        :param response: Response of the attempt, None if it failed with a connection error
+        :type response: requests.Response, optional
+        :param request_sent: False if the connection failed before the request was sent
+        :type request_sent: bool
+        :return: Delay in seconds, or None if the request must not be retried
+        :rtype: Optional[float]
+        """
+        if attempt >= self.max_attempts or not self.is_retryable(method, response, request_sent):
+            return None
+
+        delay = self.get_backoff(attempt)
+        if self.respect_retry_after:
+            retry_after = self.get_retry_after(response)
+            if retry_after is not None:
+                delay = retry_after
+
+        if self.deadline is not None and time.monotonic() - started_at + delay > self.deadline:
+            return None
+        return delay
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
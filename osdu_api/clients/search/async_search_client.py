@@ -0,0 +1,62 @@
+# Copyright © 2020 Amazon Web Services
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import copy
+from typing import AsyncIterator, Tuple
+
+from osdu_api.clients.async_base_client import AsyncBaseClient
+from osdu_api.clients.search.search_client import DEFAULT_MAX_PREFETCH_BYTES, DEFAULT_PREFETCH_PAGES, SearchClient
+from osdu_api.model.search.query_request import QueryRequest
+from osdu_api.utils.prefetch import prefetch_async
+
+
+class AsyncSearchClient(AsyncBaseClient, SearchClient):
+    """
+    Asyncio version of SearchClient, every method returns an awaitable
+    resolving to the response of Search api
+    """
+
+    async def iter_query_pages(self, query_request: QueryRequest, prefetch_pages: int = DEFAULT_PREFETCH_PAGES,
+                               max_prefetch_bytes: int = DEFAULT_MAX_PREFETCH_BYTES,
+                               bearer_token = None) -> AsyncIterator[dict]:
+        """
+        Same as SearchClient.iter_query_pages, iterated with async for
+        """
+        pages = prefetch_async(self._iter_cursor_pages(query_request, bearer_token), depth=prefetch_pages,
+                               max_bytes=max_prefetch_bytes, size_of=lambda page: page[1])
+        try:
+            async for page, _ in pages:
+                yield page
+        finally:
+            await pages.aclose()
+
+    async def iter_query_results(self, query_request: QueryRequest, prefetch_pages: int = DEFAULT_PREFETCH_PAGES,
+                                 max_prefetch_bytes: int = DEFAULT_MAX_PREFETCH_BYTES,
+                                 bearer_token = None) -> AsyncIterator[dict]:
+        """
+        Same as SearchClient.iter_query_results, iterated with async for
+        """
+        async for page in self.iter_query_pages(query_request, prefetch_pages, max_prefetch_bytes, bearer_token):
+            for result in page.get('results') or []:
+                yield result
+
+    async def _iter_cursor_pages(self, query_request: QueryRequest, bearer_token = None) -> AsyncIterator[Tuple[dict, int]]:
+        query_request = copy.copy(query_request)
+        while True:
+            response = await self.query_with_cursor(query_request, bearer_token=bearer_token)
+            response.raise_for_status()
+            page = response.json()
+            yield page, len(response.content)
+            query_request.cursor = page.get('cursor')
+            if not query_request.cursor or not page.get('results'):
+                return
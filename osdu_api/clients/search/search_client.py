@@ -11,13 +11,18 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import copy
 import json
-from typing import List
+from typing import Iterator, List, Tuple
 
 from osdu_api.clients.base_client import BaseClient
 from osdu_api.model.http_method import HttpMethod
 from osdu_api.model.search.query_request import QueryRequest
 from osdu_api.model.search.query_response import QueryResponse
+from osdu_api.utils.prefetch import PrefetchIterator
+
+DEFAULT_PREFETCH_PAGES = 1
+DEFAULT_MAX_PREFETCH_BYTES = 64 * 1024 * 1024
 
 
 class SearchClient(BaseClient):
@@ -27,8 +32,49 @@ class SearchClient(BaseClient):
 
     def query_records(self, query_request: QueryRequest, bearer_token = None):
         return self.make_request(method=HttpMethod.POST, url='{}{}'.format(self.search_url, '/query'), 
-            data=query_request.to_JSON(), bearer_token=bearer_token)
+            data=query_request.to_JSON(compact=True), bearer_token=bearer_token)
 
     def query_with_cursor(self, query_request: QueryRequest, bearer_token = None):
         return self.make_request(method=HttpMethod.POST, url='{}{}'.format(self.search_url, '/query_with_cursor'), 
-            data=query_request.to_JSON(), bearer_token=bearer_token)
+            data=query_request.to_JSON(compact=True), bearer_token=bearer_token)
+
+    def iter_query_pages(self, query_request: QueryRequest, prefetch_pages: int = DEFAULT_PREFETCH_PAGES,
+                         max_prefetch_bytes: int = DEFAULT_MAX_PREFETCH_BYTES, bearer_token = None) -> Iterator[dict]:
+        """
+        Follows the cursor of query_with_cursor starting at query_request, yielding the decoded
+        response of every page (results, totalCount, cursor). While a page is processed, up to
+        prefetch_pages next pages are fetched in the background as long as the buffered responses
+        take less than max_prefetch_bytes. Raises requests.HTTPError when a page cannot be fetched.
+        query_request is not modified
+
+        Example:
+        for page in search_client.iter_query_pages(QueryRequest(kind='osdu:wks:*:*', query='*', limit=1000)):
+            print(len(page['results']))
+        """
+        pages = PrefetchIterator(self._iter_cursor_pages(query_request, bearer_token), depth=prefetch_pages,
+                                 max_bytes=max_prefetch_bytes, size_of=lambda page: page[1])
+        with pages:
+            for page, _ in pages:
+                yield page
+
+    def iter_query_results(self, query_request: QueryRequest, prefetch_pages: int = DEFAULT_PREFETCH_PAGES,
+                           max_prefetch_bytes: int = DEFAULT_MAX_PREFETCH_BYTES, bearer_token = None) -> Iterator[dict]:
+        """
+        Same as iter_query_pages, yielding the results of the pages one by one
+        """
+        for page in self.iter_query_pages(query_request, prefetch_pages, max_prefetch_bytes, bearer_token):
+            yield from page.get('results') or []
+
+    def _iter_cursor_pages(self, query_request: QueryRequest, bearer_token = None) -> Iterator[Tuple[dict, int]]:
+        """
+        Yields the decoded pages of a cursor query with the size of their response in bytes
+        """
+        query_request = copy.copy(query_request)
+        while True:
+            response = self.query_with_cursor(query_request, bearer_token=bearer_token)
+            response.raise_for_status()
+            page = response.json()
+            yield page, len(response.content)
+            query_request.cursor = page.get('cursor')
+            if not query_request.cursor or not page.get('results'):
+                return
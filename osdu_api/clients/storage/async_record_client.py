@@ -0,0 +1,98 @@
+# Copyright © 2020 Amazon Web Services
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+from typing import AsyncIterator, Iterable
+
+from osdu_api.clients.async_base_client import AsyncBaseClient
+from osdu_api.clients.storage.record_client import (DEFAULT_MAX_WORKERS, MAX_RECORD_IDS_PER_QUERY,
+                                                    MAX_RECORDS_PER_REQUEST, MAX_REQUEST_BYTES, RecordClient,
+                                                    _add_batch_response, _add_fetch_response, _batch_records,
+                                                    _chunk_ids)
+from osdu_api.model.http_method import HttpMethod
+from osdu_api.model.storage.bulk_upsert_result import BatchFailure, BulkUpsertResult
+from osdu_api.model.storage.fetch_records_result import FetchRecordsResult
+from osdu_api.model.storage.query_records_request import QueryRecordsRequest
+from osdu_api.model.storage.record import Record
+
+
+class AsyncRecordClient(AsyncBaseClient, RecordClient):
+    """
+    Asyncio version of RecordClient, every method returns an awaitable
+    resolving to the response of Storage's record api
+    """
+
+    async def bulk_create_update_records(self, records: Iterable[Record], batch_size: int = MAX_RECORDS_PER_REQUEST,
+                                         max_batch_bytes: int = MAX_REQUEST_BYTES,
+                                         max_workers: int = DEFAULT_MAX_WORKERS,
+                                         bearer_token = None) -> BulkUpsertResult:
+        """
+        Same as RecordClient.bulk_create_update_records, with up to max_workers batches in flight on the event loop
+        """
+        result = BulkUpsertResult()
+        url = '{}{}'.format(self.storage_url, '/records')
+        in_flight = asyncio.Semaphore(max_workers)
+
+        async def send_batch(record_ids: list, body: str):
+            try:
+                response = await self.make_request(method=HttpMethod.PUT, url=url, data=body, bearer_token=bearer_token)
+            except Exception as err:
+                result.failures.append(BatchFailure(record_ids, reason=repr(err)))
+            else:
+                _add_batch_response(result, record_ids, response)
+            finally:
+                in_flight.release()
+
+        tasks = []
+        for record_ids, body in _batch_records(records, batch_size, max_batch_bytes):
+            await in_flight.acquire()
+            tasks.append(asyncio.ensure_future(send_batch(record_ids, body)))
+        await asyncio.gather(*tasks)
+        return result
+
+    def fetch_records(self, record_ids: Iterable[str], batch_size: int = MAX_RECORD_IDS_PER_QUERY,
+                      max_workers: int = DEFAULT_MAX_WORKERS, bearer_token = None) -> FetchRecordsResult:
+        """
+        Same as RecordClient.fetch_records, the result is iterated with async for
+        """
+        result = FetchRecordsResult()
+        result._records = self._iter_fetched_records(result, record_ids, batch_size, max_workers, bearer_token)
+        return result
+
+    async def _iter_fetched_records(self, result: FetchRecordsResult, record_ids: Iterable[str], batch_size: int,
+                                    max_workers: int, bearer_token) -> AsyncIterator[dict]:
+        async def fetch_batch(batch: list) -> list:
+            try:
+                response = await self.query_records(QueryRecordsRequest(batch), bearer_token=bearer_token)
+            except Exception as err:
+                result.failures.append(BatchFailure(batch, reason=repr(err)))
+                return []
+            return _add_fetch_response(result, batch, response)
+
+        pending = set()
+        try:
+            for batch in _chunk_ids(record_ids, batch_size):
+                if len(pending) >= max_workers:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        for record in task.result():
+                            yield record
+                pending.add(asyncio.ensure_future(fetch_batch(batch)))
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    for record in task.result():
+                        yield record
+        finally:
+            for task in pending:
+                task.cancel()
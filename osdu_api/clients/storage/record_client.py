@@ -12,13 +12,25 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import json
-from typing import List
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterable, Iterator, List, Tuple
+
+import requests
 
 from osdu_api.clients.base_client import BaseClient
 from osdu_api.model.http_method import HttpMethod
+from osdu_api.model.storage.bulk_upsert_result import BatchFailure, BulkUpsertResult
+from osdu_api.model.storage.fetch_records_result import FetchRecordsResult
 from osdu_api.model.storage.query_records_request import QueryRecordsRequest
 from osdu_api.model.storage.record import Record
 
+# limits of storage's createOrUpdateRecords endpoint
+MAX_RECORDS_PER_REQUEST = 500
+MAX_REQUEST_BYTES = 8 * 1024 * 1024
+# limit of storage's fetch records endpoint
+MAX_RECORD_IDS_PER_QUERY = 100
+DEFAULT_MAX_WORKERS = 4
+
 
 class RecordClient(BaseClient):
     """
@@ -42,13 +54,36 @@ class RecordClient(BaseClient):
         data = {'id': 'test'}
         record = Record(id, version, kind, acl, legal, data, ancestry, meta)
         """
-        records_data = '['
-        for record in records:
-            records_data = '{}{}{}'.format(records_data, record.to_JSON(), ',')
-        records_data = records_data[:-1]
-        records_data = '{}{}'.format(records_data, ']')
+        records_data = '[{}]'.format(','.join(record.to_JSON(compact=True) for record in records))
         return self.make_request(method=HttpMethod.PUT, url='{}{}'.format(self.storage_url, '/records'), data=records_data, bearer_token=bearer_token)
 
+    def bulk_create_update_records(self, records: Iterable[Record], batch_size: int = MAX_RECORDS_PER_REQUEST,
+                                   max_batch_bytes: int = MAX_REQUEST_BYTES, max_workers: int = DEFAULT_MAX_WORKERS,
+                                   bearer_token = None) -> BulkUpsertResult:
+        """
+        Calls storage's api endpoint createOrUpdateRecords for an arbitrarily large iterable of records.
+        Records are serialized as they are consumed and split into batches of at most batch_size records
+        and max_batch_bytes bytes, which are sent by up to max_workers concurrent requests. At most
+        2 * max_workers batches are held in memory at a time.
+        Returns a BulkUpsertResult aggregating the responses; batches storage did not accept are
+        reported in its failures instead of raising
+        """
+        result = BulkUpsertResult()
+        url = '{}{}'.format(self.storage_url, '/records')
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = {}
+            for record_ids, body in _batch_records(records, batch_size, max_batch_bytes):
+                if len(pending) >= 2 * max_workers:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        _add_batch_result(result, pending.pop(future), future)
+                future = executor.submit(self.make_request, method=HttpMethod.PUT, url=url, data=body,
+                                         bearer_token=bearer_token)
+                pending[future] = record_ids
+            for future in list(pending):
+                _add_batch_result(result, pending.pop(future), future)
+        return result
+
     def get_latest_record(self, recordId: str, attributes: List[str] = [], bearer_token = None):
         """
         Calls storage's api endpoint getLatestRecordVersion taking the required attributes
@@ -78,7 +113,48 @@ class RecordClient(BaseClient):
     
     def query_records(self, query_records_request: QueryRecordsRequest, bearer_token = None):
         return self.make_request(method=HttpMethod.POST, url='{}{}'.format(self.storage_url, '/query/records'), 
-            data=query_records_request.to_JSON(), bearer_token=bearer_token)
+            data=query_records_request.to_JSON(compact=True), bearer_token=bearer_token)
+
+    def fetch_records(self, record_ids: Iterable[str], batch_size: int = MAX_RECORD_IDS_PER_QUERY,
+                      max_workers: int = DEFAULT_MAX_WORKERS, bearer_token = None) -> FetchRecordsResult:
+        """
+        Fetches the latest version of an arbitrarily large iterable of record ids through storage's
+        api endpoint fetchRecords. Ids are split into batches of at most batch_size ids, which are
+        queried by up to max_workers concurrent requests; at most 2 * max_workers batches are in flight.
+        Returns a FetchRecordsResult to iterate over the decoded records in the order the batches
+        complete. Ids storage reports as invalid, does not return, or whose batch failed are
+        collected on the result while iterating instead of raising
+
+        Example:
+        result = record_client.fetch_records(record_ids)
+        for record in result:
+            ...
+        print(result.failed_record_ids)
+        """
+        result = FetchRecordsResult()
+        result._records = self._iter_fetched_records(result, record_ids, batch_size, max_workers, bearer_token)
+        return result
+
+    def _iter_fetched_records(self, result: FetchRecordsResult, record_ids: Iterable[str], batch_size: int,
+                              max_workers: int, bearer_token) -> Iterator[dict]:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = {}
+            try:
+                for batch in _chunk_ids(record_ids, batch_size):
+                    if len(pending) >= 2 * max_workers:
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield from _get_fetched_records(result, pending.pop(future), future)
+                    future = executor.submit(self.query_records, QueryRecordsRequest(batch), bearer_token=bearer_token)
+                    pending[future] = batch
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield from _get_fetched_records(result, pending.pop(future), future)
+            finally:
+                # iteration stopped early, do not send the batches not started yet
+                for future in pending:
+                    future.cancel()
 
     #ingest bulk records which is coming as JSON response -- Start
     def ingest_records(self, records, bearer_token = None):
@@ -93,3 +169,85 @@ class RecordClient(BaseClient):
     def query_record(self, recordId: str, bearer_token = None):
         return self.make_request(method=HttpMethod.GET, url=('{}{}/{}'.format(self.storage_url, '/records', recordId)), bearer_token=bearer_token)
     
+
+
+def _batch_records(records: Iterable[Record], batch_size: int, max_batch_bytes: int) -> Iterator[Tuple[list, str]]:
+    """
+    Serialize records lazily and group them into request bodies bounded by record count and size.
+    A single record bigger than max_batch_bytes is sent on its own.
+    Yields the ids of the records of a batch and the json body
+    """
+    record_ids, serialized, size = [], [], 2
+    for record in records:
+        record_json = record.to_JSON(compact=True)
+        record_size = len(record_json.encode('utf-8')) + 1
+        if serialized and (len(serialized) >= batch_size or size + record_size > max_batch_bytes):
+            yield record_ids, '[{}]'.format(','.join(serialized))
+            record_ids, serialized, size = [], [], 2
+        record_ids.append(record.id)
+        serialized.append(record_json)
+        size += record_size
+    if serialized:
+        yield record_ids, '[{}]'.format(','.join(serialized))
+
+
+def _add_batch_response(result: BulkUpsertResult, record_ids: list, response: requests.Response):
+    """
+    Merge the createOrUpdateRecords response of a batch into result
+    """
+    if not response.ok:
+        result.failures.append(BatchFailure(record_ids, response.status_code, response.text))
+        return
+    content = response.json() if response.content else {}
+    result.record_count += content.get('recordCount', 0)
+    result.record_ids.extend(content.get('recordIds') or [])
+    result.skipped_record_ids.extend(content.get('skippedRecordIds') or [])
+    result.record_id_versions.extend(content.get('recordIdVersions') or [])
+
+
+def _chunk_ids(record_ids: Iterable[str], batch_size: int) -> Iterator[list]:
+    batch = []
+    for record_id in record_ids:
+        batch.append(record_id)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _add_fetch_response(result: FetchRecordsResult, record_ids: list, response: requests.Response) -> list:
+    """
+    Merge the fetchRecords response of a batch into result and return the records it contains
+    """
+    if not response.ok:
+        result.failures.append(BatchFailure(record_ids, response.status_code, response.text))
+        return []
+    content = response.json() if response.content else {}
+    records = content.get('records') or []
+    invalid_record_ids = content.get('invalidRecords') or []
+    retry_record_ids = content.get('retryRecords') or []
+    result.invalid_record_ids.extend(invalid_record_ids)
+    result.retry_record_ids.extend(retry_record_ids)
+    # storage silently leaves out records the caller is not authorized to read
+    returned = set(invalid_record_ids).union(retry_record_ids, (record.get('id') for record in records))
+    result.missing_record_ids.extend(record_id for record_id in record_ids if record_id not in returned)
+    return records
+
+
+def _get_fetched_records(result: FetchRecordsResult, record_ids: list, future) -> list:
+    try:
+        response = future.result()
+    except Exception as err:
+        result.failures.append(BatchFailure(record_ids, reason=repr(err)))
+        return []
+    return _add_fetch_response(result, record_ids, response)
+
+
+def _add_batch_result(result: BulkUpsertResult, record_ids: list, future):
+    try:
+        response = future.result()
+    except Exception as err:
+        result.failures.append(BatchFailure(record_ids, reason=repr(err)))
+    else:
+        _add_batch_response(result, record_ids, response)
@@ -27,4 +27,4 @@ class SchemaClient(BaseClient):
 
     def create_schema(self, schema: Schema, bearer_token=None):
         return self.make_request(method=HttpMethod.POST, url='{}{}'.format(self.storage_url, '/schemas'), 
-            data=schema.to_JSON(), bearer_token=bearer_token)
+            data=schema.to_JSON(compact=True), bearer_token=bearer_token)
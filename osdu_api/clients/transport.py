@@ -0,0 +1,131 @@
+# Copyright © 2020 Amazon Web Services
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""HTTP transports used by BaseClient to send requests."""
+
+import abc
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from osdu_api.model.http_method import HttpMethod
+
+SIMPLE_TRANSPORT = 'simple'
+POOLED_TRANSPORT = 'pooled'
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+
+
+class HttpTransport(abc.ABC):
+    """
+    Sends a single http request and returns the requests.Response
+    """
+
+    @abc.abstractmethod
+    def send(self, method: HttpMethod, url: str, params: dict = None, data = None, headers: dict = None) -> requests.Response:
+        """
+        Send request.
+
+        :param method: Http method of the request
+        :type method: HttpMethod
+        :param url: Full url of the request
+        :type url: str
+        :param params: Query parameters, defaults to None
+        :type params: dict, optional
+        :param data: Body of the request, defaults to None
+        :param headers: Request headers, defaults to None
+        :type headers: dict, optional
+        :return: Response of the service
+        :rtype: requests.Response
+        """
+
+    def close(self):
+        """
+        Release any resources held by the transport.
+        """
+
+
+class SimpleTransport(HttpTransport):
+    """
+    Opens a new connection for every request using requests' module level api
+    """
+
+    def send(self, method: HttpMethod, url: str, params: dict = None, data = None, headers: dict = None) -> requests.Response:
+        return requests.request(method.name, url=url, params=params, data=data, headers=headers, verify=False)
+
+
+class PooledTransport(HttpTransport):
+    """
+    Keeps connections alive and reuses them across requests through a requests.Session.
+    The session is safe to share between threads, every host gets its own connection pool.
+    """
+
+    def __init__(self, pool_connections: int = DEFAULT_POOL_CONNECTIONS, pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                 pool_block: bool = False):
+        """
+        :param pool_connections: Number of per host connection pools to cache, defaults to 10
+        :type pool_connections: int, optional
+        :param pool_maxsize: Maximum number of connections kept alive per host, defaults to 10
+        :type pool_maxsize: int, optional
+        :param pool_block: Wait for a free connection instead of opening a throwaway one
+            when the pool of a host is exhausted, defaults to False
+        :type pool_block: bool, optional
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.session = requests.Session()
+        self.session.verify = False
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, pool_block=pool_block)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def send(self, method: HttpMethod, url: str, params: dict = None, data = None, headers: dict = None) -> requests.Response:
+        return self.session.request(method.name, url=url, params=params, data=data, headers=headers)
+
+    def close(self):
+        self.session.close()
+
+
+_shared_transports = {}
+_shared_transports_lock = threading.Lock()
+
+
+def get_shared_transport(pool_connections: int = DEFAULT_POOL_CONNECTIONS, pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                         pool_block: bool = False) -> PooledTransport:
+    """
+    Get a process wide PooledTransport for the given pool settings, creating it on first use.
+    Clients configured with the same pool settings share connections.
+
+    :return: Shared pooled transport
+    :rtype: PooledTransport
+    """
+    key = (pool_connections, pool_maxsize, pool_block)
+    with _shared_transports_lock:
+        transport = _shared_transports.get(key)
+        if transport is None:
+            transport = PooledTransport(pool_connections, pool_maxsize, pool_block)
+            _shared_transports[key] = transport
+        return transport
+
+
+def close_shared_transports():
+    """
+    Close and forget all shared transports.
+    """
+    with _shared_transports_lock:
+        for transport in _shared_transports.values():
+            transport.close()
+        _shared_transports.clear()
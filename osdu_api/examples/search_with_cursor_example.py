@@ -8,4 +8,10 @@ search_response = search_client.query_with_cursor(query_request, bearer_token=No
 
 print(search_response.status_code)
 print("________________")
-print(search_response.content)
\ No newline at end of file
+print(search_response.content)
+print("________________")
+# follow the cursor through all pages, the next page is fetched while the current one is processed
+record_count = 0
+for result in search_client.iter_query_results(query_request, prefetch_pages=2):
+    record_count += 1
+print(record_count)
@@ -12,13 +12,109 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import json
+import warnings
+from enum import Enum
 from types import MappingProxyType
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional, faster backend of the compact serializer
+    orjson = None
+
+_JSON_SCALARS = (str, int, float, bool, type(None))
+_JSON_SCALAR_TYPES = frozenset(_JSON_SCALARS)
+
+# per class mapping of attribute names to the names used in json, built once from _json_field_names along the mro
+_field_names_cache = {}
+
 
 class Base:
-    def to_JSON(self):
-        return json.dumps(self, default=lambda o: self.jsonify(o), 
-            sort_keys=True, indent=4)
+    """
+    Models are serialized from their attributes, renamed according to _json_field_names.
+    Nested models, plain objects, dicts, lists and tuples are serialized recursively,
+    enum members by name.
+    """
+
+    # attribute names that differ from the json field name, e.g. {'from_num': 'from'}
+    _json_field_names = {}
+
+    def to_JSON(self, compact: bool = False) -> str:
+        """
+        Serialize the model.
+
+        :param compact: Serialize without whitespace and without sorting keys, as sent to the services,
+            defaults to False for indented and sorted output
+        :type compact: bool, optional
+        :return: Json document
+        :rtype: str
+        """
+        if type(self).jsonify is not Base.jsonify:
+            # subclasses overriding the former serialization hook keep their output
+            if not compact:
+                return json.dumps(self, default=self.jsonify, sort_keys=True, indent=4)
+            return json.dumps(self, default=self.jsonify, separators=(',', ':'))
+        data = self.to_dict()
+        if not compact:
+            return json.dumps(data, sort_keys=True, indent=4)
+        return dumps_compact(data)
+
+    def to_dict(self) -> dict:
+        """
+        Convert the model to a dict of json compatible values, the model itself is left unchanged.
+        """
+        return _to_json_value(self)
 
     def jsonify(self, o):
-        return o.__dict__ if type(o) is not dict else self
\ No newline at end of file
+        """
+        Deprecated, models are serialized by to_dict and renamed by _json_field_names.
+        Kept as json.dumps default hook: convert o to json compatible values.
+        """
+        warnings.warn("Base.jsonify is deprecated, use to_dict and _json_field_names instead.",
+                      DeprecationWarning, stacklevel=2)
+        return _to_json_value(o)
+
+
+def dumps_compact(data) -> str:
+    """
+    Serialize json compatible data without whitespace, using orjson when it is installed.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        except TypeError:
+            # e.g. integers beyond 64 bits, leave them to the standard library
+            pass
+    return json.dumps(data, separators=(',', ':'))
+
+
+def _get_field_names(cls) -> dict:
+    field_names = _field_names_cache.get(cls)
+    if field_names is None:
+        field_names = {}
+        for klass in reversed(cls.__mro__):
+            field_names.update(klass.__dict__.get('_json_field_names') or {})
+        _field_names_cache[cls] = field_names
+    return field_names
+
+
+def _to_json_value(o):
+    # exact type checks first, they cover nearly all values of a record's data
+    value_type = type(o)
+    if value_type in _JSON_SCALAR_TYPES:
+        return o
+    if value_type is dict:
+        return {key: _to_json_value(value) for key, value in o.items()}
+    if value_type is list:
+        return [_to_json_value(item) for item in o]
+    if isinstance(o, _JSON_SCALARS):
+        return o
+    if isinstance(o, (dict, MappingProxyType)):
+        return {key: _to_json_value(value) for key, value in o.items()}
+    if isinstance(o, (list, tuple)):
+        return [_to_json_value(item) for item in o]
+    if isinstance(o, Enum):
+        return o.name
+    field_names = _get_field_names(value_type)
+    if not field_names:
+        return {key: _to_json_value(value) for key, value in vars(o).items()}
+    return {field_names.get(key, key): _to_json_value(value) for key, value in vars(o).items()}
@@ -18,6 +18,8 @@ from osdu_api.model.search.spatial_filter import SpatialFilter
 
 class QueryRequest(Base):
 
+    _json_field_names = {'from_num': 'from'}
+
     def __init__(self, kind: str, query: str, limit: int = None, return_highlighted_fields: bool = None, 
         returned_fields: list = None, sort: SortQuery = None, query_as_owner: bool = None, spatial_filter: SpatialFilter = None, 
         from_num: int = None, aggregate_by: str = None, cursor: str = None):
@@ -33,10 +35,3 @@ class QueryRequest(Base):
         self.aggregateBy = aggregate_by
         self.cursor = cursor
 
-
-    def jsonify(self, o):
-        d = o.__dict__
-        if 'from_num' in d:
-            d['from'] = d['from_num']
-            del d['from_num']
-        return d
@@ -0,0 +1,46 @@
+# Copyright © 2020 Amazon Web Services
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+class BatchFailure:
+    """
+    A batch of records that storage did not accept
+    """
+
+    def __init__(self, record_ids: list, status_code: int = None, reason: str = None):
+        self.record_ids = record_ids
+        self.status_code = status_code
+        self.reason = reason
+
+
+class BulkUpsertResult:
+    """
+    Aggregated createOrUpdateRecords responses of all batches of a bulk upsert.
+    Storage does not tell created and updated records apart, both are listed in record_ids
+    """
+
+    def __init__(self):
+        self.record_count = 0
+        self.record_ids = []
+        self.skipped_record_ids = []
+        self.record_id_versions = []
+        self.failures = []
+
+    @property
+    def failed_record_ids(self) -> list:
+        return [record_id for failure in self.failures for record_id in failure.record_ids]
+
+    @property
+    def succeeded(self) -> bool:
+        return not self.failures
@@ -0,0 +1,46 @@
+# Copyright © 2020 Amazon Web Services
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+class FetchRecordsResult:
+    """
+    Records fetched by id, iterated as they arrive. Ids that could not be fetched do not fail
+    the iteration, they are collected while iterating:
+    invalid_record_ids and retry_record_ids as reported by storage, missing_record_ids for ids
+    storage did not return at all (not found or not authorized), and failures for batches
+    whose request failed
+    """
+
+    def __init__(self, records = None):
+        """
+        :param records: Iterator or async iterator over the decoded records
+        """
+        self.invalid_record_ids = []
+        self.retry_record_ids = []
+        self.missing_record_ids = []
+        self.failures = []
+        self._records = records
+
+    def __iter__(self):
+        return self._records
+
+    def __aiter__(self):
+        return self._records
+
+    @property
+    def failed_record_ids(self) -> list:
+        return self.invalid_record_ids + self.retry_record_ids + self.missing_record_ids + \
+            [record_id for failure in self.failures for record_id in failure.record_ids]
+
+    @property
+    def succeeded(self) -> bool:
+        return not self.failed_record_ids
@@ -1,14 +1,22 @@
-
 """Blob storage AWS client module"""
 
 import tenacity
+from osdu_api.providers.blob_reader import check_range
+from osdu_api.providers.checksum import MD5, Checksum, ETagHasher, HashingReader, HashingWriter, is_verification_enabled
 from osdu_api.providers.constants import AWS_CLOUD_PROVIDER
 import logging
+import os
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
+from botocore.exceptions import ClientError
 from osdu_api.providers.factory import ProvidersFactory
-from osdu_api.providers.types import BlobStorageClient, FileLikeObject
-from typing import Tuple
+from osdu_api.providers.types import (DEFAULT_MAX_WORKERS, BlobListing, BlobMetadata, BlobStorageClient,
+                                      DownloadResult, FileLikeObject)
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional, Tuple, Union
 import io
+import uuid
 
 logger = logging.getLogger(__name__)
 
@@ -18,13 +26,57 @@ RETRY_SETTINGS = {
     "reraise": True,
 }
 
+DEFAULT_REGION_NAME = "us-east-1"
+# endpoint of an S3 compatible store, e.g. a local stand-in in tests
+ENDPOINT_URL_ENV = "AWS_S3_ENDPOINT_URL"
+
+MB = 1024 * 1024
+DEFAULT_MULTIPART_THRESHOLD = 8 * MB
+DEFAULT_MULTIPART_CHUNKSIZE = 8 * MB
+DEFAULT_MAX_CONCURRENCY = 10
+
+NOT_FOUND_ERROR_CODES = ("404", "NoSuchKey", "NotFound")
+
 @ProvidersFactory.register(AWS_CLOUD_PROVIDER)
 class AwsCloudStorageClient(BlobStorageClient):
-    """Implementation of blob storage client for the AWS provider."""
-    def __init__(self):
-        """Initialize storage client."""
+    """Implementation of blob storage client for the AWS provider.
+
+    Objects bigger than multipart_threshold are uploaded in parts and downloaded by
+    parallel ranged GETs of multipart_chunksize bytes, max_concurrency at a time.
+    Data is streamed between S3 and the caller's file or path without buffering
+    the whole object in memory.
+
+    With verify_checksums, the MD5 of the transferred bytes is computed while they stream
+    and compared to the ETag of the object, see ETagHasher, and returned as checksum.
+    Ranges are then written in order, which holds up to max_concurrency parts in memory.
+    """
+    def __init__(self, region_name: str = DEFAULT_REGION_NAME, endpoint_url: str = None,
+                 transfer_config: TransferConfig = None, verify_checksums: bool = None):
+        """Initialize storage client.
+
+        :param region_name: AWS region of the buckets, defaults to us-east-1
+        :type region_name: str, optional
+        :param endpoint_url: Url of an S3 compatible endpoint, defaults to the
+            AWS_S3_ENDPOINT_URL env var or AWS S3
+        :type endpoint_url: str, optional
+        :param transfer_config: Part size and concurrency of multipart transfers,
+            defaults to 8 MB parts and 10 concurrent requests
+        :type transfer_config: TransferConfig, optional
+        :param verify_checksums: Verify transfers against the ETag, defaults to the
+            BLOB_STORAGE_VERIFY_CHECKSUMS env var
+        :type verify_checksums: bool, optional
+        """
+        self.verify_checksums = is_verification_enabled(verify_checksums)
+        self.transfer_config = transfer_config or TransferConfig(
+            multipart_threshold=DEFAULT_MULTIPART_THRESHOLD,
+            multipart_chunksize=DEFAULT_MULTIPART_CHUNKSIZE,
+            max_concurrency=DEFAULT_MAX_CONCURRENCY)
+        # one pooled connection per concurrent part transfer
+        client_config = Config(max_pool_connections=max(10, self.transfer_config.max_request_concurrency))
         session = boto3.session.Session()
-        self.s3_client =session.client('s3', region_name="us-east-1")
+        self.s3_client = session.client('s3', region_name=region_name,
+                                        endpoint_url=endpoint_url or os.environ.get(ENDPOINT_URL_ENV),
+                                        config=client_config)
 
     def does_file_exist(self, uri: str) -> bool:
         """Verify if a file exists in the given URI.
@@ -39,32 +91,83 @@ class AwsCloudStorageClient(BlobStorageClient):
         # get the bucket name and path to object
         bucket_name, object_name = self._split_s3_path(uri)
         try:
-            # try to get the s3 metadata for the object, which is a 
+            # try to get the s3 metadata for the object, which is a
             # fast operation no matter the size of the data object
-            self.s3_client.head_object(bucket_name, object_name)
-        except:
-            return False
+            self.s3_client.head_object(Bucket=bucket_name, Key=object_name)
+        except ClientError as err:
+            if err.response.get("Error", {}).get("Code") in NOT_FOUND_ERROR_CODES:
+                return False
+            raise
         return True
 
-    def download_to_file(self, uri: str, file: FileLikeObject) -> Tuple[FileLikeObject, str]:
+    def download_to_file(self, uri: str, file: Union[FileLikeObject, str, os.PathLike]) -> Tuple[FileLikeObject, str]:
         """Download file from the given URI.
 
         :param uri: The AWS URI of the file.
         :type uri: str
-        :param file: The file where to download the blob content
-        :type file: FileLikeObject
-        :return: A tuple containing the file and its content-type
-        :rtype: Tuple[io.BytesIO, str]
+        :param file: The file object where to write the blob content, or the path of a
+            file, which is only replaced once the download completed
+        :type file: Union[FileLikeObject, str, os.PathLike]
+        :raises ChecksumMismatchError: When checksums are verified and the content does not match the ETag
+        :return: A tuple containing the file and its content-type, and the MD5 checksum
+            when checksums are verified
+        :rtype: DownloadResult
         """
         # assuming the URI here is an s3:// URI
         # get the bucket name, path to object
         bucket_name, object_name = self._split_s3_path(uri)
-        buffer = io.BytesIO()
-        content_type = ""
-        file_bytes = self.s3_client.download_fileobj(bucket_name, object_name, buffer)
+        head = self.s3_client.head_object(Bucket=bucket_name, Key=object_name)
+        # in versioned buckets, all parts must come from the version whose content type is returned
+        extra_args = {"VersionId": head["VersionId"]} if head.get("VersionId") else None
+        if self.verify_checksums:
+            checksum = self._download_verified(uri, head, file, extra_args)
+        elif isinstance(file, (str, os.PathLike)):
+            checksum = None
+            self.s3_client.download_file(bucket_name, object_name, os.fspath(file),
+                                         ExtraArgs=extra_args, Config=self.transfer_config)
+        else:
+            checksum = None
+            self.s3_client.download_fileobj(bucket_name, object_name, file,
+                                            ExtraArgs=extra_args, Config=self.transfer_config)
+        logger.debug(f"File {object_name} got from bucket {bucket_name}.")
+        return DownloadResult(file, head.get("ContentType", ""), checksum)
 
-        return file_bytes, content_type
+    def _new_etag_hasher(self) -> ETagHasher:
+        return ETagHasher(self.transfer_config.multipart_chunksize)
 
+    @staticmethod
+    def _get_verifiable_etag(head: dict) -> Optional[str]:
+        """Get the ETag of an object, None if it is not computed from the content."""
+        if head.get("ServerSideEncryption") == "aws:kms" or head.get("SSECustomerAlgorithm"):
+            return None
+        return head.get("ETag")
+
+    def _download_verified(self, uri: str, head: dict, file: Union[FileLikeObject, str, os.PathLike],
+                           extra_args: Optional[dict]) -> Checksum:
+        """Download an object through a hashing writer and verify its ETag.
+
+        :return: The MD5 checksum of the content
+        :rtype: Checksum
+        """
+        bucket_name, object_name = self._split_s3_path(uri)
+        hasher = self._new_etag_hasher()
+        if isinstance(file, (str, os.PathLike)):
+            path = os.fspath(file)
+            temp_path = f"{path}.{uuid.uuid4().hex}"
+            try:
+                with open(temp_path, "wb") as temp_file:
+                    self.s3_client.download_fileobj(bucket_name, object_name, HashingWriter(temp_file, hasher),
+                                                    ExtraArgs=extra_args, Config=self.transfer_config)
+                hasher.verify_etag(uri, self._get_verifiable_etag(head))
+                os.replace(temp_path, path)
+            finally:
+                if os.path.exists(temp_path):
+                    os.unlink(temp_path)
+        else:
+            self.s3_client.download_fileobj(bucket_name, object_name, HashingWriter(file, hasher),
+                                            ExtraArgs=extra_args, Config=self.transfer_config)
+            hasher.verify_etag(uri, self._get_verifiable_etag(head))
+        return Checksum(MD5, hasher.hexdigest())
 
     def download_file_as_bytes(self, uri: str) -> Tuple[bytes, str]:
         """Download file as bytes from the given URI.
@@ -74,30 +177,139 @@ class AwsCloudStorageClient(BlobStorageClient):
         :return: The file as bytes and its content-type
         :rtype: Tuple[bytes, str]
         """
-        # assuming the URI here is an s3:// URI
-        # get the bucket name, path to object
+        result = self.download_to_file(uri, io.BytesIO())
+        file_handle, content_type = result
+        return DownloadResult(file_handle.getvalue(), content_type, result.checksum)
+
+    def get_metadata(self, uri: str) -> BlobMetadata:
+        """Get size, content-type and version of the file at the given URI.
+
+        :param uri: The AWS URI of the file
+        :type uri: str
+        :return: The metadata of the file
+        :rtype: BlobMetadata
+        """
+        bucket_name, object_name = self._split_s3_path(uri)
+        try:
+            head = self.s3_client.head_object(Bucket=bucket_name, Key=object_name)
+        except ClientError as err:
+            if err.response.get("Error", {}).get("Code") in NOT_FOUND_ERROR_CODES:
+                raise FileNotFoundError(f"File {uri} does not exist.") from err
+            raise
+        return BlobMetadata(size=head["ContentLength"], content_type=head.get("ContentType"),
+                            etag=head.get("ETag"), generation=head.get("VersionId"),
+                            content_encoding=head.get("ContentEncoding"))
+
+    def download_range(self, uri: str, start: int, end: int) -> bytes:
+        """Download the bytes from start to end, both inclusive, of the file at the given URI.
+
+        :param uri: The AWS URI of the file
+        :type uri: str
+        :param start: Offset of the first byte
+        :type start: int
+        :param end: Offset of the last byte
+        :type end: int
+        :return: The bytes of the range
+        :rtype: bytes
+        """
+        check_range(start, end)
         bucket_name, object_name = self._split_s3_path(uri)
-        filename = object_name.split('/')[-1]
-        file_handle = io.BytesIO
-        return self.s3_client.download_fileobj(bucket_name, object_name, file_handle)
+        response = self.s3_client.get_object(Bucket=bucket_name, Key=object_name, Range=f"bytes={start}-{end}")
+        return response["Body"].read()
+
+    def _list_pages(self, prefix: str, delimiter: Optional[str], page_size: int,
+                    fetch_content_type: bool) -> Iterator[List[BlobListing]]:
+        """List the objects whose URI starts with prefix, one list per page requested.
+
+        :param prefix: The AWS URI prefix, e.g. s3://bucket/dir/
+        :type prefix: str
+        :param delimiter: The delimiter of directories
+        :type delimiter: Optional[str]
+        :param page_size: The number of objects requested per page, at most 1000
+        :type page_size: int
+        :param fetch_content_type: Get the content-type of the objects of a page with
+            concurrent HEAD requests, the listing does not return it
+        :type fetch_content_type: bool
+        :return: The pages
+        :rtype: Iterator[List[BlobListing]]
+        """
+        bucket_name, key_prefix = self._split_s3_path(prefix)
+        params = {"Bucket": bucket_name, "Prefix": key_prefix, "PaginationConfig": {"PageSize": page_size}}
+        if delimiter:
+            params["Delimiter"] = delimiter
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(**params):
+            items = [
+                BlobListing(f"s3://{bucket_name}/{item['Key']}", item["Key"], size=item["Size"],
+                            etag=item.get("ETag"))
+                for item in page.get("Contents", [])
+            ]
+            if fetch_content_type and items:
+                with ThreadPoolExecutor(max_workers=min(DEFAULT_MAX_WORKERS, len(items))) as executor:
+                    heads = executor.map(lambda item: self.s3_client.head_object(Bucket=bucket_name, Key=item.name),
+                                         items)
+                    for item, head in zip(items, heads):
+                        item.content_type = head.get("ContentType")
+            items.extend(
+                BlobListing(f"s3://{bucket_name}/{common_prefix['Prefix']}", common_prefix["Prefix"], is_prefix=True)
+                for common_prefix in page.get("CommonPrefixes", [])
+            )
+            yield items
 
-    def upload_file(self, uri: str, blob_file: FileLikeObject, content_type: str):
+    def upload_file(self, uri: str, blob_file: Union[FileLikeObject, str, os.PathLike],
+                    content_type: str, content_encoding: str = None) -> Optional[Checksum]:
         """Upload a file to the given uri.
 
         :param uri: The AWS URI of the file
         :type uri: str
-        :param blob: The file
-        :type blob: FileLikeObject
-        :param content_type: [description]
+        :param blob: The file object to read from, or the path of a file
+        :type blob: Union[FileLikeObject, str, os.PathLike]
+        :param content_type: The content-type stored with the object
         :type content_type: str
+        :param content_encoding: The content-encoding stored with the object, e.g. gzip, defaults to None
+        :type content_encoding: str, optional
+        :raises ChecksumMismatchError: When checksums are verified and the stored ETag does not match the content
+        :return: The MD5 checksum of the content when checksums are verified
+        :rtype: Optional[Checksum]
         """
         # assuming the URI here is an s3:// URI
         # get the bucket name, path to object
         bucket_name, object_name = self._split_s3_path(uri)
+        extra_args = {}
+        if content_type:
+            extra_args["ContentType"] = content_type
+        if content_encoding:
+            extra_args["ContentEncoding"] = content_encoding
+        extra_args = extra_args or None
+
+        if self.verify_checksums:
+            hasher = self._new_etag_hasher()
+            if isinstance(blob_file, (str, os.PathLike)):
+                with open(blob_file, "rb") as source:
+                    self._upload_fileobj_hashed(source, hasher, bucket_name, object_name, extra_args)
+            else:
+                self._upload_fileobj_hashed(blob_file, hasher, bucket_name, object_name, extra_args)
+            head = self.s3_client.head_object(Bucket=bucket_name, Key=object_name)
+            hasher.verify_etag(uri, self._get_verifiable_etag(head))
+            logger.debug(f"Uploaded file to {uri}.")
+            return Checksum(MD5, hasher.hexdigest())
+
+        if isinstance(blob_file, (str, os.PathLike)):
+            self.s3_client.upload_file(os.fspath(blob_file), bucket_name, object_name,
+                                       ExtraArgs=extra_args, Config=self.transfer_config)
+        else:
+            # Upload the file like object
+            self.s3_client.upload_fileobj(blob_file, bucket_name, object_name,
+                                          ExtraArgs=extra_args, Config=self.transfer_config)
+        logger.debug(f"Uploaded file to {uri}.")
+
+    def _upload_fileobj_hashed(self, file: FileLikeObject, hasher: ETagHasher, bucket_name: str,
+                               object_name: str, extra_args: Optional[dict]):
+        # not seekable, so parts are read once and in order
+        reader = HashingReader(file, hasher, seekable=False)
+        self.s3_client.upload_fileobj(reader, bucket_name, object_name,
+                                      ExtraArgs=extra_args, Config=self.transfer_config)
 
-        # Upload the file like object
-        self.s3_client.upload_fileobj(blob_file, bucket_name, object_name)
-        
     def _split_s3_path(self, s3_path:str):
         """split a s3:// path into bucket and key parts
 
@@ -20,6 +20,10 @@ class AWSCredentials(BaseCredentials):
         """Initialize AWS Credentials object"""
         self._access_token = None
 
+    def _get_token_store_key(self) -> tuple:
+        """Tokens are stored per osdu_api.ini file, which holds the service principal settings."""
+        return super()._get_token_store_key() + (os.path.abspath('osdu_api.ini'),)
+
     @retry(stop=stop_after_attempt(RETRIES))
     def refresh_token(self) -> str:
         """Refresh token.
@@ -27,7 +31,7 @@ class AWSCredentials(BaseCredentials):
         :return: Refreshed token
         :rtype: str
         """
-        token = get_service_principal_token()
+        token = self._get_or_mint_token(lambda stale_token: get_service_principal_token())
         self._access_token = token
         return self._access_token
 
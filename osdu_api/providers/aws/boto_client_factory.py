@@ -1,35 +1,95 @@
 import os
+import threading
+import time
+
 import boto3
 
+# seconds before the expiration of assumed role credentials when the role is assumed again
+ASSUMED_ROLE_REFRESH_MARGIN = 300
 
-class BotoClientFactory:
+_lock = threading.Lock()
+# (client type, region, role arn) -> (client, expiry of its credentials or None)
+_clients = {}
+# role arn -> credentials returned by sts assume_role
+_assumed_role_credentials = {}
 
-    def get_boto_client(self, client_type: str, region_name: str):
-        session = boto3.session.Session(region_name=region_name)
-        client = session.client(
-            service_name=client_type,
-            region_name=region_name
-        )
 
-        if 'USE_AIRFLOW' in os.environ and (os.environ['USE_AIRFLOW'] == 'true' or os.environ['USE_AIRFLOW'] == 'True' or os.environ['USE_AIRFLOW'] == True):
-            sts_client = boto3.client('sts')
-            
-            if 'AWS_ROLE_ARN' not in os.environ:
-                raise Exception('Must have AWS_ROLE_ARN set')
-            
-            assumed_role_object=sts_client.assume_role(
-                RoleArn=os.environ['AWS_ROLE_ARN'],
+def _use_airflow() -> bool:
+    return os.environ.get('USE_AIRFLOW') in ('true', 'True')
+
+
+def clear_cache():
+    """
+    Forget the clients and the assumed role credentials, e.g. after the environment changed
+    """
+    with _lock:
+        _clients.clear()
+        _assumed_role_credentials.clear()
+
+
+def _reset_after_fork():
+    """
+    Forget the clients of the parent process in a forked child, whose copy of the lock may be held
+    """
+    global _lock
+    _lock = threading.Lock()
+    clear_cache()
+
+
+class BotoClientFactory:
+    """
+    Boto clients shared by the whole process, boto3 clients are thread safe.
+    When USE_AIRFLOW is set, clients use the credentials of the role AWS_ROLE_ARN; the role is
+    assumed once and again shortly before its credentials expire.
+    """
+
+    def _get_assumed_role_credentials(self, role_arn: str) -> dict:
+        credentials = _assumed_role_credentials.get(role_arn)
+        if credentials is None or credentials['Expiration'].timestamp() - ASSUMED_ROLE_REFRESH_MARGIN <= time.time():
+            sts_client = self._get_client('sts', None, None)
+            assumed_role_object = sts_client.assume_role(
+                RoleArn=role_arn,
                 RoleSessionName="airflow_session"
             )
-            credentials=assumed_role_object['Credentials']
+            credentials = assumed_role_object['Credentials']
+            _assumed_role_credentials[role_arn] = credentials
+        return credentials
+
+    def _get_client(self, client_type: str, region_name: str, role_arn: str):
+        key = (client_type, region_name, role_arn)
+        cached = _clients.get(key)
+        if cached is not None and (cached[1] is None or cached[1] - ASSUMED_ROLE_REFRESH_MARGIN > time.time()):
+            return cached[0]
+
+        if role_arn is None:
+            session = boto3.session.Session(region_name=region_name)
+            expires_at = None
+        else:
+            credentials = self._get_assumed_role_credentials(role_arn)
             session = boto3.Session(
                 aws_access_key_id=credentials['AccessKeyId'],
                 aws_secret_access_key=credentials['SecretAccessKey'],
                 aws_session_token=credentials['SessionToken']
             )
-            client = session.client(
-                service_name=client_type,
-                region_name=region_name
-            )
-
+            expires_at = credentials['Expiration'].timestamp()
+        client = session.client(
+            service_name=client_type,
+            region_name=region_name
+        )
+        _clients[key] = (client, expires_at)
         return client
+
+    def get_boto_client(self, client_type: str, region_name: str):
+        role_arn = None
+        if _use_airflow():
+            if 'AWS_ROLE_ARN' not in os.environ:
+                raise Exception('Must have AWS_ROLE_ARN set')
+            role_arn = os.environ['AWS_ROLE_ARN']
+
+        with _lock:
+            return self._get_client(client_type, region_name, role_arn)
+
+
+if hasattr(os, "register_at_fork"):
+    # the connection pools of the parent's clients are not usable in the child
+    os.register_at_fork(after_in_child=_reset_after_fork)
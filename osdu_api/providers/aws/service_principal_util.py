@@ -13,6 +13,8 @@
 # limitations under the License.
 import os
 import base64
+import threading
+import time
 import boto3
 import requests
 import json
@@ -20,11 +22,74 @@ from botocore.exceptions import ClientError
 from configparser import ConfigParser
 from osdu_api.providers.aws.boto_client_factory import BotoClientFactory
 
-def _get_ssm_parameter(region_name, ssm_path):
+# seconds the parameters and secrets of the service principal are reused
+SETTINGS_TTL = 3600
+# get_parameters accepts at most 10 names
+MAX_PARAMETERS_PER_REQUEST = 10
+
+_lock = threading.Lock()
+_config = None
+# cache key -> (value, expiry)
+_cache = {}
+
+
+def clear_cache():
+    """
+    Forget the configuration, parameters and secrets, e.g. after a secret was rotated
+    """
+    global _config
+    with _lock:
+        _config = None
+        _cache.clear()
+
+
+def _get_cached(key, load, ttl=SETTINGS_TTL):
+    cached = _cache.get(key)
+    if cached is not None and cached[1] > time.time():
+        return cached[0]
+    value = load()
+    _cache[key] = (value, time.time() + ttl)
+    return value
+
+
+def _get_config() -> dict:
+    """
+    Read the provider section of osdu_api.ini once per process
+    """
+    global _config
+    config = _config
+    if config is None:
+        config_parser = ConfigParser(os.environ)
+        config_file_name = 'osdu_api.ini'
+
+        found_names = config_parser.read(config_file_name)
+        if config_file_name not in found_names:
+            raise Exception('Could not find osdu_api.ini config file')
+
+        config = {
+            option: config_parser.get('provider', option)
+            for option in ('client_id_ssm_path', 'client_secret_name', 'client_secret_dict_key',
+                           'aws_oauth_custom_scope_ssm_path', 'region_name', 'token_url_ssm_path')
+        }
+        _config = config
+    return config
+
+
+def _get_ssm_parameters(region_name, ssm_paths) -> dict:
     boto_client_factory = BotoClientFactory()
     ssm_client = boto_client_factory.get_boto_client('ssm', region_name)
-    ssm_response = ssm_client.get_parameter(Name=ssm_path)
-    return ssm_response['Parameter']['Value']
+    parameters = {}
+    ssm_paths = list(dict.fromkeys(ssm_paths))
+    for start in range(0, len(ssm_paths), MAX_PARAMETERS_PER_REQUEST):
+        ssm_response = ssm_client.get_parameters(Names=ssm_paths[start:start + MAX_PARAMETERS_PER_REQUEST])
+        if ssm_response.get('InvalidParameters'):
+            raise ValueError('Could not find SSM parameters {}'.format(ssm_response['InvalidParameters']))
+        for parameter in ssm_response['Parameters']:
+            parameters[parameter['Name']] = parameter['Value']
+    return parameters
+
+def _get_ssm_parameter(region_name, ssm_path):
+    return _get_ssm_parameters(region_name, [ssm_path])[ssm_path]
 
 def _get_secret(region_name, secret_name, secret_dict_key):
     boto_client_factory = BotoClientFactory()
@@ -58,34 +123,48 @@ def _get_secret(region_name, secret_name, secret_dict_key):
     return return_secret
 
 
-def get_service_principal_token():
-    config_parser = ConfigParser(os.environ)
-    config_file_name = 'osdu_api.ini'
-    
-    found_names = config_parser.read(config_file_name)
-    if config_file_name not in found_names:
-        raise Exception('Could not find osdu_api.ini config file')
-
-    client_id_ssm_path = config_parser.get('provider', 'client_id_ssm_path')
-    client_secret_name = config_parser.get('provider', 'client_secret_name')
-    client_secret_dict_key = config_parser.get('provider', 'client_secret_dict_key')
-    aws_oauth_custom_scope_ssm_path = config_parser.get('provider', 'aws_oauth_custom_scope_ssm_path')
-    region_name = config_parser.get('provider', 'region_name')
-    token_url_ssm_path = config_parser.get('provider', 'token_url_ssm_path')
-
-    client_id = _get_ssm_parameter(region_name, client_id_ssm_path)
-    client_secret = _get_secret(region_name, client_secret_name, client_secret_dict_key)
-    token_url = _get_ssm_parameter(region_name, token_url_ssm_path)
-    aws_oauth_custom_scope = _get_ssm_parameter(region_name, aws_oauth_custom_scope_ssm_path)
-
-    auth = '{}:{}'.format(client_id, client_secret)
+def _get_service_principal_settings() -> dict:
+    """
+    Get the client id and secret, token url and scope of the service principal, reused for SETTINGS_TTL seconds
+    """
+    config = _get_config()
+    region_name = config['region_name']
+
+    def load() -> dict:
+        parameters = _get_ssm_parameters(region_name, [config['client_id_ssm_path'], config['token_url_ssm_path'],
+                                                      config['aws_oauth_custom_scope_ssm_path']])
+        return {
+            'client_id': parameters[config['client_id_ssm_path']],
+            'client_secret': _get_secret(region_name, config['client_secret_name'], config['client_secret_dict_key']),
+            'token_url': parameters[config['token_url_ssm_path']],
+            'aws_oauth_custom_scope': parameters[config['aws_oauth_custom_scope_ssm_path']]
+        }
+
+    with _lock:
+        return _get_cached(('service_principal', region_name), load)
+
+
+def _request_token(settings: dict) -> requests.Response:
+    auth = '{}:{}'.format(settings['client_id'], settings['client_secret'])
     encoded_auth = base64.b64encode(str.encode(auth))
 
     headers = {}
     headers['Authorization'] = 'Basic ' + encoded_auth.decode()
     headers['Content-Type'] = 'application/x-www-form-urlencoded'
 
-    token_url = '{}?grant_type=client_credentials&client_id={}&scope={}'.format(token_url,client_id, aws_oauth_custom_scope)
+    token_url = '{}?grant_type=client_credentials&client_id={}&scope={}'.format(
+        settings['token_url'], settings['client_id'], settings['aws_oauth_custom_scope'])
+
+    return requests.post(url=token_url, headers=headers)
 
-    response = requests.post(url=token_url, headers=headers)
+
+def get_service_principal_token():
+    settings = _get_service_principal_settings()
+    response = _request_token(settings)
+    if response.status_code in (400, 401):
+        # the client secret may have been rotated since it was read
+        with _lock:
+            _cache.clear()
+        settings = _get_service_principal_settings()
+        response = _request_token(settings)
     return json.loads(response.content.decode())['access_token']
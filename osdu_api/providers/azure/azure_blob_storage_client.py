@@ -14,11 +14,19 @@
 """Blob storage Azure client module"""
 
 import tenacity
+from osdu_api.providers.blob_reader import check_range
 from osdu_api.providers.constants import AZURE_CLOUD_PROVIDER
+from osdu_api.providers.exceptions import AzureBlobURIError
 import logging
+import os
+import threading
+from azure import identity
+from azure.core.exceptions import ResourceNotFoundError
+from azure.storage.blob import BlobClient, BlobPrefix, BlobServiceClient, ContentSettings
 from osdu_api.providers.factory import ProvidersFactory
-from osdu_api.providers.types import BlobStorageClient, FileLikeObject
-from typing import Tuple
+from osdu_api.providers.types import BlobMetadata, BlobStorageClient, FileLikeObject
+from typing import Iterator, Optional, Tuple, Union
+from urllib.parse import quote, unquote, urlparse
 
 logger = logging.getLogger(__name__)
 
@@ -28,53 +36,265 @@ RETRY_SETTINGS = {
     "reraise": True,
 }
 
+# e.g. the connection string of a local Azurite emulator
+CONNECTION_STRING_ENV = "AZURE_STORAGE_CONNECTION_STRING"
+# e.g. https://<account>.blob.core.windows.net, authenticated with DefaultAzureCredential
+ACCOUNT_URL_ENV = "AZURE_STORAGE_ACCOUNT_URL"
+
+MB = 1024 * 1024
+DEFAULT_BLOCK_SIZE = 8 * MB
+DEFAULT_SINGLE_PUT_SIZE = 8 * MB
+DEFAULT_SINGLE_GET_SIZE = 8 * MB
+DEFAULT_CHUNK_GET_SIZE = 8 * MB
+DEFAULT_MAX_CONCURRENCY = 8
+
+
 @ProvidersFactory.register(AZURE_CLOUD_PROVIDER)
 class AzureCloudStorageClient(BlobStorageClient):
-    """Implementation of blob storage client for the Azure provider."""
-    def __init__(self):
-        """Initialize storage client."""
-        pass
+    """Implementation of blob storage client for the Azure provider.
+
+    URIs are blob URLs, e.g. https://<account>.blob.core.windows.net/<container>/<blob>,
+    or http://127.0.0.1:10000/devstoreaccount1/<container>/<blob> for Azurite. Blobs of the
+    configured account are accessed with its credential, other URLs must be signed (SAS).
+
+    Blobs bigger than single_put_size are uploaded in blocks of block_size bytes and
+    blobs bigger than single_get_size are downloaded in ranges of chunk_get_size bytes,
+    max_concurrency at a time. Data is streamed between the storage and the caller's
+    file without buffering the whole blob in memory.
+    """
+    def __init__(self, connection_string: str = None, account_url: str = None, credential=None,
+                 block_size: int = DEFAULT_BLOCK_SIZE, single_put_size: int = DEFAULT_SINGLE_PUT_SIZE,
+                 single_get_size: int = DEFAULT_SINGLE_GET_SIZE, chunk_get_size: int = DEFAULT_CHUNK_GET_SIZE,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        """Initialize storage client.
+
+        :param connection_string: Connection string of the storage account, defaults to the
+            AZURE_STORAGE_CONNECTION_STRING env var
+        :type connection_string: str, optional
+        :param account_url: Url of the storage account, used when there is no connection string,
+            defaults to the AZURE_STORAGE_ACCOUNT_URL env var
+        :type account_url: str, optional
+        :param credential: Credential of the account url, defaults to DefaultAzureCredential
+        :param block_size: The size of an uploaded block, defaults to 8 MB
+        :type block_size: int, optional
+        :param single_put_size: Blobs up to this size are uploaded by one request, defaults to 8 MB
+        :type single_put_size: int, optional
+        :param single_get_size: The size of the first downloaded range, defaults to 8 MB
+        :type single_get_size: int, optional
+        :param chunk_get_size: The size of the following downloaded ranges, defaults to 8 MB
+        :type chunk_get_size: int, optional
+        :param max_concurrency: Maximum number of concurrent block or range requests, defaults to 8
+        :type max_concurrency: int, optional
+        """
+        self._connection_string = connection_string or os.environ.get(CONNECTION_STRING_ENV)
+        self._account_url = account_url or os.environ.get(ACCOUNT_URL_ENV)
+        self._credential = credential
+        self._client_options = {
+            "max_block_size": block_size,
+            "max_single_put_size": single_put_size,
+            "max_single_get_size": single_get_size,
+            "max_chunk_get_size": chunk_get_size,
+        }
+        self.max_concurrency = max_concurrency
+        self._service_client = None
+        self._service_client_lock = threading.Lock()
+
+    def _get_service_client(self) -> BlobServiceClient:
+        """Get the client of the configured storage account, created on first use.
+
+        :return: The service client, None if no account is configured
+        :rtype: BlobServiceClient
+        """
+        if self._service_client is None and (self._connection_string or self._account_url):
+            with self._service_client_lock:
+                if self._service_client is None:
+                    if self._connection_string:
+                        self._service_client = BlobServiceClient.from_connection_string(
+                            self._connection_string, **self._client_options)
+                    else:
+                        self._credential = self._credential or identity.DefaultAzureCredential()
+                        self._service_client = BlobServiceClient(
+                            self._account_url, credential=self._credential, **self._client_options)
+        return self._service_client
+
+    def _split_uri(self, uri: str) -> Tuple[str, str]:
+        """Split the URI of a blob of the configured account into container and blob name.
+
+        :param uri: The blob URL
+        :type uri: str
+        :raises AzureBlobURIError: When the URI is not a blob URL of the configured account
+        :return: The container and blob names
+        :rtype: Tuple[str, str]
+        """
+        service_client = self._get_service_client()
+        account_url = service_client.url.rstrip("/") + "/" if service_client else None
+        if not account_url or not uri.startswith(account_url) or urlparse(uri).query:
+            raise AzureBlobURIError(f"{uri} is not a blob of the account {account_url}.")
+        container_name, _, blob_name = uri[len(account_url):].partition("/")
+        if not container_name:
+            raise AzureBlobURIError(f"Wrong Azure blob URI {uri}.")
+        return container_name, unquote(blob_name)
+
+    def _get_blob_client(self, uri: str) -> BlobClient:
+        """Get the client of the blob at the given URI.
+
+        :param uri: The blob URL, optionally signed
+        :type uri: str
+        :raises AzureBlobURIError: When the URI is not a blob URL
+        :return: The blob client
+        :rtype: BlobClient
+        """
+        if urlparse(uri).scheme not in ("http", "https"):
+            raise AzureBlobURIError(f"Wrong Azure blob URI {uri}.")
+        try:
+            container_name, blob_name = self._split_uri(uri)
+        except AzureBlobURIError:
+            # signed URL or blob of another account
+            return BlobClient.from_blob_url(uri, credential=self._credential, **self._client_options)
+        if not blob_name:
+            raise AzureBlobURIError(f"Wrong Azure blob URI {uri}.")
+        return self._get_service_client().get_blob_client(container_name, blob_name)
 
     def does_file_exist(self, uri: str) -> bool:
         """Verify if a file exists in the given URI.
 
-        :param uri: The GCS URI of the file.
+        :param uri: The Azure blob URL of the file.
         :type uri: str
         :return: A boolean indicating if the file exists
         :rtype: bool
         """
-        pass
+        # a HEAD request, no matter the size of the blob
+        try:
+            self._get_blob_client(uri).get_blob_properties()
+        except ResourceNotFoundError:
+            return False
+        return True
 
-    def download_to_file(self, uri: str, file: FileLikeObject) -> Tuple[FileLikeObject, str]:
+    def download_to_file(self, uri: str, file: Union[FileLikeObject, str, os.PathLike]) -> Tuple[FileLikeObject, str]:
         """Download file from the given URI.
 
-        :param uri: The GCS URI of the file.
+        :param uri: The Azure blob URL of the file.
         :type uri: str
-        :param file: The file where to download the blob content
-        :type file: FileLikeObject
+        :param file: The file object where to write the blob content, or the path of a file
+        :type file: Union[FileLikeObject, str, os.PathLike]
         :return: A tuple containing the file and its content-type
-        :rtype: Tuple[io.BytesIO, str]
+        :rtype: Tuple[FileLikeObject, str]
         """
-        pass
+        downloader = self._get_blob_client(uri).download_blob(max_concurrency=self.max_concurrency)
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, "wb") as target:
+                downloader.readinto(target)
+        else:
+            # ranges are written in parallel into seekable files, sequentially otherwise
+            downloader.readinto(file)
+        logger.debug(f"File {uri} downloaded.")
+        return file, downloader.properties.content_settings.content_type
 
     def download_file_as_bytes(self, uri: str) -> Tuple[bytes, str]:
         """Download file as bytes from the given URI.
 
-        :param uri: The GCS URI of the file
+        :param uri: The Azure blob URL of the file
         :type uri: str
         :return: The file as bytes and its content-type
         :rtype: Tuple[bytes, str]
         """
-        pass
+        downloader = self._get_blob_client(uri).download_blob(max_concurrency=self.max_concurrency)
+        return downloader.readall(), downloader.properties.content_settings.content_type
+
+    def get_metadata(self, uri: str) -> BlobMetadata:
+        """Get size, content-type and version of the file at the given URI.
+
+        :param uri: The Azure blob URL of the file
+        :type uri: str
+        :return: The metadata of the file
+        :rtype: BlobMetadata
+        """
+        try:
+            properties = self._get_blob_client(uri).get_blob_properties()
+        except ResourceNotFoundError as err:
+            raise FileNotFoundError(f"File {uri} does not exist.") from err
+        return BlobMetadata(size=properties.size, content_type=properties.content_settings.content_type,
+                            etag=properties.etag, generation=properties.get("version_id"),
+                            content_encoding=properties.content_settings.content_encoding)
+
+    def download_range(self, uri: str, start: int, end: int) -> bytes:
+        """Download the bytes from start to end, both inclusive, of the file at the given URI.
+
+        :param uri: The Azure blob URL of the file
+        :type uri: str
+        :param start: Offset of the first byte
+        :type start: int
+        :param end: Offset of the last byte
+        :type end: int
+        :return: The bytes of the range
+        :rtype: bytes
+        """
+        check_range(start, end)
+        downloader = self._get_blob_client(uri).download_blob(offset=start, length=end - start + 1,
+                                                              max_concurrency=self.max_concurrency)
+        return downloader.readall()
+
+    def _list_uris(self, directory: str) -> Iterator[str]:
+        """List the URIs of the files directly in a directory.
+
+        :param directory: The Azure blob URL of the directory, ending with a slash
+        :type directory: str
+        :return: The URIs of the files
+        :rtype: Iterator[str]
+        """
+        container_name, prefix = self._split_uri(directory)
+        container_client = self._get_service_client().get_container_client(container_name)
+        for item in container_client.walk_blobs(name_starts_with=prefix or None, delimiter="/"):
+            if not isinstance(item, BlobPrefix):
+                yield directory + quote(item.name[len(prefix):])
+
+    def _get_listing_directory(self, uri: str) -> Optional[str]:
+        """Get the directory listed to verify the existence of a blob of the configured account.
+
+        :param uri: The Azure blob URL
+        :type uri: str
+        :return: The URL of the directory, None for signed URLs and blobs of other accounts
+        :rtype: Optional[str]
+        """
+        try:
+            self._split_uri(uri)
+        except AzureBlobURIError:
+            # checked one by one with the credential of the URL
+            return None
+        return super()._get_listing_directory(uri)
+
+    def _get_uri_key(self, uri: str) -> Tuple[str, str]:
+        """Get the container and blob name of a URI, the same for its quoted and unquoted forms.
+
+        :param uri: The Azure blob URL
+        :type uri: str
+        :return: The container and blob names
+        :rtype: Tuple[str, str]
+        """
+        return self._split_uri(uri)
 
-    def upload_file(self, uri: str, blob_file: FileLikeObject, content_type: str):
+    def upload_file(self, uri: str, blob_file: Union[FileLikeObject, str, os.PathLike], content_type: str,
+                    content_encoding: str = None):
         """Upload a file to the given uri.
 
-        :param uri: The GCS URI of the file
+        :param uri: The Azure blob URL of the file
         :type uri: str
-        :param blob: The file
-        :type blob: FileLikeObject
-        :param content_type: [description]
+        :param blob: The file object to read from, or the path of a file
+        :type blob: Union[FileLikeObject, str, os.PathLike]
+        :param content_type: The content-type stored with the blob
         :type content_type: str
+        :param content_encoding: The content-encoding stored with the blob, e.g. gzip, defaults to None
+        :type content_encoding: str, optional
         """
-        pass
+        blob_client = self._get_blob_client(uri)
+        content_settings = ContentSettings(content_type=content_type, content_encoding=content_encoding) \
+            if content_type or content_encoding else None
+        if isinstance(blob_file, (str, os.PathLike)):
+            with open(blob_file, "rb") as source:
+                blob_client.upload_blob(source, overwrite=True, content_settings=content_settings,
+                                        max_concurrency=self.max_concurrency)
+        else:
+            # blocks of seekable files are read and uploaded in parallel
+            blob_client.upload_blob(blob_file, overwrite=True, content_settings=content_settings,
+                                    max_concurrency=self.max_concurrency)
+        logger.debug(f"Uploaded file to {uri}.")
@@ -14,6 +14,8 @@
 """Azure Credential Module."""
 
 import logging
+import time
+from osdu_api.auth.token_cache import DEFAULT_REFRESH_MARGIN
 from osdu_api.providers.constants import AZURE_CLOUD_PROVIDER
 from osdu_api.providers.factory import ProvidersFactory
 from osdu_api.providers.types import BaseCredentials
@@ -28,6 +30,8 @@ import json
 
 logger = logging.getLogger(__name__)
 RETRIES = 3
+# seconds to wait for the instance metadata service
+IMDS_TIMEOUT = 10
 
 @ProvidersFactory.register(AZURE_CLOUD_PROVIDER)
 class AzureCredentials(BaseCredentials):
@@ -41,6 +45,10 @@ class AzureCredentials(BaseCredentials):
         self._tenant_id = None
         self._resource_id = None
         self._azure_paas_podidentity_isEnabled= os.getenv("AIRFLOW_VAR_AZURE_ENABLE_MSI")
+        # the app holds MSAL's token cache and the discovered authority metadata
+        self._msal_app = None
+        self._msi_token = None
+        self._msi_token_expires_on = 0.0
 
     def _populate_ad_credentials(self) -> None:
         uri = os.getenv("AIRFLOW_VAR_KEYVAULT_URI")
@@ -51,21 +59,40 @@ class AzureCredentials(BaseCredentials):
         self._tenant_id = client.get_secret('app-dev-sp-tenant-id').value
         self._resource_id = client.get_secret("aad-client-id").value
 
-    def _generate_token(self) -> str:
+    def _generate_msi_token(self, stale_token: str = None) -> str:
+        """Get a managed identity token from IMDS, reused until shortly before its expires_on
+        unless it is the stale token."""
+        if self._msi_token is not None and self._msi_token != stale_token \
+                and self._msi_token_expires_on - DEFAULT_REFRESH_MARGIN > time.time():
+            return self._msi_token
+        try:
+            print("MSI Token generation")
+            headers = {
+                'Metadata': 'true'
+            }
+            url = 'http://169.254.169.254/metadata/identity/oauth2/token?api-version=2018-02-01&resource=https%3A%2F%2Fmanagement.azure.com%2F'
+            response = requests.request("GET", url, headers=headers, timeout=IMDS_TIMEOUT)
+            data_msi = json.loads(response.text)
+            token = data_msi["access_token"]
+        except Exception as e:
+            logger.error(e)
+            raise e
+        self._msi_token = token
+        self._msi_token_expires_on = float(data_msi.get("expires_on") or 0)
+        return token
+
+    def _get_msal_app(self) -> msal.ConfidentialClientApplication:
+        if self._msal_app is None:
+            authority_host_uri = 'https://login.microsoftonline.com'
+            authority_uri = authority_host_uri + '/' + self._tenant_id
+            self._msal_app = msal.ConfidentialClientApplication(client_id = self._client_id,
+                                                                authority = authority_uri,
+                                                                client_credential = self._client_secret)
+        return self._msal_app
+
+    def _generate_token(self, stale_token: str = None) -> str:
         if self._azure_paas_podidentity_isEnabled == "true":
-            try:
-                print("MSI Token generation")
-                headers = {
-                    'Metadata': 'true'
-                }
-                url = 'http://169.254.169.254/metadata/identity/oauth2/token?api-version=2018-02-01&resource=https%3A%2F%2Fmanagement.azure.com%2F'
-                response = requests.request("GET", url, headers=headers)
-                data_msi = json.loads(response.text)
-                token = data_msi["access_token"]
-                return token
-            except Exception as e:
-                logger.error(e)
-                raise e
+            return self._generate_msi_token(stale_token)
         else:
             if self._client_id is None:
                 self._populate_ad_credentials()
@@ -83,18 +110,29 @@ class AzureCredentials(BaseCredentials):
                 raise ValueError("Please pass client secret to generate token")
 
             try:
-                authority_host_uri = 'https://login.microsoftonline.com'
-                authority_uri = authority_host_uri + '/' + self._tenant_id
                 scopes = [self._resource_id + '/.default']
-                app = msal.ConfidentialClientApplication(client_id = self._client_id,
-                                                         authority = authority_uri,
-                                                         client_credential = self._client_secret)
-                result = app.acquire_token_for_client(scopes=scopes)
+                app = self._get_msal_app()
+                if stale_token is not None:
+                    # acquire_token_for_client serves MSAL's cache too and does not support force_refresh
+                    for cached_token in app.token_cache.search(msal.TokenCache.CredentialType.ACCESS_TOKEN,
+                                                               target=scopes):
+                        if cached_token.get("secret") == stale_token:
+                            app.token_cache.remove_at(cached_token)
+                # served from MSAL's token cache until the token is about to expire
+                result = app.acquire_token_silent(scopes, account=None)
+                if not result:
+                    result = app.acquire_token_for_client(scopes=scopes)
                 return result.get('access_token')
             except Exception as e:
                 logger.error(e)
                 raise e
 
+    def _get_token_store_key(self) -> tuple:
+        """Tokens are stored per key vault holding the service principal, or for the managed identity."""
+        if self._azure_paas_podidentity_isEnabled == "true":
+            return super()._get_token_store_key() + ("msi",)
+        return super()._get_token_store_key() + (os.getenv("AIRFLOW_VAR_KEYVAULT_URI"),)
+
     @retry(stop=stop_after_attempt(RETRIES))
     def refresh_token(self) -> str:
         """Refresh token.
@@ -102,7 +140,7 @@ class AzureCredentials(BaseCredentials):
         :return: Refreshed token
         :rtype: str
         """
-        token = self._generate_token()
+        token = self._get_or_mint_token(self._generate_token)
         self._access_token = token
         return self._access_token
 
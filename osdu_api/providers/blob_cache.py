@@ -0,0 +1,357 @@
+#  Copyright 2021 Google LLC
+#  Copyright 2021 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+"""On-disk cache of downloaded blobs shared by the processes of a host."""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import struct
+import time
+import uuid
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple, Union
+
+from osdu_api.providers.blob_reader import check_range
+from osdu_api.providers.checksum import Checksum
+from osdu_api.providers.types import (DEFAULT_LISTING_THRESHOLD, DEFAULT_MAX_WORKERS, BlobListing,
+                                     BlobMetadata, BlobOperationResult, BlobStorageClient, DownloadResult,
+                                     FileLikeObject, ProgressCallback)
+from osdu_api.utils.file_lock import FileLock
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+DEFAULT_MAX_CACHE_SIZE = 1024 * MB
+COPY_BUFFER_SIZE = 1 * MB
+# temporary files left behind by killed processes are removed after this many seconds
+STALE_TEMP_FILE_AGE = 3600
+
+ENTRY_SUFFIX = ".blob"
+TEMP_SUFFIX = ".tmp"
+LOCKS_DIR = "locks"
+EVICTION_LOCK = "eviction.lock"
+# an entry is the blob content followed by a JSON header, its length and this magic
+TRAILER_MAGIC = b"OSDUBLB1"
+TRAILER_FORMAT = ">I8s"
+TRAILER_SIZE = struct.calcsize(TRAILER_FORMAT)
+
+
+class CachedBlobStorageClient(BlobStorageClient):
+    """Blob storage client caching the downloads of another client on the local disk.
+
+    Before a cached blob is served, its ETag and generation are compared to the ones
+    returned by get_metadata of the wrapped client, so changed blobs are downloaded
+    again. Blobs whose metadata has neither, or which are bigger than the cache, are
+    not cached. The least recently used blobs are evicted once the cache grows over
+    max_size bytes.
+
+    The cache directory may be shared by several processes: an entry is downloaded by
+    one of them at a time, entries are replaced atomically, and eviction is serialized
+    by file locks. Uploads, existence checks and ranged reads go to the wrapped client.
+    """
+
+    def __init__(self, client: BlobStorageClient, cache_dir: str, max_size: int = DEFAULT_MAX_CACHE_SIZE):
+        """
+        :param client: The client whose downloads are cached
+        :type client: BlobStorageClient
+        :param cache_dir: The directory of the cache, created if missing
+        :type cache_dir: str
+        :param max_size: The size of the cache in bytes, defaults to 1 GB
+        :type max_size: int, optional
+        """
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.client = client
+        self.cache_dir = os.path.abspath(cache_dir)
+        self.max_size = max_size
+        # blobs may hold restricted data, keep them private to the user
+        os.makedirs(os.path.join(self.cache_dir, LOCKS_DIR), mode=0o700, exist_ok=True)
+
+    def _get_entry_path(self, uri: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(uri.encode("utf-8")).hexdigest() + ENTRY_SUFFIX)
+
+    def _get_entry_lock(self, entry_path: str) -> FileLock:
+        # a bounded number of lock files, each guarding the entries starting with its prefix
+        return FileLock(os.path.join(self.cache_dir, LOCKS_DIR, os.path.basename(entry_path)[:2] + ".lock"))
+
+    def _get_cacheable_metadata(self, uri: str) -> Optional[BlobMetadata]:
+        try:
+            metadata = self.client.get_metadata(uri)
+        except NotImplementedError:
+            return None
+        if metadata.etag is None and metadata.generation is None:
+            return None
+        if metadata.size > self.max_size:
+            return None
+        return metadata
+
+    @staticmethod
+    def _read_header(entry: BinaryIO) -> Optional[dict]:
+        """Read the header of an entry, None if the entry is corrupted."""
+        try:
+            entry_size = entry.seek(0, io.SEEK_END)
+            if entry_size < TRAILER_SIZE:
+                return None
+            entry.seek(entry_size - TRAILER_SIZE)
+            header_size, magic = struct.unpack(TRAILER_FORMAT, entry.read(TRAILER_SIZE))
+            if magic != TRAILER_MAGIC or header_size > entry_size - TRAILER_SIZE:
+                return None
+            entry.seek(entry_size - TRAILER_SIZE - header_size)
+            header = json.loads(entry.read(header_size))
+            if header["size"] != entry_size - TRAILER_SIZE - header_size:
+                return None
+            return header
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    def _open_entry(self, entry_path: str, uri: str, metadata: BlobMetadata) -> Optional[Tuple[BinaryIO, dict]]:
+        """Open the entry of the uri, None if it is missing or does not match the metadata."""
+        try:
+            entry = open(entry_path, "rb")
+        except FileNotFoundError:
+            return None
+        header = self._read_header(entry)
+        if header is None or header["uri"] != uri or header["etag"] != metadata.etag \
+                or header["generation"] != metadata.generation:
+            entry.close()
+            return None
+        entry.seek(0)
+        return entry, header
+
+    def _is_unchanged(self, uri: str, metadata: BlobMetadata, size: int) -> bool:
+        """Check the blob did not change since its metadata was read, given the downloaded size."""
+        if size == metadata.size:
+            return True
+        if not metadata.content_encoding:
+            return False
+        # encoded blobs may be served decoded, e.g. by GCS transcoding, so their size differs
+        current = self.client.get_metadata(uri)
+        return (current.etag, current.generation) == (metadata.etag, metadata.generation)
+
+    def _add_entry(self, entry_path: str, uri: str, metadata: BlobMetadata) -> Tuple[BinaryIO, dict]:
+        """Download the blob into a new entry, which replaces the one at entry_path."""
+        temp_path = f"{entry_path}.{uuid.uuid4().hex}{TEMP_SUFFIX}"
+        entry = open(temp_path, "w+b")
+        try:
+            result = self.client.download_to_file(uri, entry)
+            checksum = getattr(result, "checksum", None)
+            size = entry.seek(0, io.SEEK_END)
+            header = {"uri": uri, "etag": metadata.etag, "generation": metadata.generation,
+                      "size": size, "content_type": result[1],
+                      "checksum": [checksum.algorithm, checksum.value] if checksum is not None else None}
+            encoded_header = json.dumps(header).encode("utf-8")
+            if self._is_unchanged(uri, metadata, size):
+                entry.write(encoded_header)
+                entry.write(struct.pack(TRAILER_FORMAT, len(encoded_header), TRAILER_MAGIC))
+                entry.flush()
+                os.replace(temp_path, entry_path)
+            else:
+                # the blob changed since its metadata was read, serve it without caching it
+                logger.debug(f"File {uri} changed while it was downloaded, it is not cached.")
+                os.unlink(temp_path)
+        except BaseException:
+            entry.close()
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+        entry.seek(0)
+        return entry, header
+
+    def _get_entry(self, uri: str) -> Optional[Tuple[BinaryIO, dict]]:
+        """Get the open entry of the uri and its header, downloading the blob if it is not
+        cached, or None if the blob can not be cached."""
+        metadata = self._get_cacheable_metadata(uri)
+        if metadata is None:
+            return None
+        entry_path = self._get_entry_path(uri)
+        with self._get_entry_lock(entry_path):
+            cached = self._open_entry(entry_path, uri, metadata)
+            if cached is not None:
+                logger.debug(f"File {uri} served from the cache.")
+                # the modification time orders the entries for eviction
+                os.utime(entry_path)
+                return cached
+            cached = self._add_entry(entry_path, uri, metadata)
+        self._evict()
+        return cached
+
+    def _evict(self):
+        """Remove the least recently used entries until the cache fits in max_size."""
+        with FileLock(os.path.join(self.cache_dir, LOCKS_DIR, EVICTION_LOCK)):
+            entries = []
+            total_size = 0
+            now = time.time()
+            with os.scandir(self.cache_dir) as scanned:
+                for dir_entry in scanned:
+                    try:
+                        stat = dir_entry.stat()
+                        if dir_entry.name.endswith(ENTRY_SUFFIX):
+                            entries.append((stat.st_mtime, stat.st_size, dir_entry.path))
+                            total_size += stat.st_size
+                        elif dir_entry.name.endswith(TEMP_SUFFIX) and now - stat.st_mtime > STALE_TEMP_FILE_AGE:
+                            os.unlink(dir_entry.path)
+                    except FileNotFoundError:
+                        continue
+            if total_size <= self.max_size:
+                return
+            # entries being read stay readable until they are closed
+            for _, size, path in sorted(entries):
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+                total_size -= size
+                if total_size <= self.max_size:
+                    break
+
+    @staticmethod
+    def _get_checksum(header: dict) -> Optional[Checksum]:
+        """Get the checksum verified when the entry was downloaded, None if it was not verified."""
+        if not header.get("checksum"):
+            return None
+        return Checksum(*header["checksum"])
+
+    @staticmethod
+    def _copy(entry: BinaryIO, file: BinaryIO, size: int):
+        while size > 0:
+            chunk = entry.read(min(size, COPY_BUFFER_SIZE))
+            if not chunk:
+                raise EOFError("Unexpected end of cache entry")
+            file.write(chunk)
+            size -= len(chunk)
+
+    def download_to_file(self, uri: str, file: Union[FileLikeObject, str, os.PathLike]) -> Tuple[FileLikeObject, str]:
+        """Download file from the given URI, from the cache if it is up to date.
+
+        :param uri: The full URI of the file
+        :type uri: str
+        :param file: The file object where to write the blob content, or the path of a file
+        :type file: Union[FileLikeObject, str, os.PathLike]
+        :return: A tuple containing the file and its content-type
+        :rtype: Tuple[FileLikeObject, str]
+        """
+        cached = self._get_entry(uri)
+        if cached is None:
+            result = self.client.download_to_file(uri, file)
+            return DownloadResult(result[0], result[1], getattr(result, "checksum", None))
+        entry, header = cached
+        with entry:
+            if isinstance(file, (str, os.PathLike)):
+                with open(file, "wb") as target:
+                    self._copy(entry, target, header["size"])
+            else:
+                self._copy(entry, file, header["size"])
+        return DownloadResult(file, header["content_type"], self._get_checksum(header))
+
+    def download_file_as_bytes(self, uri: str) -> Tuple[bytes, str]:
+        """Download file as bytes from the given URI, from the cache if it is up to date.
+
+        :param uri: The full URI of the file
+        :type uri: str
+        :return: The file as bytes and its content-type
+        :rtype: Tuple[bytes, str]
+        """
+        cached = self._get_entry(uri)
+        if cached is None:
+            result = self.client.download_file_as_bytes(uri)
+            return DownloadResult(result[0], result[1], getattr(result, "checksum", None))
+        entry, header = cached
+        with entry:
+            return DownloadResult(entry.read(header["size"]), header["content_type"], self._get_checksum(header))
+
+    def invalidate(self, uri: str = None):
+        """Remove the cached blob of the uri, or all cached blobs when uri is None.
+
+        :param uri: The full URI of the file, defaults to None
+        :type uri: str, optional
+        """
+        if uri is not None:
+            entry_path = self._get_entry_path(uri)
+            with self._get_entry_lock(entry_path):
+                if os.path.exists(entry_path):
+                    os.unlink(entry_path)
+            return
+        with FileLock(os.path.join(self.cache_dir, LOCKS_DIR, EVICTION_LOCK)):
+            with os.scandir(self.cache_dir) as scanned:
+                for dir_entry in scanned:
+                    if dir_entry.name.endswith(ENTRY_SUFFIX):
+                        try:
+                            os.unlink(dir_entry.path)
+                        except FileNotFoundError:
+                            pass
+
+    def upload_file(self, uri: str, file: FileLikeObject, content_type: str, content_encoding: str = None):
+        """Upload a file to the given uri with the wrapped client.
+
+        :param uri: The full URI of the file
+        :type uri: str
+        :param file: The file object to read from
+        :type file: FileLikeObject
+        :param content_type: The content-type stored with the blob
+        :type content_type: str
+        :param content_encoding: The content-encoding stored with the blob, e.g. gzip, defaults to None
+        :type content_encoding: str, optional
+        :return: The value returned by the wrapped client
+        """
+        # the cached copy is found outdated by its ETag on the next download
+        if content_encoding:
+            return self.client.upload_file(uri, file, content_type, content_encoding=content_encoding)
+        return self.client.upload_file(uri, file, content_type)
+
+    def does_file_exist(self, uri: str) -> bool:
+        """Verify if a file exists in the given URI with the wrapped client.
+
+        :param uri: The full URI of the file
+        :type uri: str
+        :return: A boolean indicating if the file exists
+        :rtype: bool
+        """
+        return self.client.does_file_exist(uri)
+
+    def get_metadata(self, uri: str) -> BlobMetadata:
+        """Get the metadata of the file at the given URI with the wrapped client.
+
+        :param uri: The full URI of the file
+        :type uri: str
+        :return: The metadata of the file
+        :rtype: BlobMetadata
+        """
+        return self.client.get_metadata(uri)
+
+    def download_range(self, uri: str, start: int, end: int) -> bytes:
+        """Download the bytes from start to end, both inclusive, with the wrapped client.
+
+        :param uri: The full URI of the file
+        :type uri: str
+        :param start: Offset of the first byte
+        :type start: int
+        :param end: Offset of the last byte
+        :type end: int
+        :return: The bytes of the range
+        :rtype: bytes
+        """
+        check_range(start, end)
+        return self.client.download_range(uri, start, end)
+
+    def exists_many(self, uris: Iterable[str], max_workers: int = DEFAULT_MAX_WORKERS,
+                    progress_callback: ProgressCallback = None,
+                    listing_threshold: int = DEFAULT_LISTING_THRESHOLD) -> List[BlobOperationResult]:
+        """Verify concurrently if files exist with the wrapped client, see BlobStorageClient.exists_many."""
+        return self.client.exists_many(uris, max_workers, progress_callback, listing_threshold)
+
+    def list(self, prefix: str, *args, **kwargs) -> Iterator[BlobListing]:
+        """List the blobs under a prefix with the wrapped client, see BlobStorageClient.list."""
+        return self.client.list(prefix, *args, **kwargs)
@@ -0,0 +1,145 @@
+#  Copyright 2021 Google LLC
+#  Copyright 2021 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+"""Seekable reader over a blob backed by ranged downloads."""
+
+import collections
+import io
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+MB = 1024 * 1024
+DEFAULT_BLOCK_SIZE = 1 * MB
+DEFAULT_READ_AHEAD = 2
+
+
+class BlobReader(io.RawIOBase):
+    """Raw, seekable reader of a blob of known size.
+
+    The blob is read in blocks of block_size bytes, each fetched by one ranged
+    download. Once blocks are read sequentially, the next read_ahead blocks are
+    fetched in the background. Use it wrapped in an io.BufferedReader, see
+    BlobStorageClient.open_read.
+    """
+
+    def __init__(self, download_range: Callable[[int, int], bytes], size: int,
+                 block_size: int = DEFAULT_BLOCK_SIZE, read_ahead: int = DEFAULT_READ_AHEAD):
+        """
+        :param download_range: Function returning the bytes from start to end, both inclusive
+        :type download_range: Callable[[int, int], bytes]
+        :param size: The size of the blob
+        :type size: int
+        :param block_size: The size of a ranged download, defaults to 1 MB
+        :type block_size: int, optional
+        :param read_ahead: Number of blocks fetched ahead of sequential reads, defaults to 2
+        :type read_ahead: int, optional
+        """
+        super().__init__()
+        if block_size <= 0:
+            raise ValueError("block_size must be positive")
+        self._download_range = download_range
+        self._size = size
+        self._block_size = block_size
+        self._read_ahead = max(0, read_ahead)
+        self._executor = ThreadPoolExecutor(max_workers=self._read_ahead) if self._read_ahead else None
+        self._blocks = collections.OrderedDict()
+        self._last_index = None
+        self._position = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        self._checkClosed()
+        return self._position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        self._checkClosed()
+        if whence == os.SEEK_SET:
+            position = offset
+        elif whence == os.SEEK_CUR:
+            position = self._position + offset
+        elif whence == os.SEEK_END:
+            position = self._size + offset
+        else:
+            raise ValueError(f"Invalid whence {whence}")
+        if position < 0:
+            raise ValueError(f"Negative seek position {position}")
+        self._position = position
+        return position
+
+    def readinto(self, buffer) -> int:
+        self._checkClosed()
+        if self._position >= self._size:
+            return 0
+        index, offset = divmod(self._position, self._block_size)
+        block = self._get_block(index)
+        count = min(len(buffer), len(block) - offset)
+        buffer[:count] = block[offset:offset + count]
+        self._position += count
+        return count
+
+    def _fetch_block(self, index: int) -> bytes:
+        start = index * self._block_size
+        end = min(start + self._block_size, self._size) - 1
+        return self._download_range(start, end)
+
+    def _submit_block(self, index: int) -> Future:
+        if self._executor is None:
+            future = Future()
+            future.set_result(self._fetch_block(index))
+            return future
+        return self._executor.submit(self._fetch_block, index)
+
+    def _get_block(self, index: int) -> bytes:
+        future = self._blocks.get(index)
+        if future is None:
+            future = self._submit_block(index)
+            self._blocks[index] = future
+
+        sequential = self._last_index is not None and index == self._last_index + 1
+        self._last_index = index
+        last_block = (self._size - 1) // self._block_size
+        if sequential:
+            for ahead in range(index + 1, min(index + self._read_ahead, last_block) + 1):
+                if ahead not in self._blocks:
+                    self._blocks[ahead] = self._submit_block(ahead)
+
+        # keep the current block and the blocks fetched ahead of it only
+        for cached in [cached for cached in self._blocks if not index <= cached <= index + self._read_ahead]:
+            self._blocks.pop(cached).cancel()
+        return future.result()
+
+    def close(self):
+        if not self.closed:
+            for future in self._blocks.values():
+                future.cancel()
+            self._blocks.clear()
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+        super().close()
+
+
+def check_range(start: int, end: int):
+    """Raise ValueError unless start to end, both inclusive, is a valid byte range."""
+    if start < 0 or end < start:
+        raise ValueError(f"Invalid byte range {start}-{end}")
@@ -19,12 +19,19 @@ import logging
 import os
 
 
+from osdu_api.providers.blob_cache import DEFAULT_MAX_CACHE_SIZE, CachedBlobStorageClient
+from osdu_api.providers.codec import CompressingBlobStorageClient
 from osdu_api.providers.factory import ProvidersFactory
 from osdu_api.providers.types import BlobStorageClient
 
 
 logger = logging.getLogger()
 
+# directory of the download cache shared by the clients, unset disables caching
+CACHE_DIR_ENV = "BLOB_STORAGE_CACHE_DIR"
+# content-encoding of compressed uploads (gzip or zstd), unset disables compression
+COMPRESSION_ENV = "BLOB_STORAGE_COMPRESSION"
+
 
 def _import_provider_specific_storage_client_module(provider: str) -> str:
     """
@@ -35,12 +42,21 @@ def _import_provider_specific_storage_client_module(provider: str) -> str:
     return module_name
 
 
-def get_client(cloud_env: str = None) -> BlobStorageClient:
+def get_client(cloud_env: str = None, cache_dir: str = None,
+               cache_max_size: int = DEFAULT_MAX_CACHE_SIZE, compression: str = None) -> BlobStorageClient:
     """Get specific blob storage client according to cloud environment.
 
     :param cloud_env: Name of the provided cloud env, if not given,
         `CLOUD_PROVIDER` env var should be set.
     :type cloud_env: str, optional
+    :param cache_dir: Directory where downloaded files are cached, see CachedBlobStorageClient,
+        defaults to the `BLOB_STORAGE_CACHE_DIR` env var, downloads are not cached if neither is set
+    :type cache_dir: str, optional
+    :param cache_max_size: Size of the cache in bytes, defaults to 1 GB
+    :type cache_max_size: int, optional
+    :param compression: Content-encoding of compressed uploads, gzip or zstd, see CompressingBlobStorageClient,
+        defaults to the `BLOB_STORAGE_COMPRESSION` env var, blobs are not compressed if neither is set
+    :type compression: str, optional
     :return: An instance of BlobStorageClient
     :rtype: BlobStorageClient
     """
@@ -51,4 +67,12 @@ def get_client(cloud_env: str = None) -> BlobStorageClient:
     except ModuleNotFoundError as exc:
         logger.critical(f"Error occurred while importing blob storage client module for {cloud_env}")
         logger.critical(f"Exception: {exc}")
-    return ProvidersFactory.get_blob_storage_client(cloud_env)
+    client = ProvidersFactory.get_blob_storage_client(cloud_env)
+    cache_dir = cache_dir or os.environ.get(CACHE_DIR_ENV)
+    if cache_dir:
+        client = CachedBlobStorageClient(client, cache_dir, cache_max_size)
+    compression = compression or os.environ.get(COMPRESSION_ENV)
+    if compression:
+        # the cache holds the bytes as served by the storage, compressed or already decoded
+        client = CompressingBlobStorageClient(client, compression)
+    return client
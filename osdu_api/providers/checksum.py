@@ -0,0 +1,289 @@
+#  Copyright 2021 Google LLC
+#  Copyright 2021 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+"""Checksums computed while blobs stream through the storage clients."""
+
+import base64
+import hashlib
+import io
+import os
+from typing import List, Optional
+
+from osdu_api.providers.exceptions import ChecksumMismatchError
+
+try:
+    import google_crc32c
+except ImportError:  # only required by providers storing CRC32C checksums, e.g. GCS
+    google_crc32c = None
+
+CRC32C = "CRC32C"
+MD5 = "MD5"
+# "true" enables the verification of transfers by the clients that are built by the factory
+VERIFY_CHECKSUMS_ENV = "BLOB_STORAGE_VERIFY_CHECKSUMS"
+
+
+def is_verification_enabled(verify_checksums: Optional[bool]) -> bool:
+    """Resolve the verify_checksums option of a client, None falls back to the env var."""
+    if verify_checksums is None:
+        return os.environ.get(VERIFY_CHECKSUMS_ENV, "").lower() == "true"
+    return verify_checksums
+
+
+class Checksum:
+    """Checksum of the content of a blob, e.g. for the Checksum and ChecksumAlgorithm
+    properties of a dataset record."""
+
+    def __init__(self, algorithm: str, value: str):
+        """
+        :param algorithm: The algorithm, CRC32C or MD5
+        :type algorithm: str
+        :param value: The checksum as lowercase hexadecimal number
+        :type value: str
+        """
+        self.algorithm = algorithm
+        self.value = value
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Checksum) and (self.algorithm, self.value) == (other.algorithm, other.value)
+
+    def __repr__(self) -> str:
+        return f"Checksum({self.algorithm!r}, {self.value!r})"
+
+
+class _Crc32cHasher:
+    """CRC32C hasher with the interface of hashlib's hashers."""
+
+    def __init__(self):
+        # hardware accelerated where the CPU supports it
+        self._checksum = google_crc32c.Checksum()
+
+    def update(self, data):
+        # the C extension only accepts bytes
+        self._checksum.update(data if isinstance(data, bytes) else bytes(data))
+
+    def hexdigest(self) -> str:
+        return self._checksum.digest().hex()
+
+
+def new_hasher(algorithm: str):
+    """Get a hasher of the algorithm with hashlib's update and hexdigest methods.
+
+    :param algorithm: CRC32C or MD5
+    :type algorithm: str
+    :return: The hasher
+    """
+    if algorithm == MD5:
+        return hashlib.md5()
+    if algorithm == CRC32C:
+        if google_crc32c is None:
+            raise ImportError("google-crc32c is required to compute CRC32C checksums")
+        return _Crc32cHasher()
+    raise ValueError(f"Unsupported checksum algorithm {algorithm}")
+
+
+def compute_checksum(algorithm: str, data: bytes) -> Checksum:
+    """Compute the checksum of bytes held in memory."""
+    hasher = new_hasher(algorithm)
+    hasher.update(data)
+    return Checksum(algorithm, hasher.hexdigest())
+
+
+def decode_base64_checksum(algorithm: str, value: Optional[str]) -> Optional[Checksum]:
+    """Decode a base64 encoded checksum as stored by GCS, None if there is none."""
+    if not value:
+        return None
+    return Checksum(algorithm, base64.b64decode(value).hex())
+
+
+def verify_checksum(uri: str, expected: Optional[Checksum], actual: Checksum):
+    """Compare the checksum of transferred bytes to the stored one.
+
+    :param uri: The URI of the blob, for the error message
+    :type uri: str
+    :param expected: The stored checksum, nothing is verified if it is None
+    :type expected: Optional[Checksum]
+    :param actual: The checksum of the transferred bytes
+    :type actual: Checksum
+    :raises ChecksumMismatchError: When the checksums differ
+    """
+    if expected is not None and expected != actual:
+        raise ChecksumMismatchError(f"{actual.algorithm} checksum of {uri} is {actual.value}, "
+                                    f"{expected.value} is stored.")
+
+
+class ETagHasher:
+    """MD5 hasher also computing the ETag of S3 compatible stores.
+
+    The ETag of an object uploaded in one request is the MD5 of its content, of a multipart
+    upload the MD5 of the MD5s of its parts followed by the number of parts. It can only be
+    verified if the parts had part_size bytes, which holds for objects transferred with the
+    same multipart settings.
+    """
+
+    def __init__(self, part_size: int):
+        """
+        :param part_size: The size of the parts of multipart uploads
+        :type part_size: int
+        """
+        self.part_size = part_size
+        self._hasher = hashlib.md5()
+        self._part_digests = []
+        self._part_hasher = hashlib.md5()
+        self._part_remaining = part_size
+
+    def update(self, data: bytes):
+        self._hasher.update(data)
+        view = memoryview(data)
+        while len(view):
+            chunk = view[:self._part_remaining]
+            self._part_hasher.update(chunk)
+            self._part_remaining -= len(chunk)
+            view = view[len(chunk):]
+            if self._part_remaining == 0:
+                self._part_digests.append(self._part_hasher.digest())
+                self._part_hasher = hashlib.md5()
+                self._part_remaining = self.part_size
+
+    def hexdigest(self) -> str:
+        return self._hasher.hexdigest()
+
+    def _get_part_digests(self) -> List[bytes]:
+        if self._part_remaining != self.part_size or not self._part_digests:
+            return self._part_digests + [self._part_hasher.digest()]
+        return self._part_digests
+
+    def verify_etag(self, uri: str, etag: Optional[str]):
+        """Compare the ETag of the hashed bytes to the stored one.
+
+        ETags not computed from the content (e.g. of encrypted objects) or of multipart
+        uploads with other part sizes are not verified.
+
+        :param uri: The URI of the blob, for the error message
+        :type uri: str
+        :param etag: The stored ETag
+        :type etag: Optional[str]
+        :raises ChecksumMismatchError: When the ETags differ
+        """
+        etag = (etag or "").strip('"').lower()
+        digest, _, part_count = etag.partition("-")
+        if len(digest) != 32:
+            return
+        if not part_count:
+            verify_checksum(uri, Checksum(MD5, digest), Checksum(MD5, self.hexdigest()))
+            return
+        part_digests = self._get_part_digests()
+        if not part_count.isdigit() or int(part_count) != len(part_digests):
+            return
+        multipart_digest = hashlib.md5(b"".join(part_digests)).hexdigest()
+        if multipart_digest != digest:
+            raise ChecksumMismatchError(f"ETag of {uri} is {multipart_digest}-{len(part_digests)}, "
+                                        f"{etag} is stored.")
+
+
+class HashingReader(io.RawIOBase):
+    """Readable file wrapper hashing the bytes read from the underlying file.
+
+    Every byte is hashed once, in order: bytes read again after seeking back, e.g. by a
+    retried request, are not hashed again. Reading past bytes that were skipped by seeking
+    forward makes the checksum invalid.
+    """
+
+    def __init__(self, file, hasher, seekable: bool = True):
+        """
+        :param file: The file, read from its current position
+        :param hasher: The hasher with update and hexdigest methods
+        :param seekable: Allow seeking the file, defaults to True
+        :type seekable: bool, optional
+        """
+        super().__init__()
+        self._file = file
+        self._hasher = hasher
+        self._seekable = seekable
+        self._start = file.tell() if seekable else 0
+        self._position = self._start
+        self._hashed_to = self._start
+        self.valid = True
+
+    @property
+    def hasher(self):
+        return self._hasher
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return self._seekable
+
+    def tell(self) -> int:
+        return self._position if self._seekable else self._file.tell()
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if not self._seekable:
+            raise io.UnsupportedOperation("seek")
+        self._position = self._file.seek(offset, whence)
+        return self._position
+
+    def _hash(self, data: bytes):
+        end = self._position + len(data)
+        if self._position > self._hashed_to:
+            self.valid = False
+        elif end > self._hashed_to:
+            self._hasher.update(data[self._hashed_to - self._position:])
+            self._hashed_to = end
+        self._position = end
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._file.read(size)
+        self._hash(data)
+        return data
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def readall(self) -> bytes:
+        return self.read()
+
+
+class HashingWriter(io.RawIOBase):
+    """Writable, non seekable file wrapper hashing the bytes written to the underlying file.
+
+    Not being seekable, transfers writing ranges downloaded in parallel write them in order.
+    """
+
+    def __init__(self, file, hasher):
+        """
+        :param file: The file, written from its current position
+        :param hasher: The hasher with update and hexdigest methods
+        """
+        super().__init__()
+        self._file = file
+        self._hasher = hasher
+
+    @property
+    def hasher(self):
+        return self._hasher
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._file.write(data)
+        self._hasher.update(data)
+        return len(data)
+
+    def flush(self):
+        if not self.closed:
+            self._file.flush()
@@ -0,0 +1,434 @@
+#  Copyright 2021 Google LLC
+#  Copyright 2021 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+"""Streaming compression of blobs with the matching content-encoding."""
+
+import fnmatch
+import io
+import logging
+import os
+import zlib
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+from osdu_api.providers.types import BlobListing, BlobMetadata, BlobStorageClient, DownloadResult, FileLikeObject
+
+try:
+    import zstandard
+except ImportError:  # only required by the zstd codec
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+GZIP = "gzip"
+ZSTD = "zstd"
+CHUNK_SIZE = 1024 * 1024
+# compressed by default, other content, e.g. images or seismic data, is stored as it is
+DEFAULT_COMPRESSED_CONTENT_TYPES = (
+    "text/*",
+    "application/json",
+    "application/*+json",
+    "application/x-ndjson",
+    "application/xml",
+    "application/*+xml",
+    "application/x-yaml",
+    "application/yaml",
+    "application/x-las",
+)
+
+
+class Codec:
+    """Streaming compression format, named like its content-encoding."""
+
+    encoding = None
+    magic = None
+
+    def compressor(self):
+        """Get an object with compress(data) and flush() methods."""
+        raise NotImplementedError
+
+    def decompressor(self):
+        """Get an object with decompress(data), eof and unused_data."""
+        raise NotImplementedError
+
+
+class GzipCodec(Codec):
+    """gzip compression with zlib."""
+
+    encoding = GZIP
+    magic = b"\x1f\x8b"
+
+    def __init__(self, level: int = 6):
+        """
+        :param level: The compression level from 1 (fastest) to 9 (smallest), defaults to 6
+        :type level: int, optional
+        """
+        self.level = level
+
+    def compressor(self):
+        return zlib.compressobj(self.level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def decompressor(self):
+        return zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+
+class _ZstdCompressor:
+    """zstandard compressor with the interface of zlib's compress objects."""
+
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+
+class ZstdCodec(Codec):
+    """Zstandard compression, faster than gzip at a similar ratio, requires zstandard."""
+
+    encoding = ZSTD
+    magic = b"\x28\xb5\x2f\xfd"
+
+    def __init__(self, level: int = 3):
+        """
+        :param level: The compression level from 1 (fastest) to 22 (smallest), defaults to 3
+        :type level: int, optional
+        """
+        if zstandard is None:
+            raise ImportError("zstandard is required for zstd compression, install osdu_api[zstd]")
+        self.level = level
+
+    def compressor(self):
+        return _ZstdCompressor(self.level)
+
+    def decompressor(self):
+        return zstandard.ZstdDecompressor().decompressobj()
+
+
+def get_codec(encoding: str) -> Codec:
+    """Get the codec of a content-encoding.
+
+    :param encoding: gzip or zstd
+    :type encoding: str
+    :return: The codec with default compression level
+    :rtype: Codec
+    """
+    if encoding == GZIP:
+        return GzipCodec()
+    if encoding == ZSTD:
+        return ZstdCodec()
+    raise ValueError(f"Unsupported content-encoding {encoding}")
+
+
+class CompressingReader(io.RawIOBase):
+    """Readable, non seekable file returning the compressed content of another file.
+
+    The file is compressed in chunks while it is read, at most one chunk of it and its
+    compressed bytes are held in memory.
+    """
+
+    def __init__(self, file, codec: Codec, chunk_size: int = CHUNK_SIZE):
+        """
+        :param file: The file to compress, read from its current position
+        :param codec: The compression codec
+        :type codec: Codec
+        :param chunk_size: The size of the chunks read from the file, defaults to 1 MB
+        :type chunk_size: int, optional
+        """
+        super().__init__()
+        self._file = file
+        self._compressor = codec.compressor()
+        self._chunk_size = chunk_size
+        self._buffer = bytearray()
+        self._finished = False
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def _fill(self, size: int):
+        while not self._finished and (size < 0 or len(self._buffer) < size):
+            data = self._file.read(self._chunk_size)
+            if data:
+                self._buffer += self._compressor.compress(data)
+            else:
+                self._buffer += self._compressor.flush()
+                self._finished = True
+
+    def read(self, size: int = -1) -> bytes:
+        size = -1 if size is None else size
+        self._fill(size)
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        self._position += len(data)
+        return data
+
+    def readinto(self, buffer) -> int:
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def readall(self) -> bytes:
+        return self.read()
+
+
+class DecompressingWriter(io.RawIOBase):
+    """Writable, non seekable file decompressing the bytes written to it into another file.
+
+    The format is sniffed from the magic bytes of the content, content that is not
+    compressed, e.g. because the storage already decompressed it while serving it
+    (decompressive transcoding of GCS), is written as it is. finish() must be called
+    once all bytes were written.
+    """
+
+    def __init__(self, file, codecs: Tuple[Codec, ...]):
+        """
+        :param file: The file receiving the decompressed content
+        :param codecs: The codecs the content may be compressed with
+        :type codecs: Tuple[Codec, ...]
+        """
+        super().__init__()
+        self._file = file
+        self._codecs = codecs
+        self._codec = None
+        self._decompressor = None
+        self._header = b""
+        self._sniffed = False
+
+    def writable(self) -> bool:
+        return True
+
+    def _sniff(self, data: bytes) -> bytes:
+        """Detect the format once enough bytes were written, return the bytes to process."""
+        self._header += data
+        if len(self._header) < max(len(codec.magic) for codec in self._codecs):
+            return b""
+        self._sniffed = True
+        self._codec = next((codec for codec in self._codecs if self._header.startswith(codec.magic)), None)
+        data, self._header = self._header, b""
+        return data
+
+    def _decompress(self, data: bytes):
+        while data:
+            if self._decompressor is None:
+                self._decompressor = self._codec.decompressor()
+            self._file.write(self._decompressor.decompress(data))
+            if not self._decompressor.eof:
+                return
+            # concatenated members, e.g. of appended gzip files
+            data = self._decompressor.unused_data
+            self._decompressor = None
+
+    def write(self, data) -> int:
+        size = len(data)
+        data = bytes(data)
+        if not self._sniffed:
+            data = self._sniff(data)
+        if self._codec is None:
+            self._file.write(data)
+        else:
+            self._decompress(data)
+        return size
+
+    def finish(self):
+        """Write the remaining bytes.
+
+        :raises EOFError: When the compressed content is truncated
+        """
+        if not self._sniffed:
+            # shorter than any magic number, so not compressed
+            self._file.write(self._header)
+            self._header = b""
+            self._sniffed = True
+        if self._decompressor is not None and not self._decompressor.eof:
+            raise EOFError("Compressed content ended before the end-of-stream marker was reached")
+
+
+def decompress(data: bytes, codecs: Tuple[Codec, ...]) -> bytes:
+    """Decompress bytes held in memory, see DecompressingWriter."""
+    file = io.BytesIO()
+    writer = DecompressingWriter(file, codecs)
+    writer.write(data)
+    writer.finish()
+    return file.getvalue()
+
+
+class CompressingBlobStorageClient(BlobStorageClient):
+    """Blob storage client compressing uploads and decompressing downloads of another client.
+
+    Files whose content-type matches one of compressed_content_types are compressed while
+    they are uploaded and stored with the content-encoding of the codec. Downloads of blobs
+    stored with a known content-encoding are decompressed while they are written. Whether
+    the bytes are compressed is sniffed from their magic bytes, as some storages decompress
+    them when serving them. Ranged reads return the stored bytes.
+    """
+
+    def __init__(self, client: BlobStorageClient, codec: Union[Codec, str] = GZIP,
+                 compressed_content_types: Tuple[str, ...] = DEFAULT_COMPRESSED_CONTENT_TYPES,
+                 codecs_by_content_type: Dict[str, Union[Codec, str]] = None):
+        """
+        :param client: The client storing the blobs
+        :type client: BlobStorageClient
+        :param codec: The codec of the compressed content types, defaults to gzip
+        :type codec: Union[Codec, str], optional
+        :param compressed_content_types: Patterns of the content types to compress, e.g. text/*
+        :type compressed_content_types: Tuple[str, ...], optional
+        :param codecs_by_content_type: Codecs of content type patterns, taking precedence
+            over codec, e.g. {"text/csv": "zstd"}, defaults to None
+        :type codecs_by_content_type: Dict[str, Union[Codec, str]], optional
+        """
+        self.client = client
+        default_codec = get_codec(codec) if isinstance(codec, str) else codec
+        self._codecs_by_content_type = [
+            (pattern, get_codec(codec) if isinstance(codec, str) else codec)
+            for pattern, codec in (codecs_by_content_type or {}).items()
+        ] + [(pattern, default_codec) for pattern in compressed_content_types]
+        self._decoding_codecs = {GZIP: GzipCodec()}
+        if zstandard is not None:
+            self._decoding_codecs[ZSTD] = ZstdCodec()
+        for _, codec in self._codecs_by_content_type:
+            self._decoding_codecs[codec.encoding] = codec
+
+    def get_codec_for_content_type(self, content_type: Optional[str]) -> Optional[Codec]:
+        """Get the codec compressing files of a content-type.
+
+        :param content_type: The content-type, parameters like charset are ignored
+        :type content_type: Optional[str]
+        :return: The codec, None if the content is not compressed
+        :rtype: Optional[Codec]
+        """
+        if not content_type:
+            return None
+        media_type = content_type.split(";", 1)[0].strip().lower()
+        for pattern, codec in self._codecs_by_content_type:
+            if fnmatch.fnmatchcase(media_type, pattern):
+                return codec
+        return None
+
+    def _get_decoding_codecs(self, uri: str) -> Optional[Tuple[Codec, ...]]:
+        """Get the codecs the stored bytes may be compressed with, None if they are not compressed."""
+        try:
+            content_encoding = self.client.get_metadata(uri).content_encoding
+        except NotImplementedError:
+            # all compressed formats are sniffed
+            return tuple(self._decoding_codecs.values())
+        codec = self._decoding_codecs.get((content_encoding or "").lower())
+        return (codec,) if codec is not None else None
+
+    def download_to_file(self, uri: str, file: FileLikeObject) -> Tuple[FileLikeObject, str]:
+        """Download file from the given URI, decompressing it.
+
+        :param uri: The full URI of the file
+        :type uri: str
+        :param file: The file where to write the decompressed content
+        :type file: FileLikeObject
+        :return: A tuple containing the file and its content-type
+        :rtype: Tuple[FileLikeObject, str]
+        """
+        codecs = self._get_decoding_codecs(uri)
+        if codecs is None:
+            return self.client.download_to_file(uri, file)
+        writer = DecompressingWriter(file, codecs)
+        result = self.client.download_to_file(uri, writer)
+        writer.finish()
+        return DownloadResult(file, result[1], getattr(result, "checksum", None))
+
+    def download_file_as_bytes(self, uri: str) -> Tuple[bytes, str]:
+        """Download file as bytes from the given URI, decompressing it.
+
+        :param uri: The full URI of the file
+        :type uri: str
+        :return: The file as bytes and its content-type
+        :rtype: Tuple[bytes, str]
+        """
+        codecs = self._get_decoding_codecs(uri)
+        result = self.client.download_file_as_bytes(uri)
+        if codecs is None:
+            return result
+        return DownloadResult(decompress(result[0], codecs), result[1], getattr(result, "checksum", None))
+
+    def upload_file(self, uri: str, file: FileLikeObject, content_type: str, content_encoding: str = None):
+        """Upload a file to the given uri, compressing it if its content-type is compressed.
+
+        :param uri: The full URI of the file
+        :type uri: str
+        :param file: The file object to read from, or the path of a file if the wrapped client accepts paths
+        :type file: FileLikeObject
+        :param content_type: The content-type stored with the blob
+        :type content_type: str
+        :param content_encoding: The content-encoding of already encoded files, they are
+            uploaded as they are, defaults to None
+        :type content_encoding: str, optional
+        :return: The value returned by the wrapped client
+        """
+        codec = None if content_encoding else self.get_codec_for_content_type(content_type)
+        if codec is None:
+            if content_encoding:
+                return self.client.upload_file(uri, file, content_type, content_encoding=content_encoding)
+            return self.client.upload_file(uri, file, content_type)
+        logger.debug(f"Uploading {uri} with {codec.encoding} content-encoding.")
+        if isinstance(file, (str, os.PathLike)):
+            with open(file, "rb") as source:
+                return self.client.upload_file(uri, CompressingReader(source, codec), content_type,
+                                               content_encoding=codec.encoding)
+        return self.client.upload_file(uri, CompressingReader(file, codec), content_type,
+                                       content_encoding=codec.encoding)
+
+    def does_file_exist(self, uri: str) -> bool:
+        """Verify if a file exists in the given URI with the wrapped client.
+
+        :param uri: The full URI of the file
+        :type uri: str
+        :return: A boolean indicating if the file exists
+        :rtype: bool
+        """
+        return self.client.does_file_exist(uri)
+
+    def get_metadata(self, uri: str) -> BlobMetadata:
+        """Get the metadata of the stored file at the given URI with the wrapped client.
+
+        :param uri: The full URI of the file
+        :type uri: str
+        :return: The metadata of the file, its size is the stored one
+        :rtype: BlobMetadata
+        """
+        return self.client.get_metadata(uri)
+
+    def download_range(self, uri: str, start: int, end: int) -> bytes:
+        """Download the stored bytes from start to end, both inclusive, with the wrapped client.
+
+        :param uri: The full URI of the file
+        :type uri: str
+        :param start: Offset of the first byte
+        :type start: int
+        :param end: Offset of the last byte
+        :type end: int
+        :return: The bytes of the range
+        :rtype: bytes
+        """
+        return self.client.download_range(uri, start, end)
+
+    def exists_many(self, uris, *args, **kwargs):
+        """Verify concurrently if files exist with the wrapped client, see BlobStorageClient.exists_many."""
+        return self.client.exists_many(uris, *args, **kwargs)
+
+    def list(self, prefix: str, *args, **kwargs) -> Iterator[BlobListing]:
+        """List the stored blobs under a prefix with the wrapped client, see BlobStorageClient.list."""
+        return self.client.list(prefix, *args, **kwargs)
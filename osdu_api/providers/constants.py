@@ -20,3 +20,4 @@ GOOGLE_CLOUD_PROVIDER = "gcp"
 AZURE_CLOUD_PROVIDER = "azure"
 IBM_CLOUD_PROVIDER = "ibm"
 AWS_CLOUD_PROVIDER = "aws"
+FILE_PROVIDER = "file"
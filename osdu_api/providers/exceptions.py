@@ -29,3 +29,18 @@ class SAFilePathError(Exception):
 class GCSObjectURIError(Exception):
     """Raise when wrong Google Storage Object URI was given."""
     pass
+
+
+class FileObjectURIError(Exception):
+    """Raise when wrong local file URI was given."""
+    pass
+
+
+class AzureBlobURIError(Exception):
+    """Raise when wrong Azure Blob Storage URI was given."""
+    pass
+
+
+class ChecksumMismatchError(Exception):
+    """Raise when the checksum of transferred bytes differs from the stored one."""
+    pass
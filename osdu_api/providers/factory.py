@@ -15,17 +15,32 @@
 
 """Providers factory module."""
 
-from typing import Any, Callable
+import logging
+import os
+import threading
+from typing import Any, Callable, Hashable, Optional
 
 from osdu_api.providers.types import BaseCredentials, BlobStorageClient
 
+logger = logging.getLogger(__name__)
+
 
 class ProvidersFactory:
-    """The factory class for creating cloud specific clients."""
+    """The factory class for creating cloud specific clients.
+
+    Instances are cached per provider and constructor arguments, so clients
+    and credentials keep their connection pools and tokens between calls.
+    The cache is dropped in a forked child process, whose inherited
+    connections must not be reused.
+    """
 
     blob_storage_registry = {}
     credentials_registry = {}
 
+    _instances = {}
+    _instances_lock = threading.Lock()
+    _instances_pid = os.getpid()
+
     @classmethod
     def register(cls, cloud_provider: str) -> Callable:
         """Class method to register BlogStorage class to the internal registry.
@@ -49,11 +64,82 @@ class ProvidersFactory:
         return inner_wrapper
 
     @classmethod
-    def get_blob_storage_client(cls, cloud_provider: str, *args, **kwargs) -> BlobStorageClient:
+    def _reset_instances(cls):
+        """Forget all cached instances, e.g. in a forked child process."""
+        cls._instances = {}
+        cls._instances_lock = threading.Lock()
+        cls._instances_pid = os.getpid()
+
+    @classmethod
+    def _get_instance(cls, cloud_provider: str, registered_class: type, args: tuple, kwargs: dict,
+                      use_cache: bool) -> Any:
+        """Get the cached instance of registered_class for the given arguments, creating it on first use.
+
+        :param cloud_provider: The name of the cloud provider
+        :type cloud_provider: str
+        :param registered_class: The class to instantiate
+        :type registered_class: type
+        :param args: Positional arguments of the constructor
+        :type args: tuple
+        :param kwargs: Keyword arguments of the constructor
+        :type kwargs: dict
+        :param use_cache: Whether to use the cache at all
+        :type use_cache: bool
+        :return: An instance of registered_class
+        :rtype: Any
+        """
+        key = cls._get_cache_key(cloud_provider, registered_class, args, kwargs) if use_cache else None
+        if key is None:
+            return registered_class(*args, **kwargs)
+
+        if cls._instances_pid != os.getpid():
+            cls._reset_instances()
+        instance = cls._instances.get(key)
+        if instance is None:
+            with cls._instances_lock:
+                instance = cls._instances.get(key)
+                if instance is None:
+                    instance = registered_class(*args, **kwargs)
+                    cls._instances[key] = instance
+        return instance
+
+    @staticmethod
+    def _get_cache_key(cloud_provider: str, registered_class: type, args: tuple,
+                       kwargs: dict) -> Optional[Hashable]:
+        """Build the cache key of an instance, None if the arguments are not hashable."""
+        key = (cloud_provider, registered_class, args, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            logger.debug(f"Not caching {registered_class.__name__}, its arguments are not hashable.")
+            return None
+        return key
+
+    @classmethod
+    def invalidate(cls, cloud_provider: str = None):
+        """Forget cached instances, the next call creates new ones.
+
+        :param cloud_provider: The name of the cloud provider whose instances
+            are forgotten, defaults to None for all providers
+        :type cloud_provider: str, optional
+        """
+        with cls._instances_lock:
+            if cloud_provider is None:
+                cls._instances.clear()
+            else:
+                for key in [key for key in cls._instances if key[0] == cloud_provider]:
+                    del cls._instances[key]
+
+    @classmethod
+    def get_blob_storage_client(cls, cloud_provider: str, *args, use_cache: bool = True,
+                                **kwargs) -> BlobStorageClient:
         """Get BlobStorageClient instance given a cloud provider.
 
         :param cloud_provider: The name of the cloud provider
         :type cloud_provider: str
+        :param use_cache: Reuse the instance created before with the same
+            arguments, defaults to True
+        :type use_cache: bool, optional
         :raises NotImplementedError: When a class for this provided hasn't
             been registered yet
         :return: A cloud specific instance of BlobStorageClient
@@ -64,14 +150,17 @@ class ProvidersFactory:
                 f"BlobStorageClient for {cloud_provider} does not exist in the registry.")
 
         registered_class = cls.blob_storage_registry[cloud_provider]
-        return registered_class(*args, **kwargs)
+        return cls._get_instance(cloud_provider, registered_class, args, kwargs, use_cache)
 
     @classmethod
-    def get_credentials(cls, cloud_provider: str, *args, **kwargs) -> BaseCredentials:
+    def get_credentials(cls, cloud_provider: str, *args, use_cache: bool = True, **kwargs) -> BaseCredentials:
         """Get credentials instance given a cloud provider.
 
         :param cloud_provider: The name of the cloud provider
         :type cloud_provider: str
+        :param use_cache: Reuse the instance created before with the same
+            arguments, defaults to True
+        :type use_cache: bool, optional
         :raises NotImplementedError: When a class for this provided hasn't
             been registered yet
         :return: A cloud especific instance of Credentials
@@ -82,4 +171,9 @@ class ProvidersFactory:
                 f"Credential for {cloud_provider} does not exist in the registry.")
 
         registered_class = cls.credentials_registry[cloud_provider]
-        return registered_class(*args, **kwargs)
+        return cls._get_instance(cloud_provider, registered_class, args, kwargs, use_cache)
+
+
+if hasattr(os, "register_at_fork"):
+    # the pid check covers platforms without register_at_fork
+    os.register_at_fork(after_in_child=ProvidersFactory._reset_instances)
@@ -0,0 +1,271 @@
+#  Copyright 2021 Google LLC
+#  Copyright 2021 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+"""Blob storage client module for the local filesystem."""
+
+import io
+import logging
+import mimetypes
+import os
+import shutil
+import uuid
+from typing import Iterator, Optional, Tuple, Union
+from urllib.parse import quote, urlparse
+from urllib.request import url2pathname
+
+from osdu_api.providers.blob_reader import DEFAULT_BLOCK_SIZE, DEFAULT_READ_AHEAD, check_range
+from osdu_api.providers.constants import FILE_PROVIDER
+from osdu_api.providers.exceptions import FileObjectURIError
+from osdu_api.providers.factory import ProvidersFactory
+from osdu_api.providers.types import BlobMetadata, BlobStorageClient, FileLikeObject
+
+logger = logging.getLogger(__name__)
+
+COPY_BUFFER_SIZE = 1024 * 1024
+# extended attributes holding the content-type and content-encoding given on upload
+CONTENT_TYPE_XATTR = "user.content_type"
+CONTENT_ENCODING_XATTR = "user.content_encoding"
+
+
+@ProvidersFactory.register(FILE_PROVIDER)
+class FileBlobStorageClient(BlobStorageClient):
+    """Implementation of blob storage client for file:// URIs of the local filesystem.
+
+    Uploads are written to a temporary file next to the target, which then atomically
+    replaces it, so readers never see partial files. Ranged reads only read the
+    requested bytes. The content-type given on upload is kept in an extended attribute
+    where the filesystem supports it, otherwise it is guessed from the file extension.
+    """
+
+    @staticmethod
+    def _get_path(uri: str) -> str:
+        """Get the local path of a file:// URI.
+
+        :param uri: A file URI, e.g. file:///data/file.las
+        :type uri: str
+        :raises FileObjectURIError: When a non file URI is provided
+        :return: The local path
+        :rtype: str
+        """
+        parsed_path = urlparse(uri)
+        if parsed_path.scheme == "file" and parsed_path.netloc in ("", "localhost") and parsed_path.path:
+            return url2pathname(parsed_path.path)
+
+        raise FileObjectURIError(f"Wrong format path to local file. File path is '{uri}'")
+
+    @staticmethod
+    def _get_content_type(path: str) -> str:
+        """Get the content-type stored with a file, or guessed from its extension.
+
+        :param path: The path of the file
+        :type path: str
+        :return: The content-type, empty if unknown
+        :rtype: str
+        """
+        try:
+            return os.getxattr(path, CONTENT_TYPE_XATTR).decode()
+        except (AttributeError, OSError):
+            return mimetypes.guess_type(path)[0] or ""
+
+    @staticmethod
+    def _get_content_encoding(path: str) -> Optional[str]:
+        """Get the content-encoding stored with a file.
+
+        :param path: The path of the file
+        :type path: str
+        :return: The content-encoding, None if unknown
+        :rtype: Optional[str]
+        """
+        try:
+            return os.getxattr(path, CONTENT_ENCODING_XATTR).decode()
+        except (AttributeError, OSError):
+            return None
+
+    @staticmethod
+    def _set_attribute(path: str, name: str, value: str):
+        """Store an extended attribute with a file if the filesystem supports it.
+
+        :param path: The path of the file
+        :type path: str
+        :param name: The name of the attribute, e.g. CONTENT_TYPE_XATTR
+        :type name: str
+        :param value: The value
+        :type value: str
+        """
+        try:
+            os.setxattr(path, name, value.encode())
+        except (AttributeError, OSError):
+            logger.debug(f"{name} of {path} not stored, extended attributes are not supported.")
+
+    def does_file_exist(self, uri: str) -> bool:
+        """Verify if a file exists in the given URI.
+
+        :param uri: The file URI of the file.
+        :type uri: str
+        :return: A boolean indicating if the file exists
+        :rtype: bool
+        """
+        return os.path.isfile(self._get_path(uri))
+
+    def download_to_file(self, uri: str, file: FileLikeObject) -> Tuple[FileLikeObject, str]:
+        """Download file from the given URI.
+
+        :param uri: The file URI of the file.
+        :type uri: str
+        :param file: The file where to write the content
+        :type file: FileLikeObject
+        :return: A tuple containing the file and its content-type
+        :rtype: Tuple[FileLikeObject, str]
+        """
+        path = self._get_path(uri)
+        with open(path, "rb") as source:
+            shutil.copyfileobj(source, file, COPY_BUFFER_SIZE)
+        return file, self._get_content_type(path)
+
+    def download_file_as_bytes(self, uri: str) -> Tuple[bytes, str]:
+        """Download file as bytes from the given URI.
+
+        :param uri: The file URI of the file
+        :type uri: str
+        :return: The file as bytes and its content-type
+        :rtype: Tuple[bytes, str]
+        """
+        path = self._get_path(uri)
+        return self._read(path, 0, None), self._get_content_type(path)
+
+    @staticmethod
+    def _read(path: str, start: int, end: Union[int, None]) -> bytes:
+        """Read bytes of a file.
+
+        :param path: The path of the file
+        :type path: str
+        :param start: Offset of the first byte
+        :type start: int
+        :param end: Offset of the last byte, None for the end of the file
+        :type end: Union[int, None]
+        :return: The bytes read
+        :rtype: bytes
+        """
+        with open(path, "rb") as file:
+            file.seek(start)
+            return file.read(-1 if end is None else end - start + 1)
+
+    def get_metadata(self, uri: str) -> BlobMetadata:
+        """Get size, content-type and version of the file at the given URI.
+
+        The etag and generation change whenever the file is replaced or modified.
+
+        :param uri: The file URI of the file
+        :type uri: str
+        :return: The metadata of the file
+        :rtype: BlobMetadata
+        """
+        path = self._get_path(uri)
+        stat = os.stat(path)
+        return BlobMetadata(size=stat.st_size, content_type=self._get_content_type(path),
+                            etag=f"{stat.st_ino:x}-{stat.st_mtime_ns:x}-{stat.st_size:x}",
+                            generation=str(stat.st_mtime_ns),
+                            content_encoding=self._get_content_encoding(path))
+
+    def download_range(self, uri: str, start: int, end: int) -> bytes:
+        """Download the bytes from start to end, both inclusive, of the file at the given URI.
+
+        :param uri: The file URI of the file
+        :type uri: str
+        :param start: Offset of the first byte
+        :type start: int
+        :param end: Offset of the last byte
+        :type end: int
+        :return: The bytes of the range
+        :rtype: bytes
+        """
+        check_range(start, end)
+        return self._read(self._get_path(uri), start, end)
+
+    def open_read(self, uri: str, block_size: int = DEFAULT_BLOCK_SIZE,
+                  read_ahead: int = DEFAULT_READ_AHEAD) -> io.BufferedReader:
+        """Open the file at the given URI for reading, read ahead is left to the operating system.
+
+        :param uri: The file URI of the file
+        :type uri: str
+        :param block_size: The buffer size, defaults to 1 MB
+        :type block_size: int, optional
+        :param read_ahead: Unused
+        :type read_ahead: int, optional
+        :return: The opened file
+        :rtype: io.BufferedReader
+        """
+        return open(self._get_path(uri), "rb", buffering=block_size)
+
+    def upload_file(self, uri: str, blob_file: FileLikeObject, content_type: str, content_encoding: str = None):
+        """Upload a file to the given uri, replacing an existing file atomically.
+
+        :param uri: The file URI of the file
+        :type uri: str
+        :param blob: The file
+        :type blob: FileLikeObject
+        :param content_type: The content-type of the file
+        :type content_type: str
+        :param content_encoding: The content-encoding stored with the file, e.g. gzip, defaults to None
+        :type content_encoding: str, optional
+        """
+        path = self._get_path(uri)
+        directory, name = os.path.split(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = os.path.join(directory, f".{name}.{uuid.uuid4().hex}.tmp")
+        # created like open() would, honouring the umask
+        descriptor = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        try:
+            with os.fdopen(descriptor, "wb") as temp_file:
+                shutil.copyfileobj(blob_file, temp_file, COPY_BUFFER_SIZE)
+                temp_file.flush()
+                os.fsync(temp_file.fileno())
+            if content_type:
+                self._set_attribute(temp_path, CONTENT_TYPE_XATTR, content_type)
+            if content_encoding:
+                self._set_attribute(temp_path, CONTENT_ENCODING_XATTR, content_encoding)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        logger.debug(f"Uploaded file to {uri}.")
+
+    def _list_uris(self, directory: str) -> Iterator[str]:
+        """List the URIs of the files directly in a directory.
+
+        :param directory: The file URI of the directory, ending with a slash
+        :type directory: str
+        :return: The URIs of the files
+        :rtype: Iterator[str]
+        """
+        try:
+            entries = list(os.scandir(self._get_path(directory)))
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            if entry.is_file():
+                yield f"{directory.rstrip('/')}/{quote(entry.name)}"
+
+    def _get_uri_key(self, uri: str) -> str:
+        """Get the local path of a URI, the same for its quoted and unquoted forms.
+
+        :param uri: The file URI
+        :type uri: str
+        :return: The local path
+        :rtype: str
+        """
+        return self._get_path(uri)
@@ -16,17 +16,27 @@
 
 import io
 import logging
-from typing import Tuple
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional, Tuple
 from urllib.parse import urlparse
 
 import google.auth
 import tenacity
 from google.cloud import storage
+from google.cloud.storage.retry import DEFAULT_RETRY
 
+from osdu_api.providers.blob_reader import check_range
+from osdu_api.providers.checksum import (CRC32C, Checksum, HashingReader, HashingWriter, compute_checksum,
+                                         decode_base64_checksum, is_verification_enabled, new_hasher,
+                                         verify_checksum)
 from osdu_api.providers.constants import GOOGLE_CLOUD_PROVIDER
 from osdu_api.providers.exceptions import GCSObjectURIError
 from osdu_api.providers.factory import ProvidersFactory
-from osdu_api.providers.types import BlobStorageClient, FileLikeObject
+from osdu_api.providers.types import (BlobListing, BlobMetadata, BlobStorageClient, DownloadResult,
+                                      FileLikeObject)
 
 logger = logging.getLogger(__name__)
 
@@ -36,14 +46,93 @@ RETRY_SETTINGS = {
     "reraise": True,
 }
 
+MB = 1024 * 1024
+# files of at least this size are uploaded in resumable chunks
+DEFAULT_RESUMABLE_THRESHOLD = 32 * MB
+DEFAULT_RESUMABLE_CHUNK_SIZE = 32 * MB
+# files of at least this size are uploaded as parallel composite upload
+DEFAULT_COMPOSITE_THRESHOLD = 256 * MB
+DEFAULT_COMPOSITE_CHUNK_SIZE = 64 * MB
+DEFAULT_MAX_WORKERS = 8
+# maximum number of source objects of a single compose request
+MAX_COMPOSE_SOURCES = 32
+
+
+class _OffsetReader(io.RawIOBase):
+    """View of a seekable file starting at its current position, positions are relative to it."""
+
+    def __init__(self, file: FileLikeObject):
+        super().__init__()
+        self._file = file
+        self._start = file.tell()
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._file.tell() - self._start
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            return self._file.seek(self._start + offset) - self._start
+        return self._file.seek(offset, whence) - self._start
+
+    def read(self, size: int = -1) -> bytes:
+        return self._file.read(size)
+
+    def readinto(self, buffer) -> int:
+        data = self._file.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
 
 @ProvidersFactory.register(GOOGLE_CLOUD_PROVIDER)
 class GoogleCloudStorageClient(BlobStorageClient):
-    """Implementation of blob storage client for the Google provider."""
+    """Implementation of blob storage client for the Google provider.
+
+    With verify_checksums, the CRC32C of the transferred bytes is computed while they
+    stream, instead of the MD5 computed by the client library, compared to the one of
+    the stored object and returned as checksum.
+    """
+
+    def __init__(self,
+                 resumable_threshold: int = DEFAULT_RESUMABLE_THRESHOLD,
+                 resumable_chunk_size: int = DEFAULT_RESUMABLE_CHUNK_SIZE,
+                 composite_threshold: Optional[int] = DEFAULT_COMPOSITE_THRESHOLD,
+                 composite_chunk_size: int = DEFAULT_COMPOSITE_CHUNK_SIZE,
+                 max_workers: int = DEFAULT_MAX_WORKERS,
+                 verify_checksums: bool = None):
+        """Initialize storage client.
 
-    def __init__(self):
-        """Initialize storage client."""
+        :param resumable_threshold: Size from which seekable files are uploaded in
+            resumable chunks, the client library still sends up to 8 MB in a single
+            request, defaults to 32 MB
+        :type resumable_threshold: int, optional
+        :param resumable_chunk_size: Size of a resumable chunk, a multiple of 256 KB,
+            defaults to 32 MB
+        :type resumable_chunk_size: int, optional
+        :param composite_threshold: Size from which seekable files are uploaded as
+            parallel composite upload, None disables it, defaults to 256 MB
+        :type composite_threshold: Optional[int], optional
+        :param composite_chunk_size: Size of a composite part, defaults to 64 MB
+        :type composite_chunk_size: int, optional
+        :param max_workers: Number of parts uploaded concurrently, every worker holds
+            one part in memory, defaults to 8
+        :type max_workers: int, optional
+        :param verify_checksums: Verify transfers against the CRC32C of the objects,
+            defaults to the BLOB_STORAGE_VERIFY_CHECKSUMS env var
+        :type verify_checksums: bool, optional
+        """
         self._storage_client = storage.Client()
+        self.resumable_threshold = resumable_threshold
+        self.resumable_chunk_size = resumable_chunk_size
+        self.composite_threshold = composite_threshold
+        self.composite_chunk_size = composite_chunk_size
+        self.max_workers = max_workers
+        self.verify_checksums = is_verification_enabled(verify_checksums)
 
     @staticmethod
     def _parse_gcs_uri(gcs_uri: str) -> Tuple[str, str]:
@@ -65,6 +154,14 @@ class GoogleCloudStorageClient(BlobStorageClient):
 
         raise GCSObjectURIError(f"Wrong format path to GCS object. Object path is '{gcs_uri}'")
 
+    @staticmethod
+    def _get_stored_crc32c(blob: storage.Blob) -> Optional[Checksum]:
+        """Get the CRC32C of a blob, None if the downloaded bytes differ from the stored ones."""
+        if blob.content_encoding == "gzip":
+            # served decompressed by decompressive transcoding
+            return None
+        return decode_base64_checksum(CRC32C, blob.crc32c)
+
     @tenacity.retry(**RETRY_SETTINGS)
     def _get_file_from_bucket(self,
                              bucket_name: str,
@@ -84,10 +181,18 @@ class GoogleCloudStorageClient(BlobStorageClient):
         bucket = self._storage_client.bucket(bucket_name)
         blob = bucket.get_blob(source_blob_name)
 
-        blob.download_to_file(file)
+        checksum = None
+        if self.verify_checksums:
+            # the blob carries its generation, so the downloaded bytes are the ones of its CRC32C
+            writer = HashingWriter(file, new_hasher(CRC32C))
+            blob.download_to_file(writer, checksum=None)
+            checksum = Checksum(CRC32C, writer.hasher.hexdigest())
+            verify_checksum(f"gs://{bucket_name}/{source_blob_name}", self._get_stored_crc32c(blob), checksum)
+        else:
+            blob.download_to_file(file)
         logger.debug(f"File {source_blob_name} got from bucket {bucket_name}.")
 
-        return file, blob.content_type
+        return DownloadResult(file, blob.content_type, checksum)
 
     @tenacity.retry(**RETRY_SETTINGS)
     def _get_file_as_bytes_from_bucket(self,
@@ -105,10 +210,35 @@ class GoogleCloudStorageClient(BlobStorageClient):
         bucket = self._storage_client.bucket(bucket_name)
         blob = bucket.get_blob(source_blob_name)
 
-        file_as_bytes = blob.download_as_bytes()
+        checksum = None
+        if self.verify_checksums:
+            file_as_bytes = blob.download_as_bytes(checksum=None)
+            checksum = compute_checksum(CRC32C, file_as_bytes)
+            verify_checksum(f"gs://{bucket_name}/{source_blob_name}", self._get_stored_crc32c(blob), checksum)
+        else:
+            file_as_bytes = blob.download_as_bytes()
         logger.debug(f"File {source_blob_name} got from bucket {bucket_name}.")
 
-        return file_as_bytes, blob.content_type
+        return DownloadResult(file_as_bytes, blob.content_type, checksum)
+
+    @tenacity.retry(**RETRY_SETTINGS)
+    def _get_range_from_bucket(self, bucket_name: str, source_blob_name: str, start: int, end: int) -> bytes:
+        """Get a byte range of a file from gcs bucket.
+
+        :param bucket_name: The name of the bucket that holds the file
+        :type bucket_name: str
+        :param source_blob_name: The name of the file
+        :type source_blob_name: str
+        :param start: Offset of the first byte
+        :type start: int
+        :param end: Offset of the last byte
+        :type end: int
+        :return: The bytes of the range
+        :rtype: bytes
+        """
+        bucket = self._storage_client.bucket(bucket_name)
+        blob = bucket.blob(source_blob_name)
+        return blob.download_as_bytes(start=start, end=end)
 
     @tenacity.retry(**RETRY_SETTINGS)
     def _does_file_exist_in_bucket(self, bucket_name: str, source_blob_name: str) -> bool:
@@ -164,18 +294,298 @@ class GoogleCloudStorageClient(BlobStorageClient):
         bucket_name, blob_name = self._parse_gcs_uri(uri)
         return self._get_file_as_bytes_from_bucket(bucket_name, blob_name)
 
-    def upload_file(self, uri: str, blob_file: FileLikeObject, content_type: str):
+    @staticmethod
+    def _get_remaining_size(file: FileLikeObject) -> Optional[int]:
+        """Get the number of bytes from the current position to the end of a seekable file.
+
+        :param file: The file
+        :type file: FileLikeObject
+        :return: The size, None if the file is not seekable
+        :rtype: Optional[int]
+        """
+        try:
+            if not file.seekable():
+                return None
+            position = file.tell()
+            size = file.seek(0, os.SEEK_END) - position
+            file.seek(position)
+            return size
+        except (AttributeError, OSError, ValueError):
+            return None
+
+    def _upload_file_to_bucket(self, bucket_name: str, blob_name: str, file: FileLikeObject,
+                               content_type: str, content_encoding: str = None) -> storage.Blob:
+        """Upload a file in a single request, retrying from the same position when it is seekable.
+
+        :param bucket_name: The name of the bucket
+        :type bucket_name: str
+        :param blob_name: The name of the blob
+        :type blob_name: str
+        :param file: The file
+        :type file: FileLikeObject
+        :param content_type: The content-type of the file
+        :type content_type: str
+        :param content_encoding: The content-encoding of the file, e.g. gzip, defaults to None
+        :type content_encoding: str, optional
+        :return: The uploaded blob
+        :rtype: storage.Blob
+        """
+        bucket = self._storage_client.bucket(bucket_name)
+        blob = bucket.blob(blob_name)
+        if content_encoding:
+            blob.content_encoding = content_encoding
+        if self._get_remaining_size(file) is None:
+            # a consumed stream cannot be sent again
+            blob.upload_from_file(file, content_type=content_type)
+            return blob
+
+        position = file.tell()
+
+        @tenacity.retry(**RETRY_SETTINGS)
+        def upload():
+            file.seek(position)
+            blob.upload_from_file(file, content_type=content_type)
+
+        upload()
+        return blob
+
+    def _upload_resumable(self, bucket_name: str, blob_name: str, file: FileLikeObject,
+                          content_type: str, size: int, content_encoding: str = None) -> storage.Blob:
+        """Upload a seekable file in resumable chunks.
+
+        Failed chunk requests are retried, the upload continues from the bytes the
+        service persisted instead of restarting.
+
+        :param bucket_name: The name of the bucket
+        :type bucket_name: str
+        :param blob_name: The name of the blob
+        :type blob_name: str
+        :param file: The file, read from its current position
+        :type file: FileLikeObject
+        :param content_type: The content-type of the file
+        :type content_type: str
+        :param size: The number of bytes to upload
+        :type size: int
+        :param content_encoding: The content-encoding of the file, e.g. gzip, defaults to None
+        :type content_encoding: str, optional
+        :return: The uploaded blob
+        :rtype: storage.Blob
+        """
+        bucket = self._storage_client.bucket(bucket_name)
+        blob = bucket.blob(blob_name, chunk_size=self.resumable_chunk_size)
+        if content_encoding:
+            blob.content_encoding = content_encoding
+        # resumable uploads must start at position 0 of the stream
+        blob.upload_from_file(_OffsetReader(file), size=size, content_type=content_type, retry=DEFAULT_RETRY)
+        return blob
+
+    @tenacity.retry(**RETRY_SETTINGS)
+    def _upload_part(self, bucket: storage.Bucket, part_name: str, data: bytes):
+        """Upload a part of a composite upload.
+
+        :param bucket: The bucket
+        :type bucket: storage.Bucket
+        :param part_name: The name of the temporary part blob
+        :type part_name: str
+        :param data: The content of the part
+        :type data: bytes
+        """
+        part = bucket.blob(part_name)
+        part.upload_from_string(data, content_type="application/octet-stream")
+        if self.verify_checksums:
+            verify_checksum(f"gs://{bucket.name}/{part_name}", decode_base64_checksum(CRC32C, part.crc32c),
+                            compute_checksum(CRC32C, data))
+
+    def _upload_composite(self, bucket_name: str, blob_name: str, file: FileLikeObject,
+                          content_type: str, size: int, content_encoding: str = None) -> storage.Blob:
+        """Upload a seekable file as parallel composite upload.
+
+        The file is split into parts of composite_chunk_size bytes, which are uploaded
+        concurrently as temporary blobs and composed into the target blob, at most 32
+        sources per compose request. The temporary blobs are always deleted.
+        Composite objects have a CRC32C but no MD5 checksum, it is verified through the
+        CRC32C of the parts.
+
+        :param bucket_name: The name of the bucket
+        :type bucket_name: str
+        :param blob_name: The name of the blob
+        :type blob_name: str
+        :param file: The file, read from its current position
+        :type file: FileLikeObject
+        :param content_type: The content-type of the file
+        :type content_type: str
+        :param size: The number of bytes to upload
+        :type size: int
+        :param content_encoding: The content-encoding of the file, e.g. gzip, defaults to None
+        :type content_encoding: str, optional
+        :return: The composed blob
+        :rtype: storage.Blob
+        """
+        bucket = self._storage_client.bucket(bucket_name)
+        start = file.tell()
+        part_count = -(-size // self.composite_chunk_size)
+        part_prefix = f"{blob_name}.composite-{uuid.uuid4().hex}"
+        part_names = [f"{part_prefix}/{index:05d}" for index in range(part_count)]
+        file_lock = threading.Lock()
+
+        def upload_part(index: int):
+            with file_lock:
+                file.seek(start + index * self.composite_chunk_size)
+                data = file.read(self.composite_chunk_size)
+            self._upload_part(bucket, part_names[index], data)
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                # list() raises the first error of a part
+                list(executor.map(upload_part, range(part_count)))
+            blob = self._compose(bucket, blob_name, part_names, content_type, content_encoding)
+        finally:
+            bucket.delete_blobs([bucket.blob(name) for name in part_names], on_error=lambda blob: None)
+            file.seek(start + size)
+        logger.debug(f"Composed {blob_name} of {part_count} parts.")
+        return blob
+
+    @staticmethod
+    def _compose(bucket: storage.Bucket, blob_name: str, part_names: List[str], content_type: str,
+                 content_encoding: str = None) -> storage.Blob:
+        """Compose parts into a blob, appending up to 31 parts to the blob at a time.
+
+        :param bucket: The bucket
+        :type bucket: storage.Bucket
+        :param blob_name: The name of the target blob
+        :type blob_name: str
+        :param part_names: The names of the parts in order
+        :type part_names: List[str]
+        :param content_type: The content-type of the blob
+        :type content_type: str
+        :param content_encoding: The content-encoding of the blob, e.g. gzip, defaults to None
+        :type content_encoding: str, optional
+        :return: The composed blob
+        :rtype: storage.Blob
+        """
+        blob = bucket.blob(blob_name)
+        blob.content_type = content_type
+        if content_encoding:
+            blob.content_encoding = content_encoding
+        sources = [bucket.blob(name) for name in part_names[:MAX_COMPOSE_SOURCES]]
+        blob.compose(sources)
+        for index in range(MAX_COMPOSE_SOURCES, len(part_names), MAX_COMPOSE_SOURCES - 1):
+            sources = [bucket.blob(name) for name in part_names[index:index + MAX_COMPOSE_SOURCES - 1]]
+            blob.compose([blob] + sources)
+        return blob
+
+    def get_metadata(self, uri: str) -> BlobMetadata:
+        """Get size, content-type and generation of the file at the given URI.
+
+        :param uri: The GCS URI of the file
+        :type uri: str
+        :return: The metadata of the file
+        :rtype: BlobMetadata
+        """
+        bucket_name, blob_name = self._parse_gcs_uri(uri)
+        blob = self._storage_client.bucket(bucket_name).get_blob(blob_name)
+        if blob is None:
+            raise FileNotFoundError(f"File {uri} does not exist.")
+        return BlobMetadata(size=blob.size, content_type=blob.content_type, etag=blob.etag,
+                            generation=str(blob.generation) if blob.generation is not None else None,
+                            content_encoding=blob.content_encoding)
+
+    def download_range(self, uri: str, start: int, end: int) -> bytes:
+        """Download the bytes from start to end, both inclusive, of the file at the given URI.
+
+        :param uri: The GCS URI of the file
+        :type uri: str
+        :param start: Offset of the first byte
+        :type start: int
+        :param end: Offset of the last byte
+        :type end: int
+        :return: The bytes of the range
+        :rtype: bytes
+        """
+        check_range(start, end)
+        bucket_name, blob_name = self._parse_gcs_uri(uri)
+        return self._get_range_from_bucket(bucket_name, blob_name, start, end)
+
+    def _list_pages(self, prefix: str, delimiter: Optional[str], page_size: int,
+                    fetch_content_type: bool) -> Iterator[List[BlobListing]]:
+        """List the blobs whose URI starts with prefix, one list per page requested.
+
+        :param prefix: The GCS URI prefix, e.g. gs://bucket/dir/
+        :type prefix: str
+        :param delimiter: The delimiter of directories
+        :type delimiter: Optional[str]
+        :param page_size: The number of blobs requested per page
+        :type page_size: int
+        :param fetch_content_type: Ignored, the listing returns the content-type
+        :type fetch_content_type: bool
+        :raises GCSObjectURIError: When prefix is not a GCS URI
+        :return: The pages
+        :rtype: Iterator[List[BlobListing]]
+        """
+        parsed_path = urlparse(prefix)
+        if parsed_path.scheme != "gs" or not parsed_path.netloc:
+            raise GCSObjectURIError(f"Wrong format path to GCS prefix. Prefix is '{prefix}'")
+        bucket_name, name_prefix = parsed_path.netloc, parsed_path.path[1:]
+        blobs = self._storage_client.list_blobs(
+            bucket_name, prefix=name_prefix, delimiter=delimiter, page_size=page_size,
+            fields="items(name,size,contentType,etag),prefixes,nextPageToken"
+        )
+        for page in blobs.pages:
+            items = [
+                BlobListing(f"gs://{bucket_name}/{blob.name}", blob.name, size=blob.size,
+                            content_type=blob.content_type, etag=blob.etag)
+                for blob in page
+            ]
+            items.extend(
+                BlobListing(f"gs://{bucket_name}/{directory}", directory, is_prefix=True)
+                for directory in sorted(getattr(page, "prefixes", ()))
+            )
+            yield items
+
+    def upload_file(self, uri: str, blob_file: FileLikeObject, content_type: str,
+                    content_encoding: str = None) -> Optional[Checksum]:
         """Upload a file to the given uri.
 
+        Seekable files of at least composite_threshold bytes are uploaded as parallel
+        composite upload, of at least resumable_threshold bytes in resumable chunks.
+        Other files are uploaded in a single request, retried if the file is seekable.
+
         :param uri: The GCS URI of the file
         :type uri: str
         :param blob: The file
         :type blob: FileLikeObject
-        :param content_type: [description]
+        :param content_type: The content-type of the file
         :type content_type: str
+        :param content_encoding: The content-encoding of the file, e.g. gzip, defaults to None
+        :type content_encoding: str, optional
+        :raises ChecksumMismatchError: When checksums are verified and the stored CRC32C does not match the content
+        :return: The CRC32C checksum of the content when checksums are verified
+        :rtype: Optional[Checksum]
         """
         bucket_name, blob_name = self._parse_gcs_uri(uri)
-        bucket = self._storage_client.bucket(bucket_name)
-        blob = bucket.blob(blob_name)
-        blob.upload_from_file(blob_file, content_type=content_type)
+        size = self._get_remaining_size(blob_file)
+
+        if size is not None and self.composite_threshold is not None and size >= self.composite_threshold:
+            blob = self._upload_composite(bucket_name, blob_name, blob_file, content_type, size, content_encoding)
+            # each part was verified, the CRC32C of the composite is computed from theirs
+            checksum = decode_base64_checksum(CRC32C, blob.crc32c) if self.verify_checksums else None
+        elif not self.verify_checksums:
+            if size is not None and size >= self.resumable_threshold:
+                self._upload_resumable(bucket_name, blob_name, blob_file, content_type, size, content_encoding)
+            else:
+                self._upload_file_to_bucket(bucket_name, blob_name, blob_file, content_type, content_encoding)
+            checksum = None
+        else:
+            reader = HashingReader(blob_file, new_hasher(CRC32C), seekable=size is not None)
+            if size is not None and size >= self.resumable_threshold:
+                stored_crc32c = self._upload_resumable(bucket_name, blob_name, reader, content_type, size,
+                                                       content_encoding).crc32c
+            else:
+                stored_crc32c = self._upload_file_to_bucket(bucket_name, blob_name, reader, content_type,
+                                                            content_encoding).crc32c
+            # a file read out of order, e.g. by the client library, cannot be verified
+            checksum = Checksum(CRC32C, reader.hasher.hexdigest()) if reader.valid else None
+            if checksum is not None:
+                verify_checksum(uri, decode_base64_checksum(CRC32C, stored_crc32c), checksum)
         logger.debug(f"Uploaded file to {uri}.")
+        return checksum
@@ -14,6 +14,7 @@
 #  limitations under the License.
 """GCP Credentials module."""
 
+import datetime
 import json
 import logging
 import os
@@ -24,6 +25,7 @@ from google.cloud import storage
 from google.oauth2 import service_account
 from tenacity import retry, stop_after_attempt
 
+from osdu_api.auth.token_cache import DEFAULT_REFRESH_MARGIN
 from osdu_api.providers.constants import GOOGLE_CLOUD_PROVIDER
 from osdu_api.providers.exceptions import RefreshSATokenError, SAFilePathError
 from osdu_api.providers.factory import ProvidersFactory
@@ -50,8 +52,12 @@ class GCPCredentials(BaseCredentials):
         """
         self._access_token = None
         self._access_scopes = access_scopes
-        self._storage_client = storage.Client()
+        # only needed for SA files stored in GCS
+        self._storage_client = None
         self._sa_file_path = sa_file_path
+        # parsed SA info and credentials built from it per SA file path
+        self._sa_info_by_path = {}
+        self._credentials_by_path = {}
 
     @property
     def access_scopes(self) -> list:
@@ -63,6 +69,11 @@ class GCPCredentials(BaseCredentials):
             self._access_scopes = self.DEFAULT_ACCESS_SCOPES
         return self._access_scopes
 
+    def _get_storage_client(self) -> storage.Client:
+        if self._storage_client is None:
+            self._storage_client = storage.Client()
+        return self._storage_client
+
     @retry(stop=stop_after_attempt(RETRIES))
     def _get_sa_info_from_google_storage(self, bucket_name: str, source_blob_name: str) -> dict:
         """Get sa_file content from Google Storage.
@@ -74,7 +85,7 @@ class GCPCredentials(BaseCredentials):
         :return: Service account info as dict
         :rtype: dict
         """
-        bucket = self._storage_client .bucket(bucket_name)
+        bucket = self._get_storage_client().bucket(bucket_name)
         blob = bucket.blob(source_blob_name)
         logger.info("Got SA_file.")
         sa_info = json.loads(blob.download_as_bytes())
@@ -92,16 +103,21 @@ class GCPCredentials(BaseCredentials):
         with open(path) as f:
             return json.load(f)
 
+    def _get_sa_file_path(self) -> str:
+        return self._sa_file_path or os.environ.get("SA_FILE_PATH", None)
+
     def _get_sa_info(self) -> dict:
         """Get file path from SA_FILE_PATH environmental variable.
         This path can be GCS object URI or local file path.
-        Return content of sa path as dict.
+        Return content of sa path as dict, read once per path.
 
         :raises SAFilePathError: When an error occurs with file path
         :return: Service account info
         :rtype: dict
         """
-        sa_file_path = self._sa_file_path or os.environ.get("SA_FILE_PATH", None)
+        sa_file_path = self._get_sa_file_path()
+        if sa_file_path in self._sa_info_by_path:
+            return self._sa_info_by_path[sa_file_path]
         parsed_path = urlparse(sa_file_path)
         if parsed_path.scheme == "gs":
             bucket_name = parsed_path.netloc
@@ -112,6 +128,7 @@ class GCPCredentials(BaseCredentials):
         else:
             logger.error("SA file path error.")
             raise SAFilePathError(f"Got path {os.environ.get('SA_FILE_PATH', None)}")
+        self._sa_info_by_path[sa_file_path] = sa_info
         return sa_info
 
     @retry(stop=stop_after_attempt(RETRIES))
@@ -132,15 +149,49 @@ class GCPCredentials(BaseCredentials):
             raise e
         return credentials
 
-    def _get_access_token_using_sa_file(self) -> str:
-        """Get new access token using SA info.
+    def _get_credentials(self) -> service_account.Credentials:
+        """Get the credentials of the SA file, built once per path.
 
+        :return: Google credentials object obtained from service account
+        :rtype: service_account.Credentials
+        """
+        sa_file_path = self._get_sa_file_path()
+        credentials = self._credentials_by_path.get(sa_file_path)
+        if credentials is None:
+            credentials = self._get_credentials_from_sa_info(self._get_sa_info())
+            self._credentials_by_path[sa_file_path] = credentials
+        return credentials
+
+    @staticmethod
+    def _is_token_fresh(credentials: service_account.Credentials) -> bool:
+        """Check if the token of credentials is valid for more than DEFAULT_REFRESH_MARGIN seconds.
+
+        :param credentials: Google credentials object
+        :type credentials: service_account.Credentials
+        :return: True if the token does not need to be refreshed
+        :rtype: bool
+        """
+        if not getattr(credentials, "valid", False):
+            return False
+        expiry = getattr(credentials, "expiry", None)
+        if expiry is None:
+            return True
+        # google-auth expiries are naive UTC datetimes
+        now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+        return expiry - now > datetime.timedelta(seconds=DEFAULT_REFRESH_MARGIN)
+
+    def _get_access_token_using_sa_file(self, stale_token: str = None) -> str:
+        """Get an access token using SA info, refreshed when it is about to expire or is the stale token.
+
+        :param stale_token: The token being replaced, e.g. rejected with a 401, defaults to None
+        :type stale_token: str, optional
         :raises RefreshSATokenError: When underlying client can't refresh token
         :return: Refreshed token
         :rtype: str
         """
-        sa_info = self._get_sa_info()
-        credentials = self._get_credentials_from_sa_info(sa_info)
+        credentials = self._get_credentials()
+        if self._is_token_fresh(credentials) and credentials.token != stale_token:
+            return credentials.token
 
         logger.info("Refresh token.")
         credentials.refresh(Request())
@@ -153,6 +204,11 @@ class GCPCredentials(BaseCredentials):
         logger.info("Token refreshed.")
         return token
 
+    def _get_token_store_key(self) -> tuple:
+        """Tokens are stored per service account file and scopes."""
+        sa_file_path = self._sa_file_path or os.environ.get("SA_FILE_PATH", None)
+        return super()._get_token_store_key() + (sa_file_path, tuple(self.access_scopes))
+
     @retry(stop=stop_after_attempt(RETRIES))
     def refresh_token(self) -> str:
         """Refresh token.
@@ -160,7 +216,7 @@ class GCPCredentials(BaseCredentials):
         :return: Refreshed token
         :rtype: str
         """
-        token = self._get_access_token_using_sa_file()
+        token = self._get_or_mint_token(self._get_access_token_using_sa_file)
         self._access_token = token
         return self._access_token
 
@@ -16,8 +16,11 @@
 import json
 import logging
 import os
+import time
 
 from keycloak import KeycloakOpenID
+from keycloak.exceptions import KeycloakError
+from osdu_api.auth.token_cache import DEFAULT_REFRESH_MARGIN
 from osdu_api.providers.constants import IBM_CLOUD_PROVIDER
 from osdu_api.providers.exceptions import RefreshSATokenError, SAFilePathError
 from osdu_api.providers.factory import ProvidersFactory
@@ -40,6 +43,12 @@ class IBMCredentials(BaseCredentials):
         self._password = None
         self._scope = None
         self._tenant_id = None
+        self._keycloak_openid = None
+        # tokens of the last grant and when they expire
+        self._current_access_token = None
+        self._access_token_expires_at = 0.0
+        self._refresh_token = None
+        self._refresh_token_expires_at = 0.0
 
     def _populate_ad_credentials(self) -> None:
         uri = os.getenv("KEYCLOACK_URI")
@@ -49,28 +58,56 @@ class IBMCredentials(BaseCredentials):
         self._username = os.getenv("username")
         self._password = os.getenv("password")
 
-
-
-    def _generate_token(self) -> str:
-
-        if self._client_id is None:
-            self._populate_ad_credentials()
-
-        keycloak_openid = KeycloakOpenID(server_url=os.getenv("KEYCLOACK_URI"),
-                    client_id=self._client_id,
-                    realm_name=os.getenv("REALM_NAME"),
-                    client_secret_key=self._client_secret)
-
-        token = keycloak_openid.token(self._username, self._password)
-        refresh_token = keycloak_openid.refresh_token(token['refresh_token'])
-        access_token = refresh_token['access_token']
-        return access_token
-
+    def _get_keycloak_openid(self) -> KeycloakOpenID:
+        if self._keycloak_openid is None:
+            if self._client_id is None:
+                self._populate_ad_credentials()
+            self._keycloak_openid = KeycloakOpenID(server_url=os.getenv("KEYCLOACK_URI"),
+                        client_id=self._client_id,
+                        realm_name=os.getenv("REALM_NAME"),
+                        client_secret_key=self._client_secret)
+        return self._keycloak_openid
+
+    def _set_tokens(self, token: dict):
+        """Keep the tokens of a grant response with their expiries."""
+        now = time.time()
+        self._current_access_token = token['access_token']
+        self._access_token_expires_at = now + token.get('expires_in', 0)
+        self._refresh_token = token.get('refresh_token')
+        # offline tokens do not expire
+        refresh_expires_in = token.get('refresh_expires_in', 0)
+        self._refresh_token_expires_at = now + refresh_expires_in if refresh_expires_in else float('inf')
+
+    def _generate_token(self, stale_token: str = None) -> str:
+
+        now = time.time()
+        # the stale token is being replaced, e.g. after a 401, the refresh grant gets a new one
+        if self._current_access_token is not None and self._current_access_token != stale_token \
+                and self._access_token_expires_at - DEFAULT_REFRESH_MARGIN > now:
+            return self._current_access_token
+
+        keycloak_openid = self._get_keycloak_openid()
+        if self._refresh_token is not None and self._refresh_token_expires_at - DEFAULT_REFRESH_MARGIN > now:
+            try:
+                self._set_tokens(keycloak_openid.refresh_token(self._refresh_token))
+                return self._current_access_token
+            except KeycloakError as e:
+                # e.g. the session was ended on the server
+                logger.warning(f"Refresh grant failed, falling back to password grant: {e}")
+
+        self._set_tokens(keycloak_openid.token(self._username, self._password))
+        return self._current_access_token
+
+
+    def _get_token_store_key(self) -> tuple:
+        """Tokens are stored per Keycloak realm, client and user."""
+        return super()._get_token_store_key() + (os.getenv("KEYCLOACK_URI"), os.getenv("REALM_NAME"),
+                                                 os.getenv("client_id"), os.getenv("username"))
 
     @retry(stop=stop_after_attempt(RETRIES))
     def refresh_token(self) -> str:
 
-        token = self._generate_token()
+        token = self._get_or_mint_token(self._generate_token)
         self._access_token = token
         return self._access_token
 
@@ -16,10 +16,111 @@
 
 import abc
 import io
-from typing import Tuple, TypeVar
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Hashable, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from osdu_api.providers.blob_reader import DEFAULT_BLOCK_SIZE, DEFAULT_READ_AHEAD, BlobReader
+from osdu_api.providers.checksum import Checksum
+from osdu_api.utils.prefetch import PrefetchIterator
 
 FileLikeObject = TypeVar("FileLikeObject", io.IOBase, io.RawIOBase, io.BytesIO)
 
+DEFAULT_MAX_WORKERS = 8
+# URIs of a directory from which existence is checked by listing it instead of one request per URI
+DEFAULT_LISTING_THRESHOLD = 8
+DEFAULT_LISTING_PAGE_SIZE = 1000
+
+ProgressCallback = Callable[[int, int], None]
+
+
+class BlobMetadata:
+    """Metadata of a stored blob."""
+
+    def __init__(self, size: int, content_type: Optional[str] = None, etag: Optional[str] = None,
+                 generation: Optional[str] = None, content_encoding: Optional[str] = None):
+        """
+        :param size: The size of the blob in bytes
+        :type size: int
+        :param content_type: The content-type of the blob
+        :type content_type: Optional[str]
+        :param etag: The entity tag, changes with the content
+        :type etag: Optional[str]
+        :param generation: The generation or version id of the blob, if versioned
+        :type generation: Optional[str]
+        :param content_encoding: The content-encoding of the blob, e.g. gzip
+        :type content_encoding: Optional[str]
+        """
+        self.size = size
+        self.content_type = content_type
+        self.etag = etag
+        self.generation = generation
+        self.content_encoding = content_encoding
+
+
+class BlobListing:
+    """A blob, or a "directory" when listing with a delimiter, found under a prefix."""
+
+    def __init__(self, uri: str, name: str, size: Optional[int] = None, content_type: Optional[str] = None,
+                 etag: Optional[str] = None, is_prefix: bool = False):
+        """
+        :param uri: The full URI of the blob or directory
+        :type uri: str
+        :param name: The name of the blob in its bucket, or the prefix of the directory ending with the delimiter
+        :type name: str
+        :param size: The size of the blob in bytes, None for directories
+        :type size: Optional[int]
+        :param content_type: The content-type of the blob, None if the listing does not return it
+        :type content_type: Optional[str]
+        :param etag: The entity tag of the blob
+        :type etag: Optional[str]
+        :param is_prefix: True for directories, holding all blobs whose name starts with the prefix
+        :type is_prefix: bool
+        """
+        self.uri = uri
+        self.name = name
+        self.size = size
+        self.content_type = content_type
+        self.etag = etag
+        self.is_prefix = is_prefix
+
+    def __repr__(self) -> str:
+        return f"BlobListing({self.uri!r}, size={self.size}, is_prefix={self.is_prefix})"
+
+
+class BlobOperationResult:
+    """Outcome of the operation on one URI of a batch operation."""
+
+    def __init__(self, uri: str, result: Any = None, error: Optional[Exception] = None):
+        """
+        :param uri: The URI the operation was applied to
+        :type uri: str
+        :param result: The value returned by the operation
+        :type result: Any
+        :param error: The error raised by the operation, None if it succeeded
+        :type error: Optional[Exception]
+        """
+        self.uri = uri
+        self.result = result
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class DownloadResult(tuple):
+    """The (file or bytes, content-type) tuple returned by downloads, also carrying the
+    checksum of the downloaded bytes when the client verified it."""
+
+    def __new__(cls, content: Any, content_type: Optional[str], checksum: Optional["Checksum"] = None):
+        result = super().__new__(cls, (content, content_type))
+        result.checksum = checksum
+        return result
+
+    def __getnewargs__(self):
+        # pickled with the checksum, e.g. when passed to another process
+        return self[0], self[1], self.checksum
+
 
 class BlobStorageClient(abc.ABC):
     """Base interface for storage clients."""
@@ -49,7 +150,7 @@ class BlobStorageClient(abc.ABC):
         pass
 
     @abc.abstractmethod
-    def upload_file(self, uri: str, file: FileLikeObject, content_type: str):
+    def upload_file(self, uri: str, file: FileLikeObject, content_type: str, content_encoding: str = None):
         """Upload blob to given URI.
 
         :param uri: The full target URI of the resource to upload.
@@ -58,6 +159,8 @@ class BlobStorageClient(abc.ABC):
         :type file: FileLikeObject
         :param content_type: The content-type of the file to uplaod
         :type content_type: str
+        :param content_encoding: The content-encoding stored with the blob, e.g. gzip, defaults to None
+        :type content_encoding: str, optional
         """
         pass
 
@@ -72,6 +175,256 @@ class BlobStorageClient(abc.ABC):
         """
         pass
 
+    def get_metadata(self, uri: str) -> BlobMetadata:
+        """Get size, content-type and version of the blob at the given URI.
+
+        :param uri: The full URI of the file
+        :type uri: str
+        :return: The metadata of the blob
+        :rtype: BlobMetadata
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support get_metadata.")
+
+    def download_range(self, uri: str, start: int, end: int) -> bytes:
+        """Download the bytes from start to end, both inclusive, of the blob at the given URI.
+
+        :param uri: The full URI of the file
+        :type uri: str
+        :param start: Offset of the first byte
+        :type start: int
+        :param end: Offset of the last byte, the range ends at the end of the blob if it is past it
+        :type end: int
+        :return: The bytes of the range
+        :rtype: bytes
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support download_range.")
+
+    def open_read(self, uri: str, block_size: int = DEFAULT_BLOCK_SIZE,
+                  read_ahead: int = DEFAULT_READ_AHEAD) -> io.BufferedReader:
+        """Open the blob at the given URI as buffered, seekable binary file.
+
+        Only the blocks read are downloaded, by ranged downloads of block_size bytes;
+        sequential reads fetch the next read_ahead blocks in the background. The
+        reader should be closed, e.g. by using it as context manager.
+
+        :param uri: The full URI of the file
+        :type uri: str
+        :param block_size: The size of a ranged download, defaults to 1 MB
+        :type block_size: int, optional
+        :param read_ahead: Number of blocks fetched ahead, defaults to 2
+        :type read_ahead: int, optional
+        :return: A binary file reading the blob
+        :rtype: io.BufferedReader
+        """
+        metadata = self.get_metadata(uri)
+        raw = BlobReader(lambda start, end: self.download_range(uri, start, end), metadata.size,
+                         block_size, read_ahead)
+        return io.BufferedReader(raw, buffer_size=block_size)
+
+    def _run_many(self, operation: Callable, items: List[tuple], max_workers: int,
+                  progress_callback: Optional[ProgressCallback],
+                  weights: List[int] = None) -> List[BlobOperationResult]:
+        """Apply operation to every item concurrently, the first element of an item is its URI.
+
+        :param operation: The operation, called with the elements of an item
+        :type operation: Callable
+        :param items: The arguments of each call
+        :type items: List[tuple]
+        :param max_workers: Maximum number of concurrent operations
+        :type max_workers: int
+        :param progress_callback: Called with the number of completed and all items
+            after each item, defaults to None
+        :type progress_callback: Optional[ProgressCallback]
+        :param weights: Number of items each item counts for in progress, defaults to 1 each
+        :type weights: List[int], optional
+        :return: The result of every item in the order of items
+        :rtype: List[BlobOperationResult]
+        """
+        results = [None] * len(items)
+        if not items:
+            return results
+        weights = weights or [1] * len(items)
+        total, completed = sum(weights), 0
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(operation, *item): index for index, item in enumerate(items)}
+            for future in as_completed(futures):
+                index = futures[future]
+                try:
+                    results[index] = BlobOperationResult(items[index][0], result=future.result())
+                except Exception as err:
+                    results[index] = BlobOperationResult(items[index][0], error=err)
+                completed += weights[index]
+                if progress_callback is not None:
+                    progress_callback(completed, total)
+        return results
+
+    def download_many(self, items: Iterable[Tuple[str, FileLikeObject]], max_workers: int = DEFAULT_MAX_WORKERS,
+                      progress_callback: ProgressCallback = None) -> List[BlobOperationResult]:
+        """Download files concurrently, see download_to_file.
+
+        A failed download does not stop the others, its error is set on its result.
+
+        :param items: Pairs of URI and file where to download the blob content
+        :type items: Iterable[Tuple[str, FileLikeObject]]
+        :param max_workers: Maximum number of concurrent downloads, defaults to 8
+        :type max_workers: int, optional
+        :param progress_callback: Called with the number of completed and all downloads
+            after each download, defaults to None
+        :type progress_callback: ProgressCallback, optional
+        :return: A result per item in the given order, holding the file and its content-type
+        :rtype: List[BlobOperationResult]
+        """
+        return self._run_many(self.download_to_file, list(items), max_workers, progress_callback)
+
+    def upload_many(self, items: Iterable[Tuple[str, FileLikeObject, str]], max_workers: int = DEFAULT_MAX_WORKERS,
+                    progress_callback: ProgressCallback = None) -> List[BlobOperationResult]:
+        """Upload files concurrently, see upload_file.
+
+        A failed upload does not stop the others, its error is set on its result.
+
+        :param items: Triples of target URI, file and content-type
+        :type items: Iterable[Tuple[str, FileLikeObject, str]]
+        :param max_workers: Maximum number of concurrent uploads, defaults to 8
+        :type max_workers: int, optional
+        :param progress_callback: Called with the number of completed and all uploads
+            after each upload, defaults to None
+        :type progress_callback: ProgressCallback, optional
+        :return: A result per item in the given order
+        :rtype: List[BlobOperationResult]
+        """
+        return self._run_many(self.upload_file, list(items), max_workers, progress_callback)
+
+    def exists_many(self, uris: Iterable[str], max_workers: int = DEFAULT_MAX_WORKERS,
+                    progress_callback: ProgressCallback = None,
+                    listing_threshold: int = DEFAULT_LISTING_THRESHOLD) -> List[BlobOperationResult]:
+        """Verify concurrently if files exist, see does_file_exist.
+
+        When at least listing_threshold URIs share a directory, that directory is listed
+        once instead of checking each URI, if the client supports listing.
+
+        :param uris: The URIs to verify
+        :type uris: Iterable[str]
+        :param max_workers: Maximum number of concurrent requests, defaults to 8
+        :type max_workers: int, optional
+        :param progress_callback: Called with the number of verified and all URIs after
+            each request, defaults to None
+        :type progress_callback: ProgressCallback, optional
+        :param listing_threshold: Minimal number of URIs of a directory to list it, defaults to 8
+        :type listing_threshold: int, optional
+        :return: A result per URI in the given order, holding True if the file exists
+        :rtype: List[BlobOperationResult]
+        """
+        uris = list(uris)
+        supports_listing = type(self)._list_uris is not BlobStorageClient._list_uris \
+            or type(self)._list_pages is not BlobStorageClient._list_pages
+        directories = {}
+        for uri in uris:
+            directories.setdefault(self._get_listing_directory(uri) if supports_listing else None, []).append(uri)
+
+        # (directory to list or None, URIs verified by the check)
+        checks = []
+        for directory, directory_uris in directories.items():
+            if directory is not None and len(directory_uris) >= listing_threshold:
+                checks.append((directory, directory_uris))
+            else:
+                checks.extend((None, [uri]) for uri in directory_uris)
+
+        def check(directory: Optional[str], checked_uris: List[str]) -> List[bool]:
+            if directory is None:
+                return [self.does_file_exist(checked_uris[0])]
+            existing = {self._get_uri_key(uri) for uri in self._list_uris(directory)}
+            return [self._get_uri_key(uri) in existing for uri in checked_uris]
+
+        check_results = self._run_many(check, checks, max_workers, progress_callback,
+                                       weights=[len(checked_uris) for _, checked_uris in checks])
+        results = {}
+        for (_, checked_uris), check_result in zip(checks, check_results):
+            for index, uri in enumerate(checked_uris):
+                if check_result.ok:
+                    results[uri] = BlobOperationResult(uri, result=check_result.result[index])
+                else:
+                    results[uri] = BlobOperationResult(uri, error=check_result.error)
+        return [results[uri] for uri in uris]
+
+    def list(self, prefix: str, delimiter: Optional[str] = None, page_size: int = DEFAULT_LISTING_PAGE_SIZE,
+             prefetch_pages: int = 1, fetch_content_type: bool = False) -> Iterator[BlobListing]:
+        """List the blobs whose URI starts with prefix, page by page as the iterator is consumed.
+
+        The next prefetch_pages pages are requested in the background while the current one is
+        consumed. With a delimiter, blobs whose name continues with it after the prefix are not
+        listed, their common prefix up to the delimiter is listed once as directory instead.
+        The iterator should be closed when it is not consumed to the end.
+
+        :param prefix: The URI prefix, e.g. gs://bucket/dir/ or s3://bucket/dir/file-
+        :type prefix: str
+        :param delimiter: The delimiter of directories, usually "/", defaults to None for all blobs
+        :type delimiter: Optional[str], optional
+        :param page_size: The number of blobs requested per page, defaults to 1000
+        :type page_size: int, optional
+        :param prefetch_pages: Number of pages fetched ahead, 0 fetches them on demand, defaults to 1
+        :type prefetch_pages: int, optional
+        :param fetch_content_type: Get the content-type of each blob with a metadata request when
+            the listing of the store does not return it (S3), defaults to False
+        :type fetch_content_type: bool, optional
+        :return: The blobs and directories, in the order of the store
+        :rtype: Iterator[BlobListing]
+        """
+        pages = PrefetchIterator(self._list_pages(prefix, delimiter, page_size, fetch_content_type),
+                                 depth=prefetch_pages)
+        with pages:
+            for page in pages:
+                yield from page
+
+    def _list_pages(self, prefix: str, delimiter: Optional[str], page_size: int,
+                    fetch_content_type: bool) -> Iterator[List[BlobListing]]:
+        """List the blobs whose URI starts with prefix, one list per page requested, see list.
+
+        :param prefix: The URI prefix
+        :type prefix: str
+        :param delimiter: The delimiter of directories
+        :type delimiter: Optional[str]
+        :param page_size: The number of blobs requested per page
+        :type page_size: int
+        :param fetch_content_type: Get the content-type when the listing does not return it
+        :type fetch_content_type: bool
+        :return: The pages
+        :rtype: Iterator[List[BlobListing]]
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not support listing.")
+
+    def _list_uris(self, directory: str) -> Iterator[str]:
+        """List the URIs of the files directly in a directory, not in its subdirectories.
+
+        :param directory: The URI of the directory, ending with a slash
+        :type directory: str
+        :return: The URIs of the files
+        :rtype: Iterator[str]
+        """
+        for page in self._list_pages(directory, "/", DEFAULT_LISTING_PAGE_SIZE, False):
+            for item in page:
+                if not item.is_prefix:
+                    yield item.uri
+
+    def _get_listing_directory(self, uri: str) -> Optional[str]:
+        """Get the directory listed to verify the existence of a URI, see exists_many.
+
+        :param uri: The URI
+        :type uri: str
+        :return: The URI of the directory ending with a slash, None when the URI is checked on its own
+        :rtype: Optional[str]
+        """
+        return uri.rsplit("/", 1)[0] + "/"
+
+    def _get_uri_key(self, uri: str) -> Hashable:
+        """Get the key by which a listed URI is compared to a verified one, equal for the forms of a URI.
+
+        :param uri: The URI
+        :type uri: str
+        :return: The key, the URI itself by default
+        :rtype: Hashable
+        """
+        return uri
+
 
 class BaseCredentials(abc.ABC):
     """Base interface for credentials."""
@@ -93,3 +446,36 @@ class BaseCredentials(abc.ABC):
         :rtype: str
         """
         pass
+
+    def _get_token_store_key(self) -> Hashable:
+        """Key of the tokens of these credentials in the token store, see _get_or_mint_token.
+
+        Implementations add what tells their identities apart, e.g. the service account.
+
+        :return: A tuple of strings
+        :rtype: Hashable
+        """
+        return (type(self).__module__, type(self).__qualname__)
+
+    def _get_or_mint_token(self, mint_token: Callable[[Optional[str]], str]) -> str:
+        """Get the token minted by another process of the host, or mint it.
+
+        The token store on disk is used when the `OSDU_API_TOKEN_STORE_DIR` env var is set,
+        see osdu_api.auth.token_store. The current access token is never returned again, so
+        refreshing still replaces a rejected token.
+
+        :param mint_token: Function getting a new token from the identity provider, called with
+            the current access token, None on first use, which it must not reuse from its caches
+        :type mint_token: Callable[[Optional[str]], str]
+        :return: Access token
+        :rtype: str
+        """
+        # imported on use, file locks are not available on every platform, e.g. Windows
+        from osdu_api.auth.token_store import get_token_store
+
+        stale_token = getattr(self, "_access_token", None) or None
+        token_store = get_token_store()
+        if token_store is None:
+            return mint_token(stale_token)
+        return token_store.get_token(self._get_token_store_key(), lambda: mint_token(stale_token),
+                                     stale_token=stale_token)
@@ -0,0 +1,209 @@
+#  Copyright 2021 Google LLC
+#  Copyright 2021 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import hashlib
+import io
+import os
+
+import boto3
+import pytest
+from boto3.s3.transfer import TransferConfig
+from moto import mock_aws
+from osdu_api.providers.aws.aws_blob_storage_client import AwsCloudStorageClient
+from osdu_api.providers.checksum import MD5, Checksum
+from osdu_api.providers.exceptions import ChecksumMismatchError
+
+BUCKET = "test-bucket"
+MB = 1024 * 1024
+
+
+class TestAwsCloudStorageClient:
+    """Test for AWS Blob Storage Client against a mocked S3."""
+
+    @pytest.fixture()
+    def aws_blob_storage_client(self, monkeypatch):
+        """Build a client with small multipart parts against a mocked S3 with one bucket."""
+        monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+        monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+        monkeypatch.setenv("AWS_SESSION_TOKEN", "testing")
+        with mock_aws():
+            boto3.client("s3", region_name="us-east-1").create_bucket(Bucket=BUCKET)
+            yield AwsCloudStorageClient(transfer_config=TransferConfig(
+                multipart_threshold=5 * MB, multipart_chunksize=5 * MB, max_concurrency=4))
+
+    @pytest.fixture()
+    def verifying_client(self, aws_blob_storage_client: AwsCloudStorageClient) -> AwsCloudStorageClient:
+        """Build a client verifying checksums against the same mocked S3."""
+        return AwsCloudStorageClient(verify_checksums=True, transfer_config=aws_blob_storage_client.transfer_config)
+
+    @pytest.mark.parametrize("size", [
+        pytest.param(12 * MB, id="multipart"),
+        pytest.param(100, id="single part"),
+    ])
+    def test_checksums_verified(self, verifying_client: AwsCloudStorageClient, tmp_path, size: int):
+        """
+        Test the MD5 of transferred bytes is verified against the ETag and returned.
+        """
+        content = os.urandom(size)
+        uri = f"s3://{BUCKET}/seismic/file.segy"
+        expected = Checksum(MD5, hashlib.md5(content).hexdigest())
+
+        assert verifying_client.upload_file(uri, io.BytesIO(content), "application/octet-stream") == expected
+        file = io.BytesIO()
+        result = verifying_client.download_to_file(uri, file)
+        path_result = verifying_client.download_to_file(uri, tmp_path / "file.segy")
+        bytes_result = verifying_client.download_file_as_bytes(uri)
+
+        assert file.getvalue() == content
+        assert (tmp_path / "file.segy").read_bytes() == content
+        assert bytes_result == (content, "application/octet-stream")
+        assert result.checksum == path_result.checksum == bytes_result.checksum == expected
+        assert os.listdir(tmp_path) == ["file.segy"]
+
+    def test_checksum_mismatch(self, verifying_client: AwsCloudStorageClient, monkeypatch, tmp_path):
+        """
+        Test a download whose content does not match the ETag raises and leaves no file.
+        """
+        uri = f"s3://{BUCKET}/manifest.json"
+        verifying_client.upload_file(uri, io.BytesIO(b"{}"), "application/json")
+        head_object = verifying_client.s3_client.head_object
+        monkeypatch.setattr(verifying_client.s3_client, "head_object",
+                            lambda **kwargs: {**head_object(**kwargs), "ETag": f'"{hashlib.md5(b"[]").hexdigest()}"'})
+
+        with pytest.raises(ChecksumMismatchError):
+            verifying_client.download_to_file(uri, io.BytesIO())
+        with pytest.raises(ChecksumMismatchError):
+            verifying_client.download_to_file(uri, tmp_path / "manifest.json")
+        assert os.listdir(tmp_path) == []
+
+    def test_upload_and_download_multipart(self, aws_blob_storage_client: AwsCloudStorageClient):
+        """
+        Test a file bigger than the multipart threshold is streamed to and from the caller's file.
+        """
+        content = os.urandom(12 * MB)
+        uri = f"s3://{BUCKET}/seismic/file.segy"
+
+        aws_blob_storage_client.upload_file(uri, io.BytesIO(content), "application/octet-stream")
+        file = io.BytesIO()
+        returned_file, content_type = aws_blob_storage_client.download_to_file(uri, file)
+
+        assert returned_file is file
+        assert file.getvalue() == content
+        assert content_type == "application/octet-stream"
+
+    def test_upload_and_download_path(self, aws_blob_storage_client: AwsCloudStorageClient, tmp_path):
+        """
+        Test files are transferred from and to filesystem paths.
+        """
+        source = tmp_path / "source.las"
+        source.write_bytes(b"~Version information\n")
+        target = tmp_path / "target.las"
+        uri = f"s3://{BUCKET}/well-logs/file.las"
+
+        aws_blob_storage_client.upload_file(uri, str(source), "text/plain")
+        _, content_type = aws_blob_storage_client.download_to_file(uri, target)
+
+        assert target.read_bytes() == b"~Version information\n"
+        assert content_type == "text/plain"
+
+    def test_download_file_as_bytes(self, aws_blob_storage_client: AwsCloudStorageClient):
+        """
+        Test download as bytes returns the content and content type.
+        """
+        uri = f"s3://{BUCKET}/manifest.json"
+        aws_blob_storage_client.upload_file(uri, io.BytesIO(b"{}"), "application/json")
+
+        assert aws_blob_storage_client.download_file_as_bytes(uri) == (b"{}", "application/json")
+
+    def test_does_file_exist(self, aws_blob_storage_client: AwsCloudStorageClient):
+        """
+        Test existence check for present and missing objects.
+        """
+        uri = f"s3://{BUCKET}/exists"
+        aws_blob_storage_client.upload_file(uri, io.BytesIO(b"data"), None)
+
+        assert aws_blob_storage_client.does_file_exist(uri)
+        assert not aws_blob_storage_client.does_file_exist(f"s3://{BUCKET}/missing")
+
+    def test_download_range_and_open_read(self, aws_blob_storage_client: AwsCloudStorageClient):
+        """
+        Test byte ranges are read without downloading the whole object.
+        """
+        content = os.urandom(3 * MB)
+        uri = f"s3://{BUCKET}/seismic/header.segy"
+        aws_blob_storage_client.upload_file(uri, io.BytesIO(content), "application/octet-stream")
+
+        metadata = aws_blob_storage_client.get_metadata(uri)
+        assert metadata.size == len(content)
+        assert metadata.content_type == "application/octet-stream"
+        assert aws_blob_storage_client.download_range(uri, 0, 3599) == content[:3600]
+        assert aws_blob_storage_client.download_range(uri, len(content) - 10, len(content) + 100) == content[-10:]
+        with aws_blob_storage_client.open_read(uri, block_size=MB) as reader:
+            reader.seek(MB - 5)
+            assert reader.read(10) == content[MB - 5:MB + 5]
+            assert reader.read() == content[MB + 5:]
+
+    def test_get_metadata_missing(self, aws_blob_storage_client: AwsCloudStorageClient):
+        """
+        Test metadata of a missing object raises FileNotFoundError.
+        """
+        with pytest.raises(FileNotFoundError):
+            aws_blob_storage_client.get_metadata(f"s3://{BUCKET}/missing")
+
+    def test_exists_many(self, aws_blob_storage_client: AwsCloudStorageClient):
+        """
+        Test existence of many objects of a directory is verified by listing it.
+        """
+        uris = [f"s3://{BUCKET}/manifests/file-{index}.json" for index in range(12)]
+        aws_blob_storage_client.upload_many([(uri, io.BytesIO(b"{}"), "application/json") for uri in uris[::2]])
+        aws_blob_storage_client.upload_file(f"s3://{BUCKET}/manifests/nested/file-1.json", io.BytesIO(b"{}"), None)
+
+        results = aws_blob_storage_client.exists_many(uris + [f"s3://{BUCKET}/other.json"])
+
+        assert [result.result for result in results] == [index % 2 == 0 for index in range(12)] + [False]
+
+    def test_list(self, aws_blob_storage_client: AwsCloudStorageClient):
+        """
+        Test objects under a prefix are listed page by page, with directories when a delimiter is given.
+        """
+        names = ["collection/a.json", "collection/b.json", "collection/c.las", "collection/nested/d.json",
+                 "collection-2/e.json"]
+        for name in names:
+            aws_blob_storage_client.upload_file(f"s3://{BUCKET}/{name}", io.BytesIO(name.encode()),
+                                                "application/json" if name.endswith(".json") else "text/plain")
+
+        items = list(aws_blob_storage_client.list(f"s3://{BUCKET}/collection/", page_size=2))
+        directory = list(aws_blob_storage_client.list(f"s3://{BUCKET}/collection/", delimiter="/",
+                                                      fetch_content_type=True))
+
+        assert [item.uri for item in items] == [f"s3://{BUCKET}/{name}" for name in names[:4]]
+        assert [item.size for item in items] == [len(name) for name in names[:4]]
+        assert all(item.etag and item.content_type is None for item in items)
+        assert [(item.name, item.is_prefix, item.content_type) for item in directory] == [
+            ("collection/a.json", False, "application/json"),
+            ("collection/b.json", False, "application/json"),
+            ("collection/c.las", False, "text/plain"),
+            ("collection/nested/", True, None),
+        ]
+
+    def test_endpoint_url(self, monkeypatch):
+        """
+        Test an S3 compatible endpoint is taken from the argument or the env.
+        """
+        monkeypatch.setenv("AWS_S3_ENDPOINT_URL", "http://localhost:9000")
+
+        assert AwsCloudStorageClient().s3_client.meta.endpoint_url == "http://localhost:9000"
+        assert AwsCloudStorageClient(endpoint_url="http://minio:9000").s3_client.meta.endpoint_url == \
+            "http://minio:9000"
@@ -0,0 +1,118 @@
+#  Copyright 2021 Google LLC
+#  Copyright 2021 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import json
+
+import boto3
+import pytest
+import responses
+from moto import mock_aws
+from osdu_api.providers.aws import boto_client_factory, service_principal_util
+from osdu_api.providers.aws.boto_client_factory import BotoClientFactory
+
+REGION = "us-east-1"
+TOKEN_URL = "https://auth.example.com/oauth2/token"
+CONFIG = """[provider]
+client_id_ssm_path=/osdu/client-id
+client_secret_name=osdu-client-secret
+client_secret_dict_key=client_secret_value
+aws_oauth_custom_scope_ssm_path=/osdu/scope
+region_name=us-east-1
+token_url_ssm_path=/osdu/token-url
+"""
+
+
+class TestServicePrincipalUtil:
+    """Test the service principal token of AWS against mocked SSM, Secrets Manager and STS."""
+
+    @pytest.fixture()
+    def aws(self, monkeypatch, tmp_path):
+        """Store the service principal settings in mocked services, with osdu_api.ini in the working directory."""
+        monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+        monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+        monkeypatch.setenv("AWS_DEFAULT_REGION", REGION)
+        monkeypatch.delenv("USE_AIRFLOW", raising=False)
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "osdu_api.ini").write_text(CONFIG)
+        service_principal_util.clear_cache()
+        boto_client_factory.clear_cache()
+        with mock_aws():
+            ssm = boto3.client("ssm", region_name=REGION)
+            for name, value in (("/osdu/client-id", "client"), ("/osdu/scope", "osdu/api"),
+                                ("/osdu/token-url", TOKEN_URL)):
+                ssm.put_parameter(Name=name, Value=value, Type="String")
+            secrets = boto3.client("secretsmanager", region_name=REGION)
+            secrets.create_secret(Name="osdu-client-secret", SecretString=json.dumps({"client_secret_value": "s1"}))
+            yield secrets
+        service_principal_util.clear_cache()
+        boto_client_factory.clear_cache()
+
+    @responses.activate
+    def test_settings_reused_between_tokens(self, aws, mocker):
+        """
+        Test parameters are read once with a single request and the config file once.
+        """
+        responses.add(responses.POST, TOKEN_URL, json={"access_token": "token"})
+        get_parameters = mocker.spy(BotoClientFactory().get_boto_client("ssm", REGION), "get_parameters")
+        read_config = mocker.spy(service_principal_util.ConfigParser, "read")
+
+        tokens = [service_principal_util.get_service_principal_token() for _ in range(3)]
+
+        assert tokens == ["token"] * 3
+        assert get_parameters.call_count == 1
+        assert read_config.call_count == 1
+        assert len(responses.calls) == 3
+        request = responses.calls[0].request
+        assert request.url.startswith(TOKEN_URL + "?grant_type=client_credentials&client_id=client&scope=osdu/api")
+
+    @responses.activate
+    def test_settings_read_again_after_rejected_secret(self, aws):
+        """
+        Test a rotated client secret is read again when the cached one is rejected.
+        """
+        responses.add(responses.POST, TOKEN_URL, json={"access_token": "token-1"})
+        responses.add(responses.POST, TOKEN_URL, json={"error": "invalid_client"}, status=401)
+        responses.add(responses.POST, TOKEN_URL, json={"access_token": "token-2"})
+        service_principal_util.get_service_principal_token()
+        aws.put_secret_value(SecretId="osdu-client-secret", SecretString=json.dumps({"client_secret_value": "s2"}))
+
+        assert service_principal_util.get_service_principal_token() == "token-2"
+        assert responses.calls[2].request.headers["Authorization"] != responses.calls[1].request.headers["Authorization"]
+
+    def test_missing_parameter(self, aws, monkeypatch, tmp_path):
+        """
+        Test a missing SSM parameter raises ValueError.
+        """
+        (tmp_path / "osdu_api.ini").write_text(CONFIG.replace("/osdu/scope", "/osdu/missing"))
+
+        with pytest.raises(ValueError):
+            service_principal_util.get_service_principal_token()
+
+    def test_clients_reused(self, aws, monkeypatch):
+        """
+        Test boto clients are shared and the role is assumed until its credentials expire.
+        """
+        monkeypatch.setenv("USE_AIRFLOW", "true")
+        monkeypatch.setenv("AWS_ROLE_ARN", "arn:aws:iam::123456789012:role/airflow")
+        factory = BotoClientFactory()
+
+        ssm_client = factory.get_boto_client("ssm", REGION)
+
+        assert BotoClientFactory().get_boto_client("ssm", REGION) is ssm_client
+        assert factory.get_boto_client("secretsmanager", REGION) is not ssm_client
+        assert len(boto_client_factory._assumed_role_credentials) == 1
+
+        monkeypatch.setattr(boto_client_factory, "ASSUMED_ROLE_REFRESH_MARGIN", 10 ** 9)
+        assert factory.get_boto_client("ssm", REGION) is not ssm_client
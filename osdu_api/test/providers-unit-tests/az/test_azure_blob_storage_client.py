@@ -0,0 +1,163 @@
+#  Copyright © Microsoft Corporation
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import io
+import os
+import uuid
+from urllib.parse import quote
+
+import pytest
+from azure.storage.blob import BlobPrefix, BlobProperties
+from osdu_api.providers.azure.azure_blob_storage_client import AzureCloudStorageClient
+from osdu_api.providers.exceptions import AzureBlobURIError
+
+# well known development account of the Azurite emulator
+AZURITE_CONNECTION_STRING = (
+    "DefaultEndpointsProtocol=http;AccountName=devstoreaccount1;"
+    "AccountKey=Eby8vdM02xNOcqFlqUwJPLlmEtlCDXJ1OUzFT50uSRZ6IFsuFq2UVErCz4I6tq/K1SZFPTOtr/KBHBeksoGMGw==;"
+    "BlobEndpoint=http://127.0.0.1:10000/devstoreaccount1;"
+)
+# set to the connection string of a running emulator to run the transfer tests
+EMULATOR_CONNECTION_STRING_ENV = "AZURITE_CONNECTION_STRING"
+MB = 1024 * 1024
+
+
+class TestAzureBlobURIs:
+    """Test the Azure Blob Storage Client resolves blob URLs."""
+
+    @pytest.fixture()
+    def azure_blob_storage_client(self) -> AzureCloudStorageClient:
+        return AzureCloudStorageClient(connection_string=AZURITE_CONNECTION_STRING)
+
+    def test_blob_of_account(self, azure_blob_storage_client: AzureCloudStorageClient):
+        """Test URLs of the configured account are split into container and blob name.
+        """
+        blob_client = azure_blob_storage_client._get_blob_client(
+            "http://127.0.0.1:10000/devstoreaccount1/osdu/seismic/file%201.segy")
+
+        assert blob_client.container_name == "osdu"
+        assert blob_client.blob_name == "seismic/file 1.segy"
+        assert blob_client.credential.account_name == "devstoreaccount1"
+
+    def test_signed_url(self, azure_blob_storage_client: AzureCloudStorageClient):
+        """Test signed URLs of other accounts are used as they are.
+        """
+        blob_client = azure_blob_storage_client._get_blob_client(
+            "https://other.blob.core.windows.net/osdu/file.las?sv=2020-08-04&sig=signature")
+
+        assert blob_client.account_name == "other"
+        assert blob_client.container_name == "osdu"
+        assert blob_client.blob_name == "file.las"
+
+    def test_exists_many_special_characters(self, azure_blob_storage_client: AzureCloudStorageClient,
+                                            monkeypatch):
+        """Test blobs whose name has a space or % are found when listing, in quoted and unquoted URLs.
+        """
+        names = ["well 1.las", "100%.las"] + [f"file-{index}" for index in range(8)]
+        service_client = azure_blob_storage_client._get_service_client()
+        container_client = service_client.get_container_client("osdu")
+        monkeypatch.setattr(container_client, "walk_blobs", lambda name_starts_with, delimiter: iter(
+            [BlobPrefix(name="logs/sub/")] + [BlobProperties(name="logs/" + name) for name in names]))
+        monkeypatch.setattr(service_client, "get_container_client", lambda container_name: container_client)
+        base_uri = "http://127.0.0.1:10000/devstoreaccount1/osdu/logs/"
+        uris = [base_uri + quote(name) for name in names] + [base_uri + name for name in names[:2]]
+
+        results = azure_blob_storage_client.exists_many(uris + [base_uri + "missing%201.las"])
+
+        assert [result.result for result in results] == [True] * 12 + [False]
+
+    def test_exists_many_signed_urls(self, azure_blob_storage_client: AzureCloudStorageClient, monkeypatch):
+        """Test signed URLs sharing a directory are checked one by one instead of listing it.
+        """
+        base_uri = "https://other.blob.core.windows.net/osdu/logs/"
+        uris = [f"{base_uri}file-{index}.las?sv=2020-08-04&sig=signature" for index in range(10)]
+        monkeypatch.setattr(azure_blob_storage_client, "_list_uris", lambda directory: pytest.fail("listed"))
+        monkeypatch.setattr(azure_blob_storage_client, "does_file_exist", lambda uri: "file-1" in uri)
+
+        results = azure_blob_storage_client.exists_many(uris)
+
+        assert all(result.ok for result in results)
+        assert [result.result for result in results] == [False, True] + [False] * 8
+
+    @pytest.mark.parametrize("uri", [
+        pytest.param("gs://bucket/file"),
+        pytest.param("http://127.0.0.1:10000/devstoreaccount1/osdu"),
+        pytest.param("http://127.0.0.1:10000/devstoreaccount1/osdu/"),
+    ])
+    def test_invalid_uri(self, azure_blob_storage_client: AzureCloudStorageClient, uri: str):
+        """Test URIs not pointing to a blob are rejected.
+        """
+        with pytest.raises(AzureBlobURIError):
+            azure_blob_storage_client._get_blob_client(uri)
+
+
+@pytest.mark.skipif(not os.environ.get(EMULATOR_CONNECTION_STRING_ENV),
+                    reason=f"{EMULATOR_CONNECTION_STRING_ENV} is not set")
+class TestAzureCloudStorageClient:
+    """Test for Azure Blob Storage Client against an Azurite emulator."""
+
+    @pytest.fixture()
+    def azure_blob_storage_client(self) -> AzureCloudStorageClient:
+        """Build a client with small blocks and ranges, and a new container."""
+        client = AzureCloudStorageClient(
+            connection_string=os.environ[EMULATOR_CONNECTION_STRING_ENV], block_size=1 * MB,
+            single_put_size=1 * MB, single_get_size=1 * MB, chunk_get_size=1 * MB, max_concurrency=4)
+        container_client = client._get_service_client().create_container(f"test-{uuid.uuid4().hex}")
+        client.base_uri = f"{container_client.url}/"
+        yield client
+        container_client.delete_container()
+
+    def test_upload_and_download_blocks(self, azure_blob_storage_client: AzureCloudStorageClient):
+        """Test a file bigger than a block is streamed to and from the caller's file.
+        """
+        content = os.urandom(5 * MB + 7)
+        uri = azure_blob_storage_client.base_uri + "seismic/file.segy"
+
+        azure_blob_storage_client.upload_file(uri, io.BytesIO(content), "application/octet-stream")
+        file = io.BytesIO()
+        returned_file, content_type = azure_blob_storage_client.download_to_file(uri, file)
+
+        assert returned_file is file
+        assert file.getvalue() == content
+        assert content_type == "application/octet-stream"
+        assert azure_blob_storage_client.download_range(uri, 100, 199) == content[100:200]
+        assert azure_blob_storage_client.get_metadata(uri).size == len(content)
+
+    def test_upload_and_download_path(self, azure_blob_storage_client: AzureCloudStorageClient, tmp_path):
+        """Test files are transferred from and to filesystem paths.
+        """
+        source = tmp_path / "source.json"
+        source.write_bytes(b'{"kind": "osdu"}')
+        uri = azure_blob_storage_client.base_uri + "manifest.json"
+
+        azure_blob_storage_client.upload_file(uri, str(source), "application/json")
+        azure_blob_storage_client.download_to_file(uri, str(tmp_path / "target.json"))
+
+        assert (tmp_path / "target.json").read_bytes() == b'{"kind": "osdu"}'
+        assert azure_blob_storage_client.download_file_as_bytes(uri) == (b'{"kind": "osdu"}', "application/json")
+
+    def test_exists(self, azure_blob_storage_client: AzureCloudStorageClient):
+        """Test existence is checked by properties and by listing directories.
+        """
+        base_uri = azure_blob_storage_client.base_uri
+        azure_blob_storage_client.upload_file(base_uri + "dir/file", io.BytesIO(b""), None)
+        azure_blob_storage_client.upload_file(base_uri + "dir/sub/file", io.BytesIO(b""), None)
+
+        results = azure_blob_storage_client.exists_many([base_uri + "dir/file", base_uri + "dir/missing"],
+                                                        listing_threshold=2)
+
+        assert azure_blob_storage_client.does_file_exist(base_uri + "dir/file")
+        assert not azure_blob_storage_client.does_file_exist(base_uri + "dir/missing")
+        assert list(azure_blob_storage_client._list_uris(base_uri + "dir/")) == [base_uri + "dir/file"]
+        assert [result.result for result in results] == [True, False]
@@ -13,14 +13,24 @@
 #  See the License for the specific language governing permissions and
 #  limitations under the License.
 
+import base64
 import io
+import json
 import os
+import re
 import sys
+from types import SimpleNamespace
 
 
 import pytest
+import responses
+import tenacity
+from google.auth.credentials import AnonymousCredentials
+from google.cloud import storage
 from pytest_mock import MockerFixture
-from osdu_api.providers.exceptions import GCSObjectURIError
+from osdu_api.providers.checksum import CRC32C, compute_checksum
+from osdu_api.providers.exceptions import ChecksumMismatchError, GCSObjectURIError
+from osdu_api.providers.gcp import gcp_blob_storage_client
 from osdu_api.providers.gcp.gcp_blob_storage_client import GoogleCloudStorageClient
 
 
@@ -185,3 +195,251 @@ class TestGoogleCloudStorageClient:
         client_mock.bucket.assert_called_with(bucket_name)
         bucket_mock.blob.assert_called_with(blob_name)
         blob_mock.exists.assert_called_with()
+
+    def test_client_upload_file_retried(self, mocker: MockerFixture, monkeypatch, mock_gcp_storage_objects):
+        """
+        Test a failed upload is sent again from the start of the file.
+        """
+        client_mock, bucket_mock, blob_mock = mock_gcp_storage_objects
+        mocker.patch(self.GCP_STORAGE_CLIENT_CLASS_IMPORT, return_value=client_mock)
+        monkeypatch.setitem(gcp_blob_storage_client.RETRY_SETTINGS, "wait", tenacity.wait_none())
+        uploaded = []
+
+        def upload_from_file(file, content_type):
+            uploaded.append(file.read())
+            if len(uploaded) == 1:
+                raise ConnectionError("connection reset")
+        blob_mock.upload_from_file.side_effect = upload_from_file
+        test_client = GoogleCloudStorageClient()
+
+        test_client.upload_file("gs://bucket_test/name_test", io.BytesIO(b"content"), "text/plain")
+
+        assert uploaded == [b"content", b"content"]
+
+    def test_client_upload_file_composite(self, mocker: MockerFixture):
+        """
+        Test big files are uploaded in parts that are composed and deleted.
+        """
+        blobs = {}
+        bucket_mock = mocker.Mock()
+        bucket_mock.blob = mocker.Mock(side_effect=lambda name: blobs.setdefault(name, mocker.Mock(name=name)))
+        client_mock = mocker.Mock()
+        client_mock.bucket = mocker.Mock(return_value=bucket_mock)
+        mocker.patch(self.GCP_STORAGE_CLIENT_CLASS_IMPORT, return_value=client_mock)
+        test_client = GoogleCloudStorageClient(composite_threshold=100, composite_chunk_size=10, max_workers=4)
+        content = bytes(range(256)) * 3
+
+        test_client.upload_file("gs://bucket_test/volume.segy", io.BytesIO(content), "application/octet-stream")
+
+        part_names = sorted(name for name in blobs if name != "volume.segy")
+        assert len(part_names) == 77
+        uploaded = b"".join(blobs[name].upload_from_string.call_args[0][0] for name in part_names)
+        assert uploaded == content
+        target = blobs["volume.segy"]
+        assert target.content_type == "application/octet-stream"
+        compose_sources = [call[0][0] for call in target.compose.call_args_list]
+        assert all(len(sources) <= 32 for sources in compose_sources)
+        assert [blob for blob in compose_sources[0]] == [blobs[name] for name in part_names[:32]]
+        assert all(sources[0] is target for sources in compose_sources[1:])
+        composed = [blob for sources in compose_sources for blob in sources if blob is not target]
+        assert composed == [blobs[name] for name in part_names]
+        deleted = bucket_mock.delete_blobs.call_args[0][0]
+        assert sorted(blob._mock_name for blob in deleted) == part_names
+
+    @responses.activate
+    def test_client_upload_file_resumable_from_position(self, mocker: MockerFixture):
+        """
+        Test a resumable upload sends the file from its current position in chunks and retries a failed chunk.
+        """
+        storage_client = storage.Client(project="test", credentials=AnonymousCredentials())
+        mocker.patch(self.GCP_STORAGE_CLIENT_CLASS_IMPORT, return_value=storage_client)
+        # uploads up to 8 MiB are sent in a single multipart request
+        chunk_size = 4 * 1024 * 1024
+        content = os.urandom(2 * chunk_size + 100)
+        session_url = "https://storage.googleapis.com/upload/session"
+        received = bytearray()
+        chunk_requests = []
+
+        def initiate(request):
+            assert json.loads(request.body) == {"name": "name_test"}
+            assert request.headers["x-upload-content-type"] == "text/plain"
+            assert request.headers["x-upload-content-length"] == str(len(content))
+            return 200, {"location": session_url}, ""
+
+        def put_chunk(request):
+            chunk_requests.append(request.headers["content-range"])
+            if len(chunk_requests) == 2:
+                return 503, {}, ""
+            received.extend(request.body)
+            if len(received) < len(content):
+                return 308, {"range": f"bytes=0-{len(received) - 1}"}, ""
+            return 200, {}, json.dumps({"name": "name_test", "bucket": "bucket_test",
+                                        "crc32c": self._get_crc32c(content)})
+
+        responses.add_callback(responses.POST, re.compile(r".*/upload/storage/v1/b/bucket_test/o.*"),
+                               callback=initiate)
+        responses.add_callback(responses.PUT, session_url, callback=put_chunk)
+        test_client = GoogleCloudStorageClient(resumable_threshold=10, resumable_chunk_size=chunk_size,
+                                               verify_checksums=True)
+        file = io.BytesIO(b"header" + content)
+        file.seek(6)
+
+        checksum = test_client.upload_file("gs://bucket_test/name_test", file, "text/plain")
+
+        assert bytes(received) == content
+        assert checksum == compute_checksum(CRC32C, content)
+        assert chunk_requests[1] == chunk_requests[2] == f"bytes {chunk_size}-{2 * chunk_size - 1}/{len(content)}"
+        assert len(chunk_requests) == 4
+
+    def test_client_download_range(self, mocker: MockerFixture, mock_gcp_storage_objects):
+        """
+        Test GCP Storage client downloads an inclusive byte range.
+        """
+        client_mock, bucket_mock, blob_mock = mock_gcp_storage_objects
+        mocker.patch(self.GCP_STORAGE_CLIENT_CLASS_IMPORT, return_value=client_mock)
+        blob_mock.download_as_bytes.return_value = b"range"
+        test_client = GoogleCloudStorageClient()
+
+        assert test_client.download_range("gs://bucket_test/name_test", 10, 14) == b"range"
+        bucket_mock.blob.assert_called_with("name_test")
+        blob_mock.download_as_bytes.assert_called_with(start=10, end=14)
+        with pytest.raises(ValueError):
+            test_client.download_range("gs://bucket_test/name_test", 10, 9)
+
+    def test_client_get_metadata(self, mocker: MockerFixture, mock_gcp_storage_objects):
+        """
+        Test GCP Storage client returns blob properties as metadata.
+        """
+        client_mock, bucket_mock, blob_mock = mock_gcp_storage_objects
+        mocker.patch(self.GCP_STORAGE_CLIENT_CLASS_IMPORT, return_value=client_mock)
+        blob_mock.configure_mock(size=42, content_type="text/plain", etag="CJ", generation=1623,
+                                 content_encoding=None)
+        test_client = GoogleCloudStorageClient()
+
+        metadata = test_client.get_metadata("gs://bucket_test/name_test")
+
+        assert (metadata.size, metadata.content_type, metadata.etag, metadata.generation) == \
+            (42, "text/plain", "CJ", "1623")
+
+    def test_client_list(self, mocker: MockerFixture):
+        """
+        Test GCP Storage client lists blobs and directories page by page.
+        """
+        class Page(list):
+            prefixes = ()
+
+        first_page = Page([SimpleNamespace(name="dir/a.json", size=2, content_type="application/json", etag="CA")])
+        first_page.prefixes = ("dir/sub2/", "dir/sub1/")
+        second_page = Page([SimpleNamespace(name="dir/b.las", size=5, content_type="text/plain", etag="CB")])
+        client_mock = mocker.Mock()
+        client_mock.list_blobs.return_value = SimpleNamespace(pages=iter([first_page, second_page]))
+        mocker.patch(self.GCP_STORAGE_CLIENT_CLASS_IMPORT, return_value=client_mock)
+        test_client = GoogleCloudStorageClient()
+
+        items = list(test_client.list("gs://bucket_test/dir/", delimiter="/", page_size=1))
+
+        assert [(item.uri, item.name, item.size, item.content_type, item.etag, item.is_prefix) for item in items] == [
+            ("gs://bucket_test/dir/a.json", "dir/a.json", 2, "application/json", "CA", False),
+            ("gs://bucket_test/dir/sub1/", "dir/sub1/", None, None, None, True),
+            ("gs://bucket_test/dir/sub2/", "dir/sub2/", None, None, None, True),
+            ("gs://bucket_test/dir/b.las", "dir/b.las", 5, "text/plain", "CB", False),
+        ]
+        assert client_mock.list_blobs.call_args[0] == ("bucket_test",)
+        assert client_mock.list_blobs.call_args[1]["prefix"] == "dir/"
+        assert client_mock.list_blobs.call_args[1]["delimiter"] == "/"
+        assert client_mock.list_blobs.call_args[1]["page_size"] == 1
+        with pytest.raises(GCSObjectURIError):
+            list(test_client.list("s3://bucket_test/dir/"))
+
+    @staticmethod
+    def _get_crc32c(data: bytes) -> str:
+        return base64.b64encode(bytes.fromhex(compute_checksum(CRC32C, data).value)).decode()
+
+    def test_client_download_verifies_crc32c(self, mocker: MockerFixture, mock_gcp_storage_objects):
+        """
+        Test the CRC32C of downloaded bytes is verified and returned instead of the library's MD5.
+        """
+        client_mock, bucket_mock, blob_mock = mock_gcp_storage_objects
+        mocker.patch(self.GCP_STORAGE_CLIENT_CLASS_IMPORT, return_value=client_mock)
+        blob_mock.configure_mock(content_type="text/plain", content_encoding=None,
+                                 crc32c=self._get_crc32c(b"content"))
+        blob_mock.download_to_file.side_effect = lambda file, checksum: file.write(b"content")
+        blob_mock.download_as_bytes.return_value = b"content"
+        test_client = GoogleCloudStorageClient(verify_checksums=True)
+
+        file = io.BytesIO()
+        result = test_client.download_to_file("gs://bucket_test/name_test", file)
+        bytes_result = test_client.download_file_as_bytes("gs://bucket_test/name_test")
+
+        assert file.getvalue() == b"content"
+        assert result == (file, "text/plain")
+        assert bytes_result == (b"content", "text/plain")
+        assert result.checksum == bytes_result.checksum == compute_checksum(CRC32C, b"content")
+        assert blob_mock.download_to_file.call_args[1] == {"checksum": None}
+        blob_mock.download_as_bytes.assert_called_with(checksum=None)
+
+    def test_client_download_crc32c_mismatch(self, mocker: MockerFixture, monkeypatch, mock_gcp_storage_objects):
+        """
+        Test a download whose content does not match the stored CRC32C raises.
+        """
+        client_mock, bucket_mock, blob_mock = mock_gcp_storage_objects
+        mocker.patch(self.GCP_STORAGE_CLIENT_CLASS_IMPORT, return_value=client_mock)
+        monkeypatch.setattr(GoogleCloudStorageClient._get_file_as_bytes_from_bucket.retry, "wait",
+                            tenacity.wait_none())
+        blob_mock.configure_mock(content_encoding=None, crc32c=self._get_crc32c(b"content"))
+        blob_mock.download_as_bytes.return_value = b"corrupted"
+        test_client = GoogleCloudStorageClient(verify_checksums=True)
+
+        with pytest.raises(ChecksumMismatchError):
+            test_client.download_file_as_bytes("gs://bucket_test/name_test")
+
+    def test_client_upload_verifies_crc32c(self, mocker: MockerFixture, mock_gcp_storage_objects):
+        """
+        Test the CRC32C of uploaded bytes is computed while they are read and compared to the stored one.
+        """
+        client_mock, bucket_mock, blob_mock = mock_gcp_storage_objects
+        mocker.patch(self.GCP_STORAGE_CLIENT_CLASS_IMPORT, return_value=client_mock)
+
+        def upload_from_file(file, content_type):
+            blob_mock.crc32c = self._get_crc32c(file.read())
+        blob_mock.upload_from_file.side_effect = upload_from_file
+        test_client = GoogleCloudStorageClient(verify_checksums=True)
+
+        checksum = test_client.upload_file("gs://bucket_test/name_test", io.BytesIO(b"content"), "text/plain")
+
+        assert checksum == compute_checksum(CRC32C, b"content")
+        blob_mock.upload_from_file.side_effect = lambda file, content_type: file.read()
+        blob_mock.crc32c = self._get_crc32c(b"other")
+        with pytest.raises(ChecksumMismatchError):
+            test_client.upload_file("gs://bucket_test/name_test", io.BytesIO(b"content"), "text/plain")
+
+    def test_client_upload_composite_verifies_parts(self, mocker: MockerFixture):
+        """
+        Test the parts of a composite upload are verified and the CRC32C of the composite is returned.
+        """
+        blobs = {}
+        bucket_mock = mocker.Mock()
+        bucket_mock.blob = mocker.Mock(side_effect=lambda name: blobs.setdefault(name, mocker.Mock(name=name)))
+        client_mock = mocker.Mock()
+        client_mock.bucket = mocker.Mock(return_value=bucket_mock)
+        mocker.patch(self.GCP_STORAGE_CLIENT_CLASS_IMPORT, return_value=client_mock)
+        test_client = GoogleCloudStorageClient(composite_threshold=100, composite_chunk_size=10, max_workers=4,
+                                               verify_checksums=True)
+        content = os.urandom(250)
+
+        def upload_from_string(name, data, content_type):
+            blobs[name].crc32c = self._get_crc32c(data)
+
+        def get_blob(name):
+            blob = blobs.setdefault(name, mocker.Mock(name=name))
+            if name != "volume.segy":
+                blob.upload_from_string.side_effect = lambda data, content_type: \
+                    upload_from_string(name, data, content_type)
+            else:
+                blob.crc32c = self._get_crc32c(content)
+            return blob
+        bucket_mock.blob.side_effect = get_blob
+
+        checksum = test_client.upload_file("gs://bucket_test/volume.segy", io.BytesIO(content), None)
+
+        assert checksum == compute_checksum(CRC32C, content)
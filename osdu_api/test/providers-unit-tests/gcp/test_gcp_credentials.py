@@ -14,6 +14,7 @@
 #  limitations under the License.
 
 
+import datetime
 import json
 import os
 import sys
@@ -36,6 +37,24 @@ class MockCredentials:
         self.token = self.access_token
 
 
+class MockExpiringCredentials:
+
+    def __init__(self, lifetime: datetime.timedelta):
+        self.lifetime = lifetime
+        self.token = None
+        self.expiry = None
+        self.refreshes = 0
+
+    @property
+    def valid(self) -> bool:
+        return self.token is not None and self.expiry > datetime.datetime.utcnow()
+
+    def refresh(self, *args, **kwargs):
+        self.refreshes += 1
+        self.token = f"token-{self.refreshes}"
+        self.expiry = datetime.datetime.utcnow() + self.lifetime
+
+
 class TestGCPCredentials:
 
     @pytest.fixture()
@@ -108,3 +127,68 @@ class TestGCPCredentials:
     ):
         gcp_credentials.refresh_token()
         assert gcp_credentials.access_token == expected_token
+
+    @pytest.mark.parametrize(
+        "lifetime, expected_refreshes, sa_file_path",
+        [
+            pytest.param(datetime.timedelta(hours=1), 1, "/test", id="Fresh token"),
+            pytest.param(datetime.timedelta(seconds=30), 3, "/test", id="Expiring token"),
+        ]
+    )
+    def test_refresh_token_reuses_credentials(
+        self,
+        monkeypatch,
+        gcp_credentials: GCPCredentials,
+        lifetime: datetime.timedelta,
+        expected_refreshes: int,
+        sa_file_path: str,
+    ):
+        """
+        Check the SA file is read and credentials are built once, and refreshed only when expiring.
+        """
+        reads, built = [], []
+        monkeypatch.setattr(os.path, "isfile", lambda *args, **kwargs: True)
+        monkeypatch.setattr(gcp_credentials, "_get_sa_info_from_file",
+                            lambda *args, **kwargs: reads.append(1) or {"type": "service_account"})
+        monkeypatch.setattr(service_account.Credentials, "from_service_account_info",
+                            lambda *args, **kwargs: built.append(MockExpiringCredentials(lifetime)) or built[-1])
+
+        gcp_credentials.refresh_token()
+        tokens = [gcp_credentials._get_access_token_using_sa_file() for _ in range(2)]
+
+        assert tokens[-1] == f"token-{expected_refreshes}"
+        assert len(reads) == 1
+        assert len(built) == 1
+        assert built[0].refreshes == expected_refreshes
+
+    @pytest.mark.parametrize("sa_file_path", [pytest.param("/test")])
+    def test_refresh_token_replaces_rejected_token(self, monkeypatch, gcp_credentials: GCPCredentials,
+                                                   sa_file_path: str):
+        """
+        Check refreshing replaces the current token even while it is fresh, e.g. after a 401.
+        """
+        credentials = MockExpiringCredentials(datetime.timedelta(hours=1))
+        monkeypatch.setattr(os.path, "isfile", lambda *args, **kwargs: True)
+        monkeypatch.setattr(gcp_credentials, "_get_sa_info_from_file",
+                            lambda *args, **kwargs: {"type": "service_account"})
+        monkeypatch.setattr(service_account.Credentials, "from_service_account_info",
+                            lambda *args, **kwargs: credentials)
+
+        assert gcp_credentials.refresh_token() == "token-1"
+        assert gcp_credentials.refresh_token() == "token-2"
+        assert credentials.refreshes == 2
+
+    @pytest.mark.parametrize("sa_file_path", [pytest.param("/test")])
+    def test_storage_client_created_for_gcs_path_only(self, mocker, gcp_credentials: GCPCredentials,
+                                                      sa_file_path: str):
+        """
+        Check the storage client is only created to read SA files stored in GCS.
+        """
+        storage_client = mocker.patch("osdu_api.providers.gcp.gcp_credentials.storage.Client")
+        storage_client.return_value.bucket.return_value.blob.return_value.download_as_bytes.return_value = b"{}"
+
+        GCPCredentials()
+        storage_client.assert_not_called()
+
+        assert GCPCredentials(sa_file_path="gs://test/sa.json")._get_sa_info() == {}
+        storage_client.assert_called_once()
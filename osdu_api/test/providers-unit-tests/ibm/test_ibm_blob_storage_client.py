@@ -0,0 +1,85 @@
+#  Licensed Materials - Property of IBM
+#  (c) Copyright IBM Corp. 2020. All Rights Reserved.
+
+import io
+import multiprocessing
+import os
+
+import boto3
+import pytest
+from boto3.s3.transfer import TransferConfig
+from moto import mock_aws
+from osdu_api.providers.ibm.ibm_blob_storage_client import IBMCloudStorageClient
+
+BUCKET = "test-bucket"
+MB = 1024 * 1024
+
+
+class TestIBMCloudStorageClient:
+    """Test for IBM Blob Storage Client against a mocked S3 compatible endpoint."""
+
+    @pytest.fixture()
+    def cos_environ(self, monkeypatch):
+        monkeypatch.setenv("COS_URL", "https://s3.us-east-1.amazonaws.com")
+        monkeypatch.setenv("COS_ACCESS_KEY", "testing")
+        monkeypatch.setenv("COS_SECRET_KEY", "testing")
+        monkeypatch.setenv("COS_REGION", "us-east-1")
+
+    @pytest.fixture()
+    def ibm_blob_storage_client(self, cos_environ):
+        """Build a client with small multipart parts against a mocked endpoint with one bucket."""
+        with mock_aws():
+            boto3.client("s3", region_name="us-east-1", aws_access_key_id="testing",
+                         aws_secret_access_key="testing").create_bucket(Bucket=BUCKET)
+            yield IBMCloudStorageClient(transfer_config=TransferConfig(
+                multipart_threshold=5 * MB, multipart_chunksize=5 * MB, max_concurrency=4))
+
+    def test_client_shared(self, cos_environ, monkeypatch):
+        """Test clients of the same endpoint and credentials share one S3 client.
+        """
+        first = IBMCloudStorageClient()
+        second = IBMCloudStorageClient()
+        monkeypatch.setenv("COS_ACCESS_KEY", "other")
+        other = IBMCloudStorageClient()
+
+        assert first.s3_client is second.s3_client
+        assert other.s3_client is not first.s3_client
+
+    @pytest.mark.skipif(not hasattr(os, "register_at_fork"), reason="fork is not available")
+    def test_clients_reset_in_forked_process(self, cos_environ):
+        """Test a forked process creates its own S3 client, even while the parent holds the lock.
+        """
+        parent_client = IBMCloudStorageClient().s3_client
+        queue = multiprocessing.get_context("fork").SimpleQueue()
+        with IBMCloudStorageClient._s3_clients_lock:
+            process = multiprocessing.get_context("fork").Process(
+                target=lambda: queue.put(IBMCloudStorageClient().s3_client is parent_client), daemon=True)
+            process.start()
+            process.join(timeout=30)
+
+        assert process.exitcode == 0
+        assert queue.get() is False
+
+    def test_upload_and_download_multipart(self, ibm_blob_storage_client: IBMCloudStorageClient):
+        """Test a file bigger than the multipart threshold is uploaded and streamed into the caller's file.
+        """
+        content = os.urandom(12 * MB)
+        uri = f"s3://{BUCKET}/seismic/file.segy"
+
+        ibm_blob_storage_client.upload_file(uri, io.BytesIO(content), "application/octet-stream")
+        file = io.BytesIO()
+        returned_file, content_type = ibm_blob_storage_client.download_to_file(uri, file)
+
+        assert returned_file is file
+        assert file.getvalue() == content
+        assert content_type == "application/octet-stream"
+
+    def test_download_file_as_bytes(self, ibm_blob_storage_client: IBMCloudStorageClient):
+        """Test a file is downloaded as bytes with its content-type.
+        """
+        uri = f"s3://{BUCKET}/manifest.json"
+        ibm_blob_storage_client.upload_file(uri, io.BytesIO(b'{"kind": "osdu"}'), "application/json")
+
+        assert ibm_blob_storage_client.download_file_as_bytes(uri) == (b'{"kind": "osdu"}', "application/json")
+        assert ibm_blob_storage_client.does_file_exist(uri)
+        assert not ibm_blob_storage_client.does_file_exist(f"s3://{BUCKET}/missing.json")
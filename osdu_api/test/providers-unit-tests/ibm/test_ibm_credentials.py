@@ -0,0 +1,91 @@
+#  Licensed Materials - Property of IBM
+#  (c) Copyright IBM Corp. 2020. All Rights Reserved.
+
+import pytest
+from keycloak.exceptions import KeycloakPostError
+from osdu_api.providers.ibm import ibm_credentials
+from osdu_api.providers.ibm.ibm_credentials import IBMCredentials
+
+
+class FakeKeycloakOpenID:
+    """Keycloak client granting numbered tokens."""
+
+    instances = []
+
+    def __init__(self, server_url: str, client_id: str, realm_name: str, client_secret_key: str):
+        assert (server_url, client_id, realm_name, client_secret_key) == \
+            ("https://keycloak", "osdu", "OSDU", "secret")
+        self.grants = []
+        self.expires_in = 300
+        self.refresh_expires_in = 1800
+        self.refresh_fails = False
+        FakeKeycloakOpenID.instances.append(self)
+
+    def _grant(self, grant_type: str) -> dict:
+        self.grants.append(grant_type)
+        index = len(self.grants)
+        return {"access_token": f"access-{index}", "expires_in": self.expires_in,
+                "refresh_token": f"refresh-{index}", "refresh_expires_in": self.refresh_expires_in}
+
+    def token(self, username: str, password: str) -> dict:
+        assert (username, password) == ("user", "password")
+        return self._grant("password")
+
+    def refresh_token(self, refresh_token: str) -> dict:
+        assert refresh_token.startswith("refresh-")
+        if self.refresh_fails:
+            raise KeycloakPostError(error_message="Session not active", response_code=400)
+        return self._grant("refresh_token")
+
+
+class TestIBMCredentials:
+    """Test IBM credentials against a fake Keycloak."""
+
+    @pytest.fixture()
+    def ibm_credentials(self, monkeypatch) -> IBMCredentials:
+        for name, value in (("KEYCLOACK_URI", "https://keycloak"), ("REALM_NAME", "OSDU"), ("client_id", "osdu"),
+                            ("client_secret", "secret"), ("username", "user"), ("password", "password")):
+            monkeypatch.setenv(name, value)
+        FakeKeycloakOpenID.instances = []
+        monkeypatch.setattr(ibm_credentials, "KeycloakOpenID", FakeKeycloakOpenID)
+        return IBMCredentials()
+
+    def test_access_token_reused_until_expiry(self, ibm_credentials: IBMCredentials):
+        """Test a valid access token is returned without a grant."""
+        assert ibm_credentials.refresh_token() == "access-1"
+        assert ibm_credentials._generate_token() == "access-1"
+        assert len(FakeKeycloakOpenID.instances) == 1
+        assert FakeKeycloakOpenID.instances[0].grants == ["password"]
+
+    def test_refresh_replaces_valid_access_token(self, ibm_credentials: IBMCredentials):
+        """Test refreshing a token that is still valid, e.g. after a 401, uses the refresh grant."""
+        assert ibm_credentials.refresh_token() == "access-1"
+        assert ibm_credentials.refresh_token() == "access-2"
+        assert FakeKeycloakOpenID.instances[0].grants == ["password", "refresh_token"]
+
+    def test_refresh_grant_while_refresh_token_valid(self, ibm_credentials: IBMCredentials):
+        """Test an expiring access token is replaced with the refresh grant."""
+        ibm_credentials._get_keycloak_openid().expires_in = 30
+
+        tokens = [ibm_credentials.refresh_token() for _ in range(3)]
+
+        assert tokens == ["access-1", "access-2", "access-3"]
+        assert len(FakeKeycloakOpenID.instances) == 1
+        assert FakeKeycloakOpenID.instances[0].grants == ["password", "refresh_token", "refresh_token"]
+
+    @pytest.mark.parametrize("refresh_expires_in, refresh_fails", [
+        pytest.param(30, False, id="Refresh token expiring"),
+        pytest.param(1800, True, id="Refresh grant rejected"),
+    ])
+    def test_password_grant_fallback(self, ibm_credentials: IBMCredentials, refresh_expires_in: int,
+                                     refresh_fails: bool):
+        """Test the password grant is used when the refresh token cannot be used."""
+        keycloak_openid = ibm_credentials._get_keycloak_openid()
+        keycloak_openid.expires_in = 30
+        keycloak_openid.refresh_expires_in = refresh_expires_in
+        keycloak_openid.refresh_fails = refresh_fails
+
+        ibm_credentials.refresh_token()
+
+        assert ibm_credentials.refresh_token() == "access-2"
+        assert keycloak_openid.grants == ["password", "password"]
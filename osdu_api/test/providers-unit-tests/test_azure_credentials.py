@@ -1,9 +1,12 @@
+import json
 import os
 import sys
+import time
 
 
 import pytest
-from osdu_api.providers.azure.azure_credentials import AzureCredentials
+import responses
+from osdu_api.providers.azure.azure_credentials import IMDS_TIMEOUT, AzureCredentials
 import msal
 from azure import identity
 from azure.keyvault import secrets
@@ -19,13 +22,25 @@ SCOPES = ["someResourceId/.default"]
 
 
 class MockConfidentialClientApplication:
+    instances = 0
+
     def __init__(self, client_id: str, authority: str, client_credential: str):
         assert client_id == CLIENT_ID
         assert client_credential == CLIENT_SECRET
         assert authority == AUTHORITY_URI
+        MockConfidentialClientApplication.instances += 1
+        self.token_cache = msal.TokenCache()
+        self.token_requests = 0
+
+    def acquire_token_silent(self, scopes: list, account):
+        assert scopes == SCOPES
+        assert account is None
+        # like MSAL, tokens of the app itself are only served by acquire_token_for_client
+        return None
 
     def acquire_token_for_client(self, scopes: list):
         assert scopes == SCOPES
+        self.token_requests += 1
         return {"access_token": TOKEN}
 
 
@@ -44,11 +59,14 @@ class MockSecret:
 
 
 class MockSecretClient:
+    requests = 0
+
     def __init__(self, vault_url: str, credential):
         assert vault_url == KEY_VAULT_URL
         assert isinstance(credential, MockDefaultAzureCredentials)
 
     def get_secret(self, key: str):
+        MockSecretClient.requests += 1
         if key == "app-dev-sp-username":
             return MockSecret(CLIENT_ID)
         elif key == "app-dev-sp-password":
@@ -64,6 +82,8 @@ class MockSecretClient:
 class TestAzureCredentials:
     @pytest.fixture()
     def azure_credentials(self, monkeypatch, mock_credentials: bool) -> AzureCredentials:
+        MockConfidentialClientApplication.instances = 0
+        MockSecretClient.requests = 0
         azure_credentials = AzureCredentials()
         if mock_credentials:
             monkeypatch.setattr(azure_credentials, "_client_id", CLIENT_ID)
@@ -106,3 +126,64 @@ class TestAzureCredentials:
         """
         assert azure_credentials.refresh_token() == TOKEN
 
+
+    @pytest.mark.parametrize("mock_credentials", [pytest.param(False)])
+    def test_refresh_token_reuses_app_and_secrets(
+        self,
+        azure_credentials: AzureCredentials,
+        mock_credentials: bool):
+        """
+        Checks the secrets are read and the MSAL app is built once.
+        """
+        tokens = [azure_credentials.refresh_token() for _ in range(3)]
+
+        assert tokens == [TOKEN] * 3
+        assert MockSecretClient.requests == 4
+        assert MockConfidentialClientApplication.instances == 1
+        assert azure_credentials._msal_app.token_requests == 3
+
+    @responses.activate
+    def test_refresh_token_replaces_msal_cached_token(self, monkeypatch):
+        """
+        Checks MSAL's cached token is served until it is the token being replaced, e.g. after a 401.
+        """
+        azure_credentials = AzureCredentials()
+        monkeypatch.setattr(azure_credentials, "_client_id", CLIENT_ID)
+        monkeypatch.setattr(azure_credentials, "_client_secret", CLIENT_SECRET)
+        monkeypatch.setattr(azure_credentials, "_tenant_id", TENANT_ID)
+        monkeypatch.setattr(azure_credentials, "_resource_id", RESOURCE_ID)
+        responses.add(responses.GET, AUTHORITY_URI + "/v2.0/.well-known/openid-configuration", json={
+            "authorization_endpoint": AUTHORITY_URI + "/oauth2/v2.0/authorize",
+            "token_endpoint": AUTHORITY_URI + "/oauth2/v2.0/token",
+            "issuer": AUTHORITY_URI + "/v2.0"})
+        for token in ("token-1", "token-2"):
+            responses.add(responses.POST, AUTHORITY_URI + "/oauth2/v2.0/token",
+                          json={"access_token": token, "expires_in": 3600, "token_type": "Bearer"})
+
+        assert azure_credentials.refresh_token() == "token-1"
+        assert azure_credentials._generate_token() == "token-1"
+        assert azure_credentials.refresh_token() == "token-2"
+        assert [call.request.method for call in responses.calls] == ["GET", "POST", "POST"]
+
+    @responses.activate
+    def test_msi_token_cached_until_expires_on(self, monkeypatch):
+        """
+        Checks the IMDS token is reused until shortly before it expires, or until it is replaced.
+        """
+        monkeypatch.setenv("AIRFLOW_VAR_AZURE_ENABLE_MSI", "true")
+        url = "http://169.254.169.254/metadata/identity/oauth2/token"
+        responses.add(responses.GET, url, body=json.dumps({"access_token": "msi-1",
+                                                           "expires_on": str(int(time.time()) + 30)}))
+        for token in ("msi-2", "msi-3"):
+            responses.add(responses.GET, url, body=json.dumps({"access_token": token,
+                                                               "expires_on": str(int(time.time()) + 3600)}))
+        azure_credentials = AzureCredentials()
+
+        # the first token expires within the refresh margin
+        assert azure_credentials.refresh_token() == "msi-1"
+        assert azure_credentials.refresh_token() == "msi-2"
+        assert azure_credentials._generate_token() == "msi-2"
+        # a refresh replaces the current token, e.g. after a 401
+        assert azure_credentials.refresh_token() == "msi-3"
+        assert len(responses.calls) == 3
+        assert responses.calls[0].request.req_kwargs["timeout"] == IMDS_TIMEOUT
@@ -0,0 +1,116 @@
+#  Copyright 2021 Google LLC
+#  Copyright 2021 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import io
+import threading
+
+from osdu_api.providers.types import BlobStorageClient
+
+EXISTING = {f"fake://bucket/dir/file-{index}" for index in range(0, 20, 2)}
+
+
+class FakeBlobStorageClient(BlobStorageClient):
+    """Client over a dict of blobs recording the calls."""
+
+    def __init__(self):
+        self.blobs = {uri: uri.encode() for uri in EXISTING}
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def _record(self, *call):
+        with self._lock:
+            self.calls.append(call)
+
+    def download_to_file(self, uri, file):
+        self._record("download", uri)
+        file.write(self.blobs[uri])
+        return file, "text/plain"
+
+    def download_file_as_bytes(self, uri):
+        pass
+
+    def upload_file(self, uri, file, content_type):
+        self._record("upload", uri)
+        if uri.endswith("forbidden"):
+            raise PermissionError(uri)
+        self.blobs[uri] = file.read()
+
+    def does_file_exist(self, uri):
+        self._record("exists", uri)
+        return uri in self.blobs
+
+    def _list_uris(self, directory):
+        self._record("list", directory)
+        return [uri for uri in self.blobs if uri.startswith(directory) and "/" not in uri[len(directory):]]
+
+
+class TestBatchBlobOperations:
+    """Test batch operations of BlobStorageClient."""
+
+    def test_download_many(self):
+        """Test downloads return per item results in order and report errors.
+        """
+        client = FakeBlobStorageClient()
+        uris = ["fake://bucket/dir/file-0", "fake://bucket/dir/missing", "fake://bucket/dir/file-2"]
+        progress = []
+
+        results = client.download_many([(uri, io.BytesIO()) for uri in uris], max_workers=2,
+                                       progress_callback=lambda done, total: progress.append((done, total)))
+
+        assert [result.uri for result in results] == uris
+        assert [result.ok for result in results] == [True, False, True]
+        assert isinstance(results[1].error, KeyError)
+        assert results[2].result[0].getvalue() == b"fake://bucket/dir/file-2"
+        assert progress == [(1, 3), (2, 3), (3, 3)]
+
+    def test_upload_many(self):
+        """Test uploads continue after a failed one.
+        """
+        client = FakeBlobStorageClient()
+        items = [(f"fake://bucket/out/{name}", io.BytesIO(name.encode()), "text/plain")
+                 for name in ("a", "forbidden", "b")]
+
+        results = client.upload_many(items)
+
+        assert [result.ok for result in results] == [True, False, True]
+        assert client.blobs["fake://bucket/out/b"] == b"b"
+
+    def test_exists_many_lists_shared_directory(self):
+        """Test URIs sharing a directory are verified by one listing.
+        """
+        client = FakeBlobStorageClient()
+        uris = [f"fake://bucket/dir/file-{index}" for index in range(10)] + ["fake://bucket/other/file"]
+        progress = []
+
+        results = client.exists_many(uris, progress_callback=lambda done, total: progress.append(done))
+
+        assert [result.result for result in results] == [index % 2 == 0 for index in range(10)] + [False]
+        assert sorted(client.calls) == [("exists", "fake://bucket/other/file"), ("list", "fake://bucket/dir/")]
+        assert len(progress) == 2 and progress[-1] == 11
+
+    def test_exists_many_without_listing(self):
+        """Test every URI is verified when the client cannot list.
+        """
+        class NoListingClient(FakeBlobStorageClient):
+            _list_uris = BlobStorageClient._list_uris
+
+        client = NoListingClient()
+        uris = [f"fake://bucket/dir/file-{index}" for index in range(10)]
+
+        results = client.exists_many(uris)
+
+        assert [result.result for result in results] == [index % 2 == 0 for index in range(10)]
+        assert len(client.calls) == 10
+        assert all(call[0] == "exists" for call in client.calls)
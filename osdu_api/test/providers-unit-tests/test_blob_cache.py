@@ -0,0 +1,209 @@
+#  Copyright 2021 Google LLC
+#  Copyright 2021 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import io
+import multiprocessing
+import os
+import subprocess
+import sys
+
+import pytest
+from osdu_api.providers.blob_cache import CachedBlobStorageClient
+from osdu_api.providers.blob_storage import get_client
+from osdu_api.providers.checksum import MD5, compute_checksum
+from osdu_api.providers.file.file_blob_storage_client import FileBlobStorageClient
+from osdu_api.providers.types import BlobMetadata, DownloadResult
+
+
+class CountingFileBlobStorageClient(FileBlobStorageClient):
+    """File client logging each download to a file, so downloads of other processes are counted."""
+
+    def __init__(self, log_path: str):
+        self.log_path = log_path
+
+    def download_to_file(self, uri, file):
+        with open(self.log_path, "a") as log:
+            log.write(uri + "\n")
+        return super().download_to_file(uri, file)
+
+    @property
+    def downloads(self) -> list:
+        if not os.path.exists(self.log_path):
+            return []
+        with open(self.log_path) as log:
+            return log.read().splitlines()
+
+
+class ChecksumFileBlobStorageClient(CountingFileBlobStorageClient):
+    """Counting file client returning the MD5 of the downloaded content, as clients verifying checksums do."""
+
+    def download_to_file(self, uri, file):
+        result = super().download_to_file(uri, file)
+        file.seek(0)
+        return DownloadResult(result[0], result[1], compute_checksum(MD5, file.read()))
+
+
+def _download_in_process(cache_dir: str, log_path: str, uri: str, queue):
+    client = CachedBlobStorageClient(CountingFileBlobStorageClient(log_path), cache_dir)
+    queue.put(client.download_file_as_bytes(uri))
+
+
+class TestCachedBlobStorageClient:
+    """Test the on-disk cache of blob downloads."""
+
+    @pytest.fixture()
+    def file_client(self, tmp_path) -> CountingFileBlobStorageClient:
+        return CountingFileBlobStorageClient(str(tmp_path / "downloads.log"))
+
+    @pytest.fixture()
+    def blobs(self, tmp_path):
+        (tmp_path / "blobs").mkdir()
+        return tmp_path / "blobs"
+
+    def test_cached_download(self, file_client, blobs, tmp_path):
+        """Test a blob is downloaded once and then served from the cache.
+        """
+        uri = (blobs / "schema.json").as_uri()
+        file_client.upload_file(uri, io.BytesIO(b'{"type": "object"}'), "application/json")
+        client = CachedBlobStorageClient(file_client, str(tmp_path / "cache"))
+
+        first = client.download_file_as_bytes(uri)
+        second = client.download_file_as_bytes(uri)
+        file, content_type = client.download_to_file(uri, io.BytesIO())
+        client.download_to_file(uri, str(tmp_path / "copy.json"))
+
+        assert first == second == (b'{"type": "object"}', "application/json")
+        assert file.getvalue() == b'{"type": "object"}'
+        assert content_type == "application/json"
+        assert (tmp_path / "copy.json").read_bytes() == b'{"type": "object"}'
+        assert file_client.downloads == [uri]
+
+    def test_cached_download_keeps_checksum(self, blobs, tmp_path):
+        """Test the checksum returned by the wrapped client is returned again from the cache.
+        """
+        file_client = ChecksumFileBlobStorageClient(str(tmp_path / "downloads.log"))
+        uri = (blobs / "schema.json").as_uri()
+        file_client.upload_file(uri, io.BytesIO(b'{"type": "object"}'), "application/json")
+        client = CachedBlobStorageClient(file_client, str(tmp_path / "cache"))
+        checksum = compute_checksum(MD5, b'{"type": "object"}')
+
+        first = client.download_file_as_bytes(uri)
+        second = client.download_file_as_bytes(uri)
+        third = client.download_to_file(uri, io.BytesIO())
+
+        assert first.checksum == second.checksum == third.checksum == checksum
+        assert second == (b'{"type": "object"}', "application/json")
+        assert file_client.downloads == [uri]
+
+    def test_changed_blob_downloaded_again(self, file_client, blobs, tmp_path):
+        """Test a blob whose ETag changed is not served from the cache.
+        """
+        uri = (blobs / "mapping.csv").as_uri()
+        file_client.upload_file(uri, io.BytesIO(b"a,b\n"), "text/csv")
+        client = CachedBlobStorageClient(file_client, str(tmp_path / "cache"))
+        client.download_file_as_bytes(uri)
+
+        file_client.upload_file(uri, io.BytesIO(b"a,b\n1,2\n"), "text/csv")
+
+        assert client.download_file_as_bytes(uri) == (b"a,b\n1,2\n", "text/csv")
+        assert client.download_file_as_bytes(uri) == (b"a,b\n1,2\n", "text/csv")
+        assert len(file_client.downloads) == 2
+
+    def test_least_recently_used_evicted(self, file_client, blobs, tmp_path):
+        """Test the cache is kept under its size by evicting the least recently used blobs.
+        """
+        uris = [(blobs / f"file-{index}").as_uri() for index in range(3)]
+        for uri in uris:
+            file_client.upload_file(uri, io.BytesIO(os.urandom(400)), None)
+        client = CachedBlobStorageClient(file_client, str(tmp_path / "cache"))
+        client.download_file_as_bytes(uris[0])
+        entry_size = os.path.getsize(client._get_entry_path(uris[0]))
+        # room for two entries
+        client = CachedBlobStorageClient(file_client, str(tmp_path / "cache"), max_size=2 * entry_size + 50)
+
+        client.download_file_as_bytes(uris[1])
+        os.utime(client._get_entry_path(uris[0]), (0, 0))
+        os.utime(client._get_entry_path(uris[1]), (1, 1))
+        client.download_file_as_bytes(uris[0])
+        client.download_file_as_bytes(uris[2])
+
+        assert not os.path.exists(client._get_entry_path(uris[1]))
+        assert os.path.exists(client._get_entry_path(uris[0]))
+        client.download_file_as_bytes(uris[0])
+        assert file_client.downloads == [uris[0], uris[1], uris[2]]
+
+    def test_blob_without_version_not_cached(self, file_client, blobs, tmp_path, monkeypatch):
+        """Test blobs without ETag or generation are always downloaded.
+        """
+        uri = (blobs / "file").as_uri()
+        file_client.upload_file(uri, io.BytesIO(b"content"), None)
+        monkeypatch.setattr(file_client, "get_metadata", lambda uri: BlobMetadata(7))
+        client = CachedBlobStorageClient(file_client, str(tmp_path / "cache"))
+
+        client.download_to_file(uri, io.BytesIO())
+        client.download_to_file(uri, io.BytesIO())
+
+        assert len(file_client.downloads) == 2
+
+    def test_corrupted_entry_downloaded_again(self, file_client, blobs, tmp_path):
+        """Test a truncated cache entry is replaced.
+        """
+        uri = (blobs / "file").as_uri()
+        file_client.upload_file(uri, io.BytesIO(b"content"), None)
+        client = CachedBlobStorageClient(file_client, str(tmp_path / "cache"))
+        client.download_file_as_bytes(uri)
+        with open(client._get_entry_path(uri), "r+b") as entry:
+            entry.truncate(10)
+
+        assert client.download_file_as_bytes(uri)[0] == b"content"
+        assert len(file_client.downloads) == 2
+
+    def test_processes_share_cache(self, file_client, blobs, tmp_path):
+        """Test concurrent processes download a blob once.
+        """
+        uri = (blobs / "reference.json").as_uri()
+        file_client.upload_file(uri, io.BytesIO(os.urandom(100000)), "application/json")
+        context = multiprocessing.get_context("fork")
+        queue = context.Queue()
+        processes = [context.Process(target=_download_in_process,
+                                     args=(str(tmp_path / "cache"), file_client.log_path, uri, queue))
+                     for _ in range(4)]
+
+        for process in processes:
+            process.start()
+        results = [queue.get(timeout=30) for _ in processes]
+        for process in processes:
+            process.join()
+
+        assert all(result == file_client.download_file_as_bytes(uri) for result in results)
+        assert file_client.downloads == [uri]
+
+    def test_get_client_with_cache_dir(self, tmp_path, monkeypatch):
+        """Test the factory function wraps clients when a cache directory is configured.
+        """
+        monkeypatch.setenv("BLOB_STORAGE_CACHE_DIR", str(tmp_path / "cache"))
+
+        client = get_client("file")
+
+        assert isinstance(client, CachedBlobStorageClient)
+        assert isinstance(client.client, FileBlobStorageClient)
+        assert client.cache_dir == str(tmp_path / "cache")
+
+    def test_get_client_importable_without_fcntl(self):
+        """Test clients are available without the file locks of the cache, e.g. on Windows.
+        """
+        code = "import sys; sys.modules['fcntl'] = None; import osdu_api.providers.blob_storage"
+
+        assert subprocess.run([sys.executable, "-c", code]).returncode == 0
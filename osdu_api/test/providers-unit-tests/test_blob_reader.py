@@ -0,0 +1,108 @@
+#  Copyright 2021 Google LLC
+#  Copyright 2021 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import io
+import os
+import threading
+
+import pytest
+from osdu_api.providers.blob_reader import BlobReader
+from osdu_api.providers.types import BlobMetadata, BlobStorageClient
+
+CONTENT = os.urandom(10000)
+
+
+class InMemoryBlobStorageClient(BlobStorageClient):
+    """Client serving CONTENT at every URI and recording the requested ranges."""
+
+    def __init__(self):
+        self.ranges = []
+        self._lock = threading.Lock()
+
+    def download_to_file(self, uri, file):
+        pass
+
+    def download_file_as_bytes(self, uri):
+        pass
+
+    def upload_file(self, uri, file, content_type):
+        pass
+
+    def does_file_exist(self, uri):
+        pass
+
+    def get_metadata(self, uri):
+        return BlobMetadata(len(CONTENT), "application/octet-stream")
+
+    def download_range(self, uri, start, end):
+        with self._lock:
+            self.ranges.append((start, end))
+        return CONTENT[start:end + 1]
+
+
+class TestBlobReader:
+    """Test reading blobs through ranged downloads."""
+
+    def test_open_read_reads_whole_blob(self):
+        """Test sequential reads return the blob and fetch every block once.
+        """
+        client = InMemoryBlobStorageClient()
+
+        with client.open_read("fake://bucket/blob", block_size=1024, read_ahead=2) as reader:
+            content = reader.read()
+
+        assert content == CONTENT
+        assert sorted(client.ranges) == [(start, min(start + 1024, len(CONTENT)) - 1)
+                                         for start in range(0, len(CONTENT), 1024)]
+
+    def test_open_read_seek_downloads_needed_blocks_only(self):
+        """Test a read after seeking only downloads the block holding the bytes.
+        """
+        client = InMemoryBlobStorageClient()
+
+        with client.open_read("fake://bucket/blob", block_size=1000, read_ahead=2) as reader:
+            reader.seek(3200)
+            header = reader.read(400)
+            reader.seek(-10, io.SEEK_END)
+            trailer = reader.read()
+
+        assert header == CONTENT[3200:3600]
+        assert trailer == CONTENT[-10:]
+        assert client.ranges == [(3000, 3999), (9000, 9999)]
+
+    def test_reads_spanning_blocks(self):
+        """Test reads across block boundaries without read ahead.
+        """
+        client = InMemoryBlobStorageClient()
+        reader = io.BufferedReader(BlobReader(lambda start, end: client.download_range("", start, end),
+                                              len(CONTENT), block_size=300, read_ahead=0), buffer_size=300)
+
+        reader.seek(250)
+        assert reader.read(700) == CONTENT[250:950]
+        assert reader.tell() == 950
+        assert reader.read(0) == b""
+        reader.close()
+
+    def test_not_implemented_by_default(self):
+        """Test clients without range support raise NotImplementedError.
+        """
+        class WholeBlobClient(InMemoryBlobStorageClient):
+            get_metadata = BlobStorageClient.get_metadata
+            download_range = BlobStorageClient.download_range
+
+        with pytest.raises(NotImplementedError):
+            WholeBlobClient().download_range("fake://bucket/blob", 0, 10)
+        with pytest.raises(NotImplementedError):
+            WholeBlobClient().open_read("fake://bucket/blob")
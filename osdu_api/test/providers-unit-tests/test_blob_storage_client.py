@@ -42,6 +42,7 @@ class TestGetBlobStorageClient:
 
     @pytest.mark.parametrize("provider, instance_type", [
         pytest.param("gcp", GoogleCloudStorageClient),
+        pytest.param("azure", AzureCloudStorageClient),
     ])
     def test_get_client(self, monkeypatch, mock_os_environ, provider: str,
                         instance_type: BlobStorageClient):
@@ -0,0 +1,113 @@
+#  Copyright 2021 Google LLC
+#  Copyright 2021 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import hashlib
+import io
+import os
+
+import pytest
+from osdu_api.providers.checksum import (CRC32C, MD5, Checksum, ETagHasher, HashingReader, HashingWriter,
+                                         compute_checksum, new_hasher, verify_checksum)
+from osdu_api.providers.exceptions import ChecksumMismatchError
+
+CONTENT = os.urandom(2500)
+
+
+class TestChecksum:
+    """Test checksums computed while bytes stream."""
+
+    def test_crc32c(self):
+        """Test the CRC32C is the one of RFC 3720 test vectors.
+        """
+        assert compute_checksum(CRC32C, b"\x00" * 32) == Checksum(CRC32C, "8a9136aa")
+
+    def test_verify_checksum(self):
+        """Test different checksums raise, unknown stored checksums are not verified.
+        """
+        verify_checksum("gs://bucket/file", None, Checksum(MD5, "00"))
+        verify_checksum("gs://bucket/file", Checksum(MD5, "00"), Checksum(MD5, "00"))
+        with pytest.raises(ChecksumMismatchError):
+            verify_checksum("gs://bucket/file", Checksum(MD5, "00"), Checksum(MD5, "01"))
+
+    @pytest.mark.parametrize("part_size", [
+        pytest.param(1000, id="last part shorter"),
+        pytest.param(500, id="parts of equal size"),
+    ])
+    def test_etag_multipart(self, part_size: int):
+        """Test the ETag of a multipart upload is computed from the MD5 of its parts.
+        """
+        parts = [CONTENT[start:start + part_size] for start in range(0, len(CONTENT), part_size)]
+        etag = hashlib.md5(b"".join(hashlib.md5(part).digest() for part in parts)).hexdigest()
+        hasher = ETagHasher(part_size)
+        for start in range(0, len(CONTENT), 300):
+            hasher.update(CONTENT[start:start + 300])
+
+        hasher.verify_etag("s3://bucket/file", f'"{etag}-{len(parts)}"')
+        # uploaded with another part size
+        hasher.verify_etag("s3://bucket/file", f'"{etag}-{len(parts) + 1}"')
+        with pytest.raises(ChecksumMismatchError):
+            hasher.verify_etag("s3://bucket/file", f'"{"0" * 32}-{len(parts)}"')
+        assert hasher.hexdigest() == hashlib.md5(CONTENT).hexdigest()
+
+    def test_etag_single_part(self):
+        """Test the ETag of an object uploaded in one request is its MD5, other ETags are ignored.
+        """
+        hasher = ETagHasher(1000)
+        hasher.update(b"content")
+
+        hasher.verify_etag("s3://bucket/file", f'"{hashlib.md5(b"content").hexdigest()}"')
+        hasher.verify_etag("s3://bucket/file", "opaque")
+        with pytest.raises(ChecksumMismatchError):
+            hasher.verify_etag("s3://bucket/file", f'"{hashlib.md5(b"other").hexdigest()}"')
+
+    def test_reader_hashes_bytes_read_again_once(self):
+        """Test bytes read again after seeking back, e.g. by a retry, are hashed once.
+        """
+        file = io.BytesIO(b"header" + CONTENT)
+        file.seek(6)
+        reader = HashingReader(file, new_hasher(MD5))
+
+        reader.read(1000)
+        reader.seek(500)
+        reader.read(700)
+        reader.seek(6)
+        content = reader.read()
+
+        assert content == CONTENT
+        assert reader.valid
+        assert reader.hasher.hexdigest() == hashlib.md5(CONTENT).hexdigest()
+
+    def test_reader_invalid_after_skipping_bytes(self):
+        """Test the checksum is invalid when bytes were skipped.
+        """
+        reader = HashingReader(io.BytesIO(CONTENT), new_hasher(CRC32C))
+
+        reader.seek(100)
+        reader.read()
+
+        assert not reader.valid
+
+    def test_writer(self):
+        """Test written bytes are hashed and passed on to a non seekable file.
+        """
+        file = io.BytesIO()
+        writer = HashingWriter(file, new_hasher(CRC32C))
+
+        writer.write(CONTENT[:1000])
+        writer.write(memoryview(CONTENT)[1000:])
+
+        assert not writer.seekable()
+        assert file.getvalue() == CONTENT
+        assert writer.hasher.hexdigest() == compute_checksum(CRC32C, CONTENT).value
@@ -0,0 +1,163 @@
+#  Copyright 2021 Google LLC
+#  Copyright 2021 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import gzip
+import io
+import os
+
+import pytest
+from osdu_api.providers.blob_storage import get_client
+from osdu_api.providers.codec import (CompressingBlobStorageClient, CompressingReader, DecompressingWriter,
+                                      GzipCodec)
+from osdu_api.providers.file.file_blob_storage_client import FileBlobStorageClient
+
+CONTENT = b'{"kind": "osdu:wks:dataset--File.Generic:1.0.0"}\n' * 50000
+
+
+class TestCodec:
+    """Test the streaming compression and decompression of files."""
+
+    def test_compressing_reader(self):
+        """Check the reader returns the gzip content in small reads."""
+        reader = CompressingReader(io.BytesIO(CONTENT), GzipCodec(), chunk_size=4096)
+        compressed = b"".join(iter(lambda: reader.read(1000), b""))
+        assert reader.tell() == len(compressed)
+        assert len(compressed) < len(CONTENT)
+        assert gzip.decompress(compressed) == CONTENT
+
+    def test_decompressing_writer_concatenated_members(self):
+        """Check appended gzip files are all decompressed."""
+        compressed = gzip.compress(b"first ") + gzip.compress(b"second")
+        file = io.BytesIO()
+        writer = DecompressingWriter(file, (GzipCodec(),))
+        for offset in range(0, len(compressed), 3):
+            writer.write(compressed[offset:offset + 3])
+        writer.finish()
+        assert file.getvalue() == b"first second"
+
+    @pytest.mark.parametrize("content", [b"", b"a", CONTENT])
+    def test_decompressing_writer_uncompressed(self, content):
+        """Check content without magic bytes is written as it is."""
+        file = io.BytesIO()
+        writer = DecompressingWriter(file, (GzipCodec(),))
+        writer.write(content)
+        writer.finish()
+        assert file.getvalue() == content
+
+    def test_decompressing_writer_truncated(self):
+        """Check truncated content raises EOFError."""
+        writer = DecompressingWriter(io.BytesIO(), (GzipCodec(),))
+        writer.write(gzip.compress(CONTENT)[:-100])
+        with pytest.raises(EOFError):
+            writer.finish()
+
+
+class TestCompressingBlobStorageClient:
+    """Test the compression of blobs with the local file client."""
+
+    @pytest.fixture()
+    def client(self) -> CompressingBlobStorageClient:
+        return CompressingBlobStorageClient(FileBlobStorageClient())
+
+    def test_upload_compressed(self, client, tmp_path):
+        """Check compressed content types are stored with gzip and downloaded decompressed."""
+        path = tmp_path / "manifest.json"
+        uri = path.as_uri()
+        client.upload_file(uri, io.BytesIO(CONTENT), "application/json; charset=utf-8")
+
+        metadata = client.get_metadata(uri)
+        assert metadata.content_encoding == "gzip"
+        assert metadata.size == os.path.getsize(path) < len(CONTENT)
+        with open(path, "rb") as stored:
+            assert gzip.decompress(stored.read()) == CONTENT
+
+        file = io.BytesIO()
+        result = client.download_to_file(uri, file)
+        assert file.getvalue() == CONTENT
+        assert result[1] == "application/json; charset=utf-8"
+        assert client.download_file_as_bytes(uri)[0] == CONTENT
+
+    def test_upload_not_compressed_content_type(self, client, tmp_path):
+        """Check other content types are stored as they are."""
+        path = tmp_path / "image.png"
+        uri = path.as_uri()
+        client.upload_file(uri, io.BytesIO(CONTENT), "image/png")
+
+        assert client.get_metadata(uri).content_encoding is None
+        with open(path, "rb") as stored:
+            assert stored.read() == CONTENT
+        assert client.download_file_as_bytes(uri) == (CONTENT, "image/png")
+
+    def test_upload_already_encoded(self, client, tmp_path):
+        """Check files with a content-encoding are not compressed again."""
+        path = tmp_path / "data.csv"
+        uri = path.as_uri()
+        client.upload_file(uri, io.BytesIO(gzip.compress(CONTENT)), "text/csv", content_encoding="gzip")
+
+        with open(path, "rb") as stored:
+            assert gzip.decompress(stored.read()) == CONTENT
+        assert client.download_file_as_bytes(uri)[0] == CONTENT
+
+    def test_download_transcoded(self, client, tmp_path, monkeypatch):
+        """Check content decompressed by the storage while serving it is returned as it is."""
+        path = tmp_path / "manifest.json"
+        uri = path.as_uri()
+        client.upload_file(uri, io.BytesIO(CONTENT), "application/json")
+        # the bytes are served decompressed while the metadata tells gzip, like GCS transcoding
+        monkeypatch.setattr(FileBlobStorageClient, "download_file_as_bytes",
+                            lambda self, uri: (CONTENT, "application/json"))
+        monkeypatch.setattr(FileBlobStorageClient, "download_to_file",
+                            lambda self, uri, file: (file.write(CONTENT), "application/json"))
+
+        file = io.BytesIO()
+        client.download_to_file(uri, file)
+        assert file.getvalue() == CONTENT
+        assert client.download_file_as_bytes(uri)[0] == CONTENT
+
+    def test_get_client_with_cache(self, tmp_path):
+        """Check the cache of get_client holds the compressed bytes."""
+        client = get_client("file", cache_dir=str(tmp_path / "cache"), compression="gzip")
+        path = tmp_path / "manifest.json"
+        uri = path.as_uri()
+        client.upload_file(uri, io.BytesIO(CONTENT), "application/json")
+
+        assert client.download_file_as_bytes(uri)[0] == CONTENT
+        entries = list((tmp_path / "cache").glob("*.blob"))
+        assert len(entries) == 1
+        assert entries[0].stat().st_size < len(CONTENT)
+        file = io.BytesIO()
+        client.download_to_file(uri, file)
+        assert file.getvalue() == CONTENT
+
+    def test_get_client_with_cache_transcoded(self, tmp_path, monkeypatch):
+        """Check blobs served decompressed by the storage, like GCS transcoding, are cached."""
+        client = get_client("file", cache_dir=str(tmp_path / "cache"), compression="gzip")
+        uri = (tmp_path / "manifest.json").as_uri()
+        client.upload_file(uri, io.BytesIO(CONTENT), "application/json")
+        downloads = []
+
+        def download_to_file(self, uri, file):
+            downloads.append(uri)
+            file.write(CONTENT)
+            return file, "application/json"
+
+        monkeypatch.setattr(FileBlobStorageClient, "download_to_file", download_to_file)
+
+        assert client.download_file_as_bytes(uri)[0] == CONTENT
+        file = io.BytesIO()
+        client.download_to_file(uri, file)
+        assert file.getvalue() == CONTENT
+        assert downloads == [uri]
+        assert len(list((tmp_path / "cache").glob("*.blob"))) == 1
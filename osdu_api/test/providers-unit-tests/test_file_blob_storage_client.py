@@ -0,0 +1,122 @@
+#  Copyright 2021 Google LLC
+#  Copyright 2021 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import io
+import os
+
+import pytest
+from osdu_api.providers.blob_storage import get_client
+from osdu_api.providers.exceptions import FileObjectURIError
+from osdu_api.providers.factory import ProvidersFactory
+from osdu_api.providers.file.file_blob_storage_client import FileBlobStorageClient
+
+
+class TestFileBlobStorageClient:
+    """Test for local filesystem Blob Storage Client."""
+
+    @pytest.fixture()
+    def file_client(self) -> FileBlobStorageClient:
+        return FileBlobStorageClient()
+
+    def test_registered(self):
+        """Test the file provider is available through the factory.
+        """
+        assert isinstance(get_client("file"), FileBlobStorageClient)
+        assert ProvidersFactory.blob_storage_registry.get("file") is FileBlobStorageClient
+
+    @pytest.mark.parametrize("uri", [
+        pytest.param("gs://bucket/file"),
+        pytest.param("file://remote-host/file"),
+        pytest.param("/tmp/file"),
+    ])
+    def test_invalid_uri(self, file_client: FileBlobStorageClient, uri: str):
+        """Test non local file URIs are rejected.
+        """
+        with pytest.raises(FileObjectURIError):
+            file_client.does_file_exist(uri)
+
+    def test_upload_and_download(self, file_client: FileBlobStorageClient, tmp_path):
+        """Test a file uploaded to a new directory is downloaded with its content-type.
+        """
+        uri = (tmp_path / "logs" / "well 1.las").as_uri()
+
+        file_client.upload_file(uri, io.BytesIO(b"~Version\n~Well\n"), "text/plain")
+
+        assert file_client.does_file_exist(uri)
+        assert file_client.download_file_as_bytes(uri)[0] == b"~Version\n~Well\n"
+        file = io.BytesIO()
+        assert file_client.download_to_file(uri, file)[0] is file
+        assert file.getvalue() == b"~Version\n~Well\n"
+        assert file_client.get_metadata(uri).size == 15
+        assert os.listdir(tmp_path / "logs") == ["well 1.las"]
+
+    def test_upload_replaces_atomically(self, file_client: FileBlobStorageClient, tmp_path):
+        """Test a failed upload leaves the existing file untouched and no temporary file.
+        """
+        uri = (tmp_path / "manifest.json").as_uri()
+        file_client.upload_file(uri, io.BytesIO(b"{}"), "application/json")
+        etag = file_client.get_metadata(uri).etag
+
+        class FailingFile(io.BytesIO):
+            def read(self, *args):
+                raise IOError("stream interrupted")
+
+        with pytest.raises(IOError):
+            file_client.upload_file(uri, FailingFile(), "application/json")
+        assert os.listdir(tmp_path) == ["manifest.json"]
+        assert file_client.download_file_as_bytes(uri)[0] == b"{}"
+
+        file_client.upload_file(uri, io.BytesIO(b'{"kind": "osdu"}'), "application/json")
+        assert file_client.get_metadata(uri).etag != etag
+
+    def test_ranges(self, file_client: FileBlobStorageClient, tmp_path):
+        """Test range reads, including empty files.
+        """
+        content = os.urandom(5000)
+        uri = (tmp_path / "volume.segy").as_uri()
+        empty_uri = (tmp_path / "empty").as_uri()
+        file_client.upload_file(uri, io.BytesIO(content), None)
+        file_client.upload_file(empty_uri, io.BytesIO(), None)
+
+        assert file_client.download_range(uri, 3200, 3599) == content[3200:3600]
+        assert file_client.download_range(uri, 4990, 9999) == content[4990:]
+        assert file_client.download_range(empty_uri, 0, 10) == b""
+        assert file_client.download_file_as_bytes(empty_uri)[0] == b""
+        with file_client.open_read(uri) as reader:
+            reader.seek(100)
+            assert reader.read(10) == content[100:110]
+
+    def test_exists_many(self, file_client: FileBlobStorageClient, tmp_path):
+        """Test existence of many files is verified by listing their directory.
+        """
+        uris = [(tmp_path / f"file-{index}").as_uri() for index in range(10)]
+        file_client.upload_many([(uri, io.BytesIO(b""), None) for uri in uris[:5]])
+
+        results = file_client.exists_many(uris + [(tmp_path / "missing" / "file").as_uri()])
+
+        assert [result.result for result in results] == [True] * 5 + [False] * 6
+
+    def test_exists_many_special_characters(self, file_client: FileBlobStorageClient, tmp_path):
+        """Test files whose name has a space or % are found when listing, in quoted and unquoted URIs.
+        """
+        names = ["well 1.las", "100%.las"] + [f"file-{index}" for index in range(8)]
+        for name in names:
+            (tmp_path / name).write_bytes(b"")
+        uris = [(tmp_path / name).as_uri() for name in names]
+        unquoted_uris = [f"file://{tmp_path}/{name}" for name in names[:2]]
+
+        results = file_client.exists_many(uris + unquoted_uris + [(tmp_path / "missing 1.las").as_uri()])
+
+        assert [result.result for result in results] == [True] * 12 + [False]
@@ -0,0 +1,145 @@
+#  Copyright 2021 Google LLC
+#  Copyright 2021 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import multiprocessing
+import os
+import threading
+import time
+
+import pytest
+from osdu_api.providers.factory import ProvidersFactory
+from osdu_api.providers.types import BaseCredentials, BlobStorageClient
+
+FAKE_PROVIDER = "fake-cached"
+
+
+@ProvidersFactory.register(FAKE_PROVIDER)
+class FakeBlobStorageClient(BlobStorageClient):
+    """Blob storage client counting its instances."""
+    created = 0
+
+    def __init__(self, bucket: str = None, options: dict = None):
+        time.sleep(0.01)
+        FakeBlobStorageClient.created += 1
+        self.bucket = bucket
+
+    def download_to_file(self, uri, file):
+        pass
+
+    def download_file_as_bytes(self, uri):
+        pass
+
+    def upload_file(self, uri, file, content_type):
+        pass
+
+    def does_file_exist(self, uri):
+        pass
+
+
+@ProvidersFactory.register(FAKE_PROVIDER)
+class FakeCredentials(BaseCredentials):
+    """Credentials without token."""
+
+    def refresh_token(self):
+        return "token"
+
+    @property
+    def access_token(self):
+        return "token"
+
+
+class TestProvidersFactoryCache:
+    """Test instances are cached by the factory."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        ProvidersFactory.invalidate()
+        yield
+        ProvidersFactory.invalidate()
+
+    def test_instances_cached_by_arguments(self):
+        """Test the same arguments give the same instance.
+        """
+        client = ProvidersFactory.get_blob_storage_client(FAKE_PROVIDER, "bucket")
+
+        assert ProvidersFactory.get_blob_storage_client(FAKE_PROVIDER, "bucket") is client
+        assert ProvidersFactory.get_blob_storage_client(FAKE_PROVIDER, "other") is not client
+        assert ProvidersFactory.get_blob_storage_client(FAKE_PROVIDER, "bucket", use_cache=False) is not client
+        assert ProvidersFactory.get_credentials(FAKE_PROVIDER) is ProvidersFactory.get_credentials(FAKE_PROVIDER)
+
+    def test_unhashable_arguments_not_cached(self):
+        """Test arguments that cannot be a cache key give new instances.
+        """
+        client = ProvidersFactory.get_blob_storage_client(FAKE_PROVIDER, options={"retries": 3})
+
+        assert ProvidersFactory.get_blob_storage_client(FAKE_PROVIDER, options={"retries": 3}) is not client
+
+    def test_invalidate_provider(self):
+        """Test invalidated instances are created again.
+        """
+        client = ProvidersFactory.get_blob_storage_client(FAKE_PROVIDER)
+        credentials = ProvidersFactory.get_credentials(FAKE_PROVIDER)
+
+        ProvidersFactory.invalidate("other")
+        assert ProvidersFactory.get_blob_storage_client(FAKE_PROVIDER) is client
+
+        ProvidersFactory.invalidate(FAKE_PROVIDER)
+        assert ProvidersFactory.get_blob_storage_client(FAKE_PROVIDER) is not client
+        assert ProvidersFactory.get_credentials(FAKE_PROVIDER) is not credentials
+
+    def test_cache_dropped_in_other_process(self, monkeypatch):
+        """Test instances inherited from a parent process are not reused.
+        """
+        client = ProvidersFactory.get_blob_storage_client(FAKE_PROVIDER)
+        monkeypatch.setattr(ProvidersFactory, "_instances_pid", -1)
+
+        assert ProvidersFactory.get_blob_storage_client(FAKE_PROVIDER) is not client
+
+    @pytest.mark.skipif(not hasattr(os, "register_at_fork"), reason="fork is not available")
+    def test_boto_clients_reset_in_forked_process(self, monkeypatch):
+        """Test a forked process creates its own boto clients, even while the parent holds the lock.
+        """
+        boto_client_factory = pytest.importorskip("osdu_api.providers.aws.boto_client_factory")
+        monkeypatch.delenv("USE_AIRFLOW", raising=False)
+        factory = boto_client_factory.BotoClientFactory()
+        parent_client = factory.get_boto_client("s3", "us-east-1")
+        queue = multiprocessing.get_context("fork").SimpleQueue()
+        with boto_client_factory._lock:
+            process = multiprocessing.get_context("fork").Process(
+                target=lambda: queue.put(factory.get_boto_client("s3", "us-east-1") is parent_client), daemon=True)
+            process.start()
+            process.join(timeout=30)
+
+        assert process.exitcode == 0
+        assert queue.get() is False
+        assert factory.get_boto_client("s3", "us-east-1") is parent_client
+
+    def test_concurrent_calls_create_one_instance(self):
+        """Test threads asking for the same instance share it.
+        """
+        created = FakeBlobStorageClient.created
+        clients = []
+
+        def get_client():
+            clients.append(ProvidersFactory.get_blob_storage_client(FAKE_PROVIDER, "shared"))
+
+        threads = [threading.Thread(target=get_client) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert FakeBlobStorageClient.created == created + 1
+        assert all(client is clients[0] for client in clients)
@@ -0,0 +1,196 @@
+# Copyright © 2020 Amazon Web Services
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+import json
+import os
+import unittest
+
+import mock
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from osdu_api.clients.async_base_client import AsyncBaseClient
+from osdu_api.clients.base_client import BaseClient
+from osdu_api.clients.search.async_search_client import AsyncSearchClient
+from osdu_api.clients.storage.async_record_client import AsyncRecordClient
+from osdu_api.configuration.config_manager import DefaultConfigManager
+from osdu_api.model.search.query_request import QueryRequest
+from osdu_api.model.storage.acl import Acl
+from osdu_api.model.storage.legal import Legal
+from osdu_api.model.storage.record import Record
+
+
+def run_with_server(handler, test):
+    """
+    Start a local aiohttp server answering every request with handler and run test(base_url)
+    """
+    async def _run():
+        app = web.Application()
+        app.router.add_route('*', '/{tail:.*}', handler)
+        server = TestServer(app)
+        await server.start_server()
+        try:
+            return await test(str(server.make_url('')))
+        finally:
+            await server.close()
+    return asyncio.run(_run())
+
+
+class TestAsyncClients(unittest.TestCase):
+
+    @mock.patch.object(BaseClient, '_refresh_service_principal_token', return_value="stubbed")
+    def test_make_request(self, get_bearer_token_mock):
+        received = {}
+
+        async def handler(request):
+            received['method'] = request.method
+            received['headers'] = dict(request.headers)
+            received['query'] = list(request.query.items())
+            received['body'] = await request.text()
+            return web.json_response({'records': []})
+
+        async def test(base_url):
+            async with AsyncRecordClient(DefaultConfigManager(os.getcwd() + '/osdu_api/test/osdu_api.ini'), "opendes") as client:
+                client.service_principal_token = 'stubbed'
+                client.storage_url = base_url
+                return await client.get_latest_record('opendes:welldb:123', attributes=['data.a', 'data.b'])
+
+        # Act
+        response = run_with_server(handler, test)
+
+        # Assert
+        assert response.status_code == 200
+        assert response.json() == {'records': []}
+        assert received['method'] == 'GET'
+        assert received['headers']['Authorization'] == 'Bearer stubbed'
+        assert received['headers']['data-partition-id'] == 'opendes'
+        assert received['query'] == [('attribute', 'data.a'), ('attribute', 'data.b')]
+
+    @mock.patch.object(BaseClient, '_refresh_service_principal_token', return_value="stubbed")
+    def test_concurrent_requests_reuse_model_classes(self, get_bearer_token_mock):
+        bodies = []
+
+        async def handler(request):
+            bodies.append(json.loads(await request.text()))
+            return web.json_response({'results': [], 'totalCount': 0})
+
+        async def test(base_url):
+            async with AsyncSearchClient(DefaultConfigManager(os.getcwd() + '/osdu_api/test/osdu_api.ini'), "opendes") as client:
+                client.service_principal_token = 'stubbed'
+                client.search_url = base_url
+                requests = [client.query_records(QueryRequest('opendes:welldb:wellbore:1.0.0', 'id:%d' % i))
+                            for i in range(20)]
+                return await asyncio.gather(*requests)
+
+        # Act
+        responses = run_with_server(handler, test)
+
+        # Assert
+        assert [response.status_code for response in responses] == [200] * 20
+        assert sorted(body['query'] for body in bodies) == sorted('id:%d' % i for i in range(20))
+
+    @mock.patch.object(AsyncBaseClient, '_refresh_service_principal_token')
+    def test_unauthorized_refreshes_token_and_returns_retried_response(self, refresh_token_mock):
+        calls = []
+
+        def refresh(stale_token=None):
+            calls.append('refresh')
+        refresh_token_mock.side_effect = refresh
+
+        async def handler(request):
+            calls.append(request.headers['Authorization'])
+            if len(calls) == 2:
+                return web.json_response({}, status=401)
+            return web.json_response({'ok': True})
+
+        async def test(base_url):
+            client = AsyncRecordClient(DefaultConfigManager(os.getcwd() + '/osdu_api/test/osdu_api.ini'), "opendes")
+            client.service_principal_token = 'stubbed'
+            client.storage_url = base_url
+            try:
+                return await client.get_record_versions('test')
+            finally:
+                await client.close()
+
+        # Act
+        response = run_with_server(handler, test)
+
+        # Assert
+        assert response.status_code == 200
+        assert calls == ['refresh', 'Bearer stubbed', 'refresh', 'Bearer stubbed']
+
+    @mock.patch.object(BaseClient, '_refresh_service_principal_token', return_value="stubbed")
+    def test_bulk_create_update_records(self, get_bearer_token_mock):
+        async def handler(request):
+            record_ids = [record['id'] for record in json.loads(await request.text())]
+            return web.json_response({'recordCount': len(record_ids), 'recordIds': record_ids}, status=201)
+
+        async def test(base_url):
+            async with AsyncRecordClient(DefaultConfigManager(os.getcwd() + '/osdu_api/test/osdu_api.ini'), "opendes") as client:
+                client.service_principal_token = 'stubbed'
+                client.storage_url = base_url
+                records = (Record('opendes:welldb:wellbore:1.0.0', Acl([], []), Legal([], [], 'compliant'), {},
+                                  'opendes:welldb:%d' % i) for i in range(250))
+                return await client.bulk_create_update_records(records, batch_size=20, max_workers=4)
+
+        # Act
+        result = run_with_server(handler, test)
+
+        # Assert
+        assert result.succeeded
+        assert result.record_count == 250
+        assert sorted(result.record_ids) == sorted('opendes:welldb:%d' % i for i in range(250))
+
+    @mock.patch.object(BaseClient, '_refresh_service_principal_token', return_value="stubbed")
+    def test_fetch_records(self, get_bearer_token_mock):
+        async def handler(request):
+            record_ids = json.loads(await request.text())['records']
+            return web.json_response({'records': [{'id': record_id} for record_id in record_ids
+                                                  if not record_id.endswith('7')],
+                                      'invalidRecords': [], 'retryRecords': []})
+
+        async def test(base_url):
+            async with AsyncRecordClient(DefaultConfigManager(os.getcwd() + '/osdu_api/test/osdu_api.ini'), "opendes") as client:
+                client.service_principal_token = 'stubbed'
+                client.storage_url = base_url
+                result = client.fetch_records(('opendes:welldb:%d' % i for i in range(250)), batch_size=20)
+                return result, [record async for record in result]
+
+        # Act
+        result, records = run_with_server(handler, test)
+
+        # Assert
+        assert len(records) == 225
+        assert sorted(result.missing_record_ids) == sorted('opendes:welldb:%d' % i for i in range(250) if i % 10 == 7)
+        assert not result.failures
+
+    @mock.patch.object(BaseClient, '_refresh_service_principal_token', return_value="stubbed")
+    def test_iter_query_results(self, get_bearer_token_mock):
+        async def handler(request):
+            cursor = (await request.json())['cursor']
+            page = int(cursor) if cursor else 0
+            return web.json_response({'results': [{'id': page * 10 + i} for i in range(10)],
+                                      'cursor': str(page + 1) if page < 2 else None})
+
+        async def test(base_url):
+            async with AsyncSearchClient(DefaultConfigManager(os.getcwd() + '/osdu_api/test/osdu_api.ini'), "opendes") as client:
+                client.service_principal_token = 'stubbed'
+                client.search_url = base_url
+                return [result async for result in client.iter_query_results(QueryRequest('kind', '*'))]
+
+        # Act
+        results = run_with_server(handler, test)
+
+        # Assert
+        assert [result['id'] for result in results] == list(range(30))
@@ -0,0 +1,50 @@
+# Copyright © 2020 Amazon Web Services
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import tempfile
+import unittest
+
+from osdu_api.utils.file_lock import FileLock, FileLockTimeout
+
+
+class TestFileLock(unittest.TestCase):
+
+    def test_exclusive_lock_excludes_other_holders(self):
+        # Arrange
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "test.lock")
+
+            # Act
+            with FileLock(path) as lock:
+                with self.assertRaises(FileLockTimeout):
+                    FileLock(path, timeout=0.1).acquire()
+                locked = lock.is_locked
+
+            # Assert
+            assert locked
+            assert not lock.is_locked
+            with FileLock(path, timeout=0.1):
+                pass
+
+    def test_shared_locks(self):
+        # Arrange
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "test.lock")
+
+            # Act
+            with FileLock(path, shared=True), FileLock(path, shared=True, timeout=0.1) as second:
+                # Assert
+                assert second.is_locked
+                with self.assertRaises(FileLockTimeout):
+                    FileLock(path, timeout=0.1).acquire()
@@ -0,0 +1,111 @@
+# Copyright © 2020 Amazon Web Services
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import unittest
+
+import mock
+
+import osdu_api.model.base as base
+from osdu_api.model.legal.legal_compliance import LegalCompliance
+from osdu_api.model.search.query_request import QueryRequest
+from osdu_api.model.search.sort_order import SortOrder
+from osdu_api.model.search.sort_query import SortQuery
+from osdu_api.model.storage.acl import Acl
+from osdu_api.model.storage.legal import Legal
+from osdu_api.model.storage.record import Record
+from osdu_api.model.storage.record_ancestry import RecordAncestry
+
+
+class TestModelSerialization(unittest.TestCase):
+
+    def _make_record(self):
+        acl = Acl(['data.test1@opendes.testing.com'], ['data.test1@opendes.testing.com'])
+        legal = Legal(['opendes-storage-1579034803194'], ['US'], LegalCompliance.compliant)
+        return Record('opendes:welldb:wellbore:1.0.0', acl, legal, {'id': 'test', 'depth': [1.5, 2]},
+                      id='opendes:welldb:123456', ancestry=RecordAncestry([]), meta=[{}])
+
+    def test_to_json_is_sorted_and_indented(self):
+        # Arrange
+        record = self._make_record()
+
+        # Act
+        record_json = record.to_JSON()
+
+        # Assert
+        assert record_json == json.dumps(json.loads(record_json), sort_keys=True, indent=4)
+        assert json.loads(record_json)['legal']['status'] == 'compliant'
+
+    def test_compact_json_has_same_content(self):
+        # Arrange
+        record = self._make_record()
+
+        # Act
+        compact_json = record.to_JSON(compact=True)
+
+        # Assert
+        assert '\n' not in compact_json and ', ' not in compact_json
+        assert json.loads(compact_json) == json.loads(record.to_JSON())
+
+    def test_compact_json_same_without_orjson(self):
+        # Arrange
+        record = self._make_record()
+        compact_json = record.to_JSON(compact=True)
+
+        # Act
+        with mock.patch.object(base, 'orjson', None):
+            standard_json = record.to_JSON(compact=True)
+
+        # Assert
+        assert json.loads(standard_json) == json.loads(compact_json)
+
+    def test_query_request_renames_from_num_without_changing_it(self):
+        # Arrange
+        query_request = QueryRequest(kind='opendes:*:*:*', query='*', from_num=10,
+                                     sort=SortQuery(['id'], SortOrder.DESC))
+
+        # Act
+        first = json.loads(query_request.to_JSON(compact=True))
+        second = json.loads(query_request.to_JSON())
+
+        # Assert
+        assert first == second
+        assert first['from'] == 10 and 'from_num' not in first
+        assert first['sort'] == {'field': ['id'], 'order': 'DESC'}
+        assert query_request.from_num == 10
+
+    def test_overridden_jsonify_still_used(self):
+        # Arrange
+        class LegacyModel(base.Base):
+            def __init__(self):
+                self.name = 'legacy'
+
+            def jsonify(self, o):
+                return {'legacyName': o.name}
+
+        # Act
+        legacy_json = LegacyModel().to_JSON(compact=True)
+
+        # Assert
+        assert json.loads(legacy_json) == {'legacyName': 'legacy'}
+
+    def test_jsonify_is_deprecated_alias_of_to_dict(self):
+        # Arrange
+        record = self._make_record()
+
+        # Act
+        with self.assertWarns(DeprecationWarning):
+            data = record.jsonify(record)
+
+        # Assert
+        assert data == record.to_dict()
@@ -0,0 +1,104 @@
+# Copyright © 2020 Amazon Web Services
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+import time
+import unittest
+
+from osdu_api.utils.prefetch import PrefetchIterator, prefetch_async
+
+
+class TestPrefetch(unittest.TestCase):
+
+    def test_prefetches_up_to_depth(self):
+        # Arrange
+        fetched = []
+        def source():
+            for i in range(10):
+                fetched.append(i)
+                yield i
+
+        # Act
+        with PrefetchIterator(source(), depth=3) as items:
+            first = next(items)
+            time.sleep(0.1)
+            fetched_ahead = len(fetched)
+            rest = list(items)
+
+        # Assert
+        assert first == 0
+        assert fetched_ahead == 4
+        assert rest == list(range(1, 10))
+
+    def test_prefetch_bounded_by_bytes(self):
+        # Arrange
+        fetched = []
+        def source():
+            for i in range(10):
+                fetched.append(i)
+                yield b'x' * 100
+
+        # Act
+        with PrefetchIterator(source(), depth=5, max_bytes=250, size_of=len) as items:
+            time.sleep(0.1)
+            fetched_ahead = len(fetched)
+            count = len(list(items))
+
+        # Assert
+        assert fetched_ahead == 3
+        assert count == 10
+
+    def test_source_error_raised_after_fetched_items(self):
+        # Arrange
+        def source():
+            yield 1
+            yield 2
+            raise ValueError('page failed')
+
+        items = PrefetchIterator(source(), depth=2)
+
+        # Act & Assert
+        assert next(items) == 1
+        assert next(items) == 2
+        with self.assertRaises(ValueError):
+            next(items)
+        assert list(items) == []
+
+    def test_close_stops_fetching(self):
+        # Arrange
+        items = PrefetchIterator(iter(range(1000)), depth=1)
+        next(items)
+
+        # Act
+        items.close()
+
+        # Assert
+        assert list(items) == []
+        items._thread.join(1)
+        assert not items._thread.is_alive()
+
+    def test_prefetch_async(self):
+        # Arrange
+        async def source():
+            for i in range(20):
+                await asyncio.sleep(0)
+                yield i
+
+        async def collect():
+            return [item async for item in prefetch_async(source(), depth=3, max_bytes=10, size_of=lambda item: 4)]
+
+        # Act
+        items = asyncio.run(collect())
+
+        # Assert
+        assert items == list(range(20))
@@ -17,9 +17,10 @@ import types
 import unittest
 import os
 import mock
+import requests
 
 from osdu_api.clients.base_client import BaseClient
-from osdu_api.clients.storage.record_client import RecordClient
+from osdu_api.clients.storage.record_client import RecordClient, _batch_records
 from osdu_api.model.http_method import HttpMethod
 from osdu_api.model.storage.acl import Acl
 from osdu_api.model.storage.legal import Legal
@@ -161,3 +162,98 @@ class TestRecordClient(unittest.TestCase):
 
         # Assert
         make_request_mock.assert_called_with(method=HttpMethod.GET, url=record_client.storage_url + '/records/versions/test', bearer_token=None)
+
+    def _make_records(self, count: int) -> list:
+        acl = Acl(['data.test1@opendes.testing.com'], ['data.test1@opendes.testing.com'])
+        legal = Legal(['opendes-storage-1579034803194'], ['US'], 'compliant')
+        return [Record('opendes:welldb:wellbore:1.0.0', acl, legal, {'id': i}, 'opendes:welldb:%d' % i)
+                for i in range(count)]
+
+    def test_batch_records_bounded_by_count_and_size(self):
+        # Arrange
+        records = self._make_records(25)
+        record_size = max(len(record.to_JSON()) for record in records) + 1
+
+        # Act
+        by_count = list(_batch_records(iter(records), 10, 10 ** 9))
+        by_size = list(_batch_records(iter(records), 10, 2 + 3 * record_size))
+
+        # Assert
+        assert [len(record_ids) for record_ids, _ in by_count] == [10, 10, 5]
+        assert len(by_size) > 25 // 4 and all(record_ids for record_ids, _ in by_size)
+        assert sum(len(record_ids) for record_ids, _ in by_size) == 25
+        assert [len(json.loads(body)) for _, body in by_count] == [10, 10, 5]
+        assert all(len(body) <= 2 + 3 * record_size for _, body in by_size)
+
+    @mock.patch.object(BaseClient, 'make_request')
+    @mock.patch.object(BaseClient, '_refresh_service_principal_token', return_value="stubbed")
+    def test_bulk_create_update_records(self, get_bearer_token_mock, make_request_mock):
+        # Arrange
+        def make_request(method, url, data, bearer_token):
+            response = requests.Response()
+            record_ids = [record['id'] for record in json.loads(data)]
+            if 'opendes:welldb:0' in record_ids:
+                response.status_code = 400
+                response._content = b'bad request'
+            else:
+                response.status_code = 201
+                response._content = json.dumps({'recordCount': len(record_ids), 'recordIds': record_ids[1:],
+                                                'skippedRecordIds': record_ids[:1]}).encode()
+            return response
+        make_request_mock.side_effect = make_request
+        record_client = RecordClient(DefaultConfigManager(os.getcwd() + '/osdu_api/test/osdu_api.ini'), "opendes")
+        record_client.storage_url = 'stubbed url'
+
+        # Act
+        result = record_client.bulk_create_update_records((record for record in self._make_records(1234)),
+                                                          batch_size=100, max_workers=3)
+
+        # Assert
+        assert make_request_mock.call_count == 13
+        assert make_request_mock.call_args[1]['method'] == HttpMethod.PUT
+        assert make_request_mock.call_args[1]['url'] == 'stubbed url/records'
+        assert result.record_count == 1134
+        assert len(result.record_ids) == 1134 - 12
+        assert len(result.skipped_record_ids) == 12
+        assert not result.succeeded
+        assert result.failures[0].status_code == 400
+        assert result.failed_record_ids == ['opendes:welldb:%d' % i for i in range(100)]
+
+    @mock.patch.object(BaseClient, 'make_request')
+    @mock.patch.object(BaseClient, '_refresh_service_principal_token', return_value="stubbed")
+    def test_fetch_records(self, get_bearer_token_mock, make_request_mock):
+        # Arrange
+        def make_request(method, url, data, bearer_token):
+            response = requests.Response()
+            record_ids = json.loads(data)['records']
+            if 'opendes:welldb:0' in record_ids:
+                response.status_code = 500
+                response._content = b'internal error'
+            else:
+                response.status_code = 200
+                response._content = json.dumps({
+                    'records': [{'id': record_id} for record_id in record_ids[2:]],
+                    'invalidRecords': record_ids[:1],
+                    'retryRecords': []
+                }).encode()
+            return response
+        make_request_mock.side_effect = make_request
+        record_client = RecordClient(DefaultConfigManager(os.getcwd() + '/osdu_api/test/osdu_api.ini'), "opendes")
+        record_client.storage_url = 'stubbed url'
+        record_ids = ['opendes:welldb:%d' % i for i in range(1050)]
+
+        # Act
+        result = record_client.fetch_records(iter(record_ids), max_workers=3)
+        records = list(result)
+
+        # Assert
+        assert make_request_mock.call_count == 11
+        assert make_request_mock.call_args[1]['method'] == HttpMethod.POST
+        assert make_request_mock.call_args[1]['url'] == 'stubbed url/query/records'
+        assert len(records) == 1050 - 100 - 10 * 2
+        assert len(result.invalid_record_ids) == 10
+        assert len(result.missing_record_ids) == 10
+        assert result.failures[0].status_code == 500
+        assert result.failures[0].record_ids == record_ids[:100]
+        assert sorted(result.failed_record_ids + [record['id'] for record in records]) == sorted(record_ids)
+        assert not result.succeeded
@@ -0,0 +1,155 @@
+# Copyright © 2020 Amazon Web Services
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import time
+import unittest
+
+import mock
+import requests
+import responses
+
+from osdu_api.clients.base_client import BaseClient
+from osdu_api.clients.retry_policy import RetryPolicy
+from osdu_api.configuration.config_manager import DefaultConfigManager
+from osdu_api.model.http_method import HttpMethod
+
+
+def make_response(status_code: int, headers: dict = None) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    return response
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def test_idempotency_rules(self):
+        policy = RetryPolicy()
+
+        assert policy.is_retryable(HttpMethod.PUT, make_response(503))
+        assert policy.is_retryable(HttpMethod.POST, make_response(429))
+        assert not policy.is_retryable(HttpMethod.POST, make_response(503))
+        assert not policy.is_retryable(HttpMethod.GET, make_response(404))
+        assert not policy.is_retryable(HttpMethod.POST, None, request_sent=True)
+        assert policy.is_retryable(HttpMethod.POST, None, request_sent=False)
+        assert RetryPolicy(retry_non_idempotent=True).is_retryable(HttpMethod.POST, make_response(503))
+
+    def test_retry_after_takes_precedence_over_backoff(self):
+        policy = RetryPolicy(backoff_factor=100)
+
+        delay = policy.get_retry_delay(HttpMethod.GET, 1, time.monotonic(), make_response(429, {'Retry-After': '2'}))
+
+        assert delay == 2
+
+    def test_retry_after_http_date(self):
+        retry_after = RetryPolicy.get_retry_after(make_response(503, {'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'}))
+
+        assert retry_after == 0
+
+    def test_backoff_is_bounded(self):
+        policy = RetryPolicy(backoff_factor=1, max_backoff=4)
+
+        assert all(0 <= policy.get_backoff(attempt) <= 4 for attempt in range(1, 20))
+
+    def test_stops_after_max_attempts_and_deadline(self):
+        policy = RetryPolicy(max_attempts=3, deadline=10)
+
+        assert policy.get_retry_delay(HttpMethod.GET, 3, time.monotonic(), make_response(503)) is None
+        assert policy.get_retry_delay(HttpMethod.GET, 1, time.monotonic() - 11, make_response(503)) is None
+        assert policy.get_retry_delay(HttpMethod.GET, 1, time.monotonic(), make_response(429, {'Retry-After': '60'})) is None
+
+    def test_from_config(self):
+        config_manager = DefaultConfigManager(os.getcwd() + '/osdu_api/test/osdu_api.ini')
+        config_manager._parser.read_dict({'retry': {'max_attempts': '7', 'retry_statuses': '429,503', 'deadline': '0'}})
+
+        policy = RetryPolicy.from_config(config_manager)
+
+        assert policy.max_attempts == 7
+        assert policy.retry_statuses == frozenset([429, 503])
+        assert policy.deadline is None
+
+
+class TestMakeRequestRetries(unittest.TestCase):
+
+    def _client(self, **kwargs) -> BaseClient:
+        client = BaseClient(DefaultConfigManager(os.getcwd() + '/osdu_api/test/osdu_api.ini'), "opendes", **kwargs)
+        client.service_principal_token = 'stubbed'
+        return client
+
+    @responses.activate
+    @mock.patch('osdu_api.clients.base_client.time.sleep')
+    @mock.patch.object(BaseClient, '_refresh_service_principal_token', return_value="stubbed")
+    def test_throttled_request_is_retried(self, mocked_token_method, mocked_sleep):
+        client = self._client()
+        responses.add(responses.POST, 'http://stubbed', status=429, headers={'Retry-After': '1'})
+        responses.add(responses.POST, 'http://stubbed', json={'response': 'true'}, status=200)
+
+        response = client.make_request(method=HttpMethod.POST, url='http://stubbed', data='{}')
+
+        assert response.status_code == 200
+        assert len(responses.calls) == 2
+        mocked_sleep.assert_called_once_with(1.0)
+
+    @responses.activate
+    @mock.patch('osdu_api.clients.base_client.time.sleep')
+    @mock.patch.object(BaseClient, '_refresh_service_principal_token', return_value="stubbed")
+    def test_server_error_not_retried_for_post(self, mocked_token_method, mocked_sleep):
+        client = self._client()
+        responses.add(responses.POST, 'http://stubbed', status=500)
+
+        response = client.make_request(method=HttpMethod.POST, url='http://stubbed', data='{}')
+
+        assert response.status_code == 500
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    @mock.patch('osdu_api.clients.base_client.time.sleep')
+    @mock.patch.object(BaseClient, '_refresh_service_principal_token', return_value="stubbed")
+    def test_server_error_retried_until_max_attempts(self, mocked_token_method, mocked_sleep):
+        client = self._client(retry_policy=RetryPolicy(max_attempts=4))
+        responses.add(responses.GET, 'http://stubbed', status=503)
+
+        response = client.make_request(method=HttpMethod.GET, url='http://stubbed')
+
+        assert response.status_code == 503
+        assert len(responses.calls) == 4
+        assert mocked_sleep.call_count == 3
+
+    @responses.activate
+    @mock.patch('osdu_api.clients.base_client.time.sleep')
+    @mock.patch.object(BaseClient, '_refresh_service_principal_token', return_value="stubbed")
+    def test_connection_error_retried_for_get(self, mocked_token_method, mocked_sleep):
+        client = self._client()
+        responses.add(responses.GET, 'http://stubbed', body=requests.exceptions.ConnectionError())
+        responses.add(responses.GET, 'http://stubbed', status=200)
+
+        response = client.make_request(method=HttpMethod.GET, url='http://stubbed')
+
+        assert response.status_code == 200
+
+    @responses.activate
+    @mock.patch.object(BaseClient, '_refresh_service_principal_token')
+    def test_unauthorized_returns_response_of_retry(self, mocked_token_method):
+        client = self._client()
+
+        def refresh(stale_token=None):
+            client.service_principal_token = 'refreshed'
+        mocked_token_method.side_effect = refresh
+        responses.add(responses.GET, 'http://stubbed', status=401)
+        responses.add(responses.GET, 'http://stubbed', status=200)
+
+        response = client.make_request(method=HttpMethod.GET, url='http://stubbed')
+
+        assert response.status_code == 200
+        assert responses.calls[1].request.headers['Authorization'] == 'Bearer refreshed'
@@ -11,10 +11,12 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import json
 import unittest
 
 import mock
 import os
+import requests
 from osdu_api.clients.base_client import BaseClient
 from osdu_api.clients.search.search_client import SearchClient
 from osdu_api.model.http_method import HttpMethod
@@ -39,4 +41,47 @@ class TestSeachClient(unittest.TestCase):
         response = client.query_records(query_request)
 
         # Assert
-        assert response == make_request_mock.return_value
\ No newline at end of file
+        assert response == make_request_mock.return_value
+
+    @mock.patch.object(BaseClient, 'make_request')
+    @mock.patch.object(BaseClient, '_refresh_service_principal_token', return_value="stubbed")
+    def test_iter_query_results_follows_cursor(self, get_bearer_token_mock, make_request_mock):
+        # Arrange
+        def make_request(method, url, data, bearer_token):
+            cursor = json.loads(data)['cursor']
+            page = int(cursor) if cursor else 0
+            response = requests.Response()
+            response.status_code = 200
+            response._content = json.dumps({
+                'results': [{'id': 'opendes:welldb:%d' % (page * 10 + i)} for i in range(10)],
+                'cursor': str(page + 1) if page < 4 else None,
+                'totalCount': 50
+            }).encode()
+            return response
+        make_request_mock.side_effect = make_request
+        client = SearchClient(DefaultConfigManager(os.getcwd() + '/osdu_api/test/osdu_api.ini'), "opendes")
+        client.search_url = 'stubbed url'
+        query_request = QueryRequest('kind', '*', limit=10)
+
+        # Act
+        results = list(client.iter_query_results(query_request, prefetch_pages=2))
+
+        # Assert
+        assert [result['id'] for result in results] == ['opendes:welldb:%d' % i for i in range(50)]
+        assert make_request_mock.call_count == 5
+        assert make_request_mock.call_args[1]['url'] == 'stubbed url/query_with_cursor'
+        assert query_request.cursor is None
+
+    @mock.patch.object(BaseClient, 'make_request')
+    @mock.patch.object(BaseClient, '_refresh_service_principal_token', return_value="stubbed")
+    def test_iter_query_pages_raises_http_error(self, get_bearer_token_mock, make_request_mock):
+        # Arrange
+        response = requests.Response()
+        response.status_code = 400
+        response._content = b'bad request'
+        make_request_mock.return_value = response
+        client = SearchClient(DefaultConfigManager(os.getcwd() + '/osdu_api/test/osdu_api.ini'), "opendes")
+
+        # Act & Assert
+        with self.assertRaises(requests.HTTPError):
+            list(client.iter_query_pages(QueryRequest('kind', '*')))
@@ -0,0 +1,119 @@
+#  Copyright 2020 Google LLC
+#  Copyright 2020 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import base64
+import json
+import os
+import threading
+import time
+import unittest
+from unittest import mock
+
+from osdu_api.auth.authorization import TokenRefresher
+from osdu_api.auth.token_cache import TokenCache, get_token_cache, get_token_expiry, is_token_expiring
+from osdu_api.clients.base_client import BaseClient
+from osdu_api.clients.storage.record_client import RecordClient
+from osdu_api.configuration.config_manager import DefaultConfigManager
+
+
+def make_jwt(expires_in: float) -> str:
+    def encode(part: dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(part).encode()).decode().rstrip("=")
+    return "{}.{}.signature".format(encode({"alg": "none"}), encode({"exp": int(time.time() + expires_in)}))
+
+
+class TestTokenCache(unittest.TestCase):
+
+    def test_get_token_expiry(self):
+        token = make_jwt(3600)
+
+        self.assertAlmostEqual(get_token_expiry(token), time.time() + 3600, delta=2)
+        self.assertEqual(get_token_expiry("Bearer " + token), get_token_expiry(token))
+        self.assertIsNone(get_token_expiry("opaque"))
+        self.assertIsNone(get_token_expiry("a.!!!.c"))
+        self.assertTrue(is_token_expiring(make_jwt(30), refresh_margin=60))
+        self.assertFalse(is_token_expiring(make_jwt(3600), refresh_margin=60))
+
+    def test_token_served_until_refresh_margin(self):
+        cache = TokenCache(refresh_margin=60)
+        fresh, expiring = make_jwt(3600), make_jwt(30)
+        fetch = mock.Mock(side_effect=[expiring, fresh])
+
+        self.assertEqual(cache.get_token("key", fetch), expiring)
+        self.assertEqual(cache.get_token("key", fetch), fresh)
+        self.assertEqual(cache.get_token("key", fetch), fresh)
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_stale_token_is_replaced_once(self):
+        cache = TokenCache()
+        first, second = make_jwt(3600), make_jwt(3600) + "2"
+        fetch = mock.Mock(side_effect=[first, second])
+        cache.get_token("key", fetch)
+
+        self.assertEqual(cache.get_token("key", fetch, stale_token=first), second)
+        # a caller still holding the stale token gets the refreshed one
+        self.assertEqual(cache.get_token("key", fetch, stale_token=first), second)
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_single_flight_refresh(self):
+        cache = TokenCache()
+        token = make_jwt(3600)
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.05)
+            return token
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_token("key", fetch)))
+                   for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(results, [token] * 16)
+        self.assertEqual(len(calls), 1)
+
+    def test_clients_share_service_principal_token(self):
+        get_token_cache().invalidate()
+        token = make_jwt(3600)
+        config_manager = DefaultConfigManager(os.getcwd() + '/osdu_api/test/osdu_api.ini')
+        with mock.patch.object(BaseClient, '_fetch_service_principal_token', return_value=token) as fetch:
+            clients = [RecordClient(config_manager, "opendes") for _ in range(5)]
+
+        self.assertEqual([client.service_principal_token for client in clients], [token] * 5)
+        fetch.assert_called_once()
+        get_token_cache().invalidate()
+
+    def test_token_refresher_uses_cache(self):
+        token = make_jwt(3600)
+
+        class Refresher(TokenRefresher):
+            def __init__(self, cache):
+                super().__init__(token_cache=cache, cache_key="refresher")
+                self.calls = 0
+
+            def refresh_token(self) -> str:
+                self.calls += 1
+                return token
+
+        cache = TokenCache()
+        first, second = Refresher(cache), Refresher(cache)
+
+        self.assertEqual(first.access_token, token)
+        self.assertEqual(second.authorization_header, {"Authorization": f"Bearer {token}"})
+        self.assertEqual(first.calls + second.calls, 1)
@@ -0,0 +1,151 @@
+#  Copyright 2020 Google LLC
+#  Copyright 2020 EPAM Systems
+#
+#  Licensed under the Apache License, Version 2.0 (the "License");
+#  you may not use this file except in compliance with the License.
+#  You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+#  Unless required by applicable law or agreed to in writing, software
+#  distributed under the License is distributed on an "AS IS" BASIS,
+#  WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#  See the License for the specific language governing permissions and
+#  limitations under the License.
+
+import multiprocessing
+import os
+import pathlib
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from osdu_api.auth.token_store import TOKEN_STORE_DIR_ENV, FileTokenStore, get_token_store
+from osdu_api.providers.types import BaseCredentials
+from osdu_api.test.test_token_cache import make_jwt
+
+
+def _get_token_in_process(directory: str, counter_path: str, token: str, queue):
+    def fetch():
+        with open(counter_path, "a") as counter:
+            counter.write("1")
+        time.sleep(0.2)
+        return token
+    queue.put(FileTokenStore(directory).get_token(("key",), fetch))
+
+
+class FakeCredentials(BaseCredentials):
+
+    def __init__(self, tokens):
+        self._access_token = None
+        self.mint = mock.Mock(side_effect=tokens)
+
+    def refresh_token(self) -> str:
+        self._access_token = self._get_or_mint_token(self.mint)
+        return self._access_token
+
+    @property
+    def access_token(self) -> str:
+        return self._access_token
+
+
+class TestFileTokenStore(unittest.TestCase):
+
+    def setUp(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.tmp_path = pathlib.Path(temp_dir.name)
+
+    def test_token_served_until_refresh_margin(self):
+        store = FileTokenStore(str(self.tmp_path), refresh_margin=60)
+        fresh, expiring = make_jwt(3600), make_jwt(30)
+        fetch = mock.Mock(side_effect=[expiring, fresh])
+
+        self.assertEqual(store.get_token(("key",), fetch), expiring)
+        self.assertEqual(store.get_token(("key",), fetch), fresh)
+        # another store on the same directory, like another process, reads the stored token
+        self.assertEqual(FileTokenStore(str(self.tmp_path)).get_token(("key",), fetch), fresh)
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_opaque_token_expires_after_default_ttl(self):
+        store = FileTokenStore(str(self.tmp_path), refresh_margin=0, default_ttl=0.1)
+        fetch = mock.Mock(side_effect=["first", "second"])
+
+        self.assertEqual(store.get_token(("key",), fetch), "first")
+        time.sleep(0.2)
+        self.assertEqual(store.get_token(("key",), fetch), "second")
+
+    def test_stale_token_is_replaced_once(self):
+        store = FileTokenStore(str(self.tmp_path))
+        first, second = make_jwt(3600), make_jwt(3600) + "2"
+        fetch = mock.Mock(side_effect=[first, second])
+        store.get_token(("key",), fetch)
+
+        self.assertEqual(store.get_token(("key",), fetch, stale_token=first), second)
+        self.assertEqual(store.get_token(("key",), fetch, stale_token=first), second)
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_token_files_private(self):
+        directory = self.tmp_path / "tokens"
+        store = FileTokenStore(str(directory))
+        store.get_token(("key",), lambda: make_jwt(3600))
+
+        entries = [name for name in os.listdir(directory) if name.endswith(".json")]
+        self.assertEqual(stat.S_IMODE(os.stat(directory).st_mode) & 0o077, 0)
+        self.assertEqual(len(entries), 1)
+        self.assertEqual(stat.S_IMODE(os.stat(directory / entries[0]).st_mode), 0o600)
+
+        store.invalidate()
+        self.assertEqual([name for name in os.listdir(directory) if name.endswith(".json")], [])
+
+    def test_single_mint_across_processes(self):
+        token = make_jwt(3600)
+        counter_path = str(self.tmp_path / "counter")
+        context = multiprocessing.get_context("fork")
+        queue = context.Queue()
+        processes = [context.Process(target=_get_token_in_process,
+                                     args=(str(self.tmp_path / "tokens"), counter_path, token, queue))
+                     for _ in range(4)]
+        for process in processes:
+            process.start()
+        results = [queue.get(timeout=30) for _ in processes]
+        for process in processes:
+            process.join()
+
+        self.assertEqual(results, [token] * 4)
+        with open(counter_path) as counter:
+            self.assertEqual(counter.read(), "1")
+
+    def test_credentials_share_stored_token(self):
+        first, second = make_jwt(3600), make_jwt(3600) + "2"
+        credentials = FakeCredentials([first, second])
+        other_credentials = FakeCredentials([])
+
+        with mock.patch.dict(os.environ, {TOKEN_STORE_DIR_ENV: str(self.tmp_path)}):
+            self.assertEqual(credentials.refresh_token(), first)
+            self.assertEqual(other_credentials.refresh_token(), first)
+            # refreshing replaces the token held by the credentials
+            self.assertEqual(credentials.refresh_token(), second)
+            self.assertEqual(other_credentials.refresh_token(), second)
+            self.assertIs(get_token_store(), get_token_store())
+
+    def test_store_disabled_by_default(self):
+        credentials = FakeCredentials(["first", "second"])
+
+        with mock.patch.dict(os.environ):
+            os.environ.pop(TOKEN_STORE_DIR_ENV, None)
+            self.assertIsNone(get_token_store())
+            self.assertEqual(credentials.refresh_token(), "first")
+            self.assertEqual(credentials.refresh_token(), "second")
+        # the token being replaced is passed to the mint function, which must not serve it again
+        self.assertEqual(credentials.mint.call_args_list, [mock.call(None), mock.call("first")])
+
+    def test_credentials_importable_without_fcntl(self):
+        # fcntl is missing on Windows, where the store is not used
+        code = "import sys; sys.modules['fcntl'] = None; import osdu_api.providers.types"
+
+        self.assertEqual(subprocess.run([sys.executable, "-c", code]).returncode, 0)
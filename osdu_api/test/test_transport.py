@@ -0,0 +1,88 @@
+# Copyright © 2020 Amazon Web Services
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import os
+import unittest
+
+import mock
+import responses
+
+from osdu_api.clients.base_client import BaseClient
+from osdu_api.clients.search.search_client import SearchClient
+from osdu_api.clients.storage.record_client import RecordClient
+from osdu_api.clients.transport import PooledTransport, SimpleTransport, get_shared_transport
+from osdu_api.configuration.config_manager import DefaultConfigManager
+from osdu_api.model.http_method import HttpMethod
+
+
+class TestTransport(unittest.TestCase):
+
+    @mock.patch.object(BaseClient, '_refresh_service_principal_token', return_value="stubbed")
+    def test_clients_share_pooled_transport_by_default(self, mocked_token_method):
+        # Arrange
+        config_manager = DefaultConfigManager(os.getcwd() + '/osdu_api/test/osdu_api.ini')
+
+        # Act
+        record_client = RecordClient(config_manager, "opendes")
+        search_client = SearchClient(config_manager, "opendes")
+
+        # Assert
+        assert isinstance(record_client.transport, PooledTransport)
+        assert record_client.transport is search_client.transport
+        assert record_client.transport is get_shared_transport()
+
+    @mock.patch.object(BaseClient, '_refresh_service_principal_token', return_value="stubbed")
+    def test_transport_selected_from_config(self, mocked_token_method):
+        # Arrange
+        config_manager = DefaultConfigManager(os.getcwd() + '/osdu_api/test/osdu_api.ini')
+        config_manager._parser.read_dict({'transport': {'type': 'simple'}})
+
+        # Act
+        client = BaseClient(config_manager, "opendes")
+
+        # Assert
+        assert isinstance(client.transport, SimpleTransport)
+
+    @mock.patch.object(BaseClient, '_refresh_service_principal_token', return_value="stubbed")
+    def test_pool_settings_from_config(self, mocked_token_method):
+        # Arrange
+        config_manager = DefaultConfigManager(os.getcwd() + '/osdu_api/test/osdu_api.ini')
+        config_manager._parser.read_dict({'transport': {'shared': 'false', 'pool_maxsize': '32'}})
+
+        # Act
+        client = BaseClient(config_manager, "opendes")
+
+        # Assert
+        assert client.transport is not get_shared_transport()
+        assert client.transport.pool_maxsize == 32
+        assert client.transport.session.get_adapter('https://stubbed')._pool_maxsize == 32
+
+    @responses.activate
+    @mock.patch.object(BaseClient, '_refresh_service_principal_token', return_value="stubbed")
+    def test_make_request_through_pooled_transport(self, mocked_token_method):
+        # Arrange
+        client = BaseClient(DefaultConfigManager(os.getcwd() + '/osdu_api/test/osdu_api.ini'), "opendes",
+                            transport=PooledTransport())
+        client.service_principal_token = 'stubbed'
+        responses.add(responses.GET, 'http://stubbed', json={'response': 'true'}, status=200)
+        responses.add(responses.PATCH, 'http://stubbed', json={'response': 'true'}, status=200)
+
+        # Act
+        get_response = client.make_request(method=HttpMethod.GET, url='http://stubbed')
+        patch_response = client.make_request(method=HttpMethod.PATCH, url='http://stubbed', data='{}')
+
+        # Assert
+        assert get_response.status_code == 200
+        assert patch_response.status_code == 200
+        assert responses.calls[0].request.headers['Authorization'] == 'Bearer stubbed'
+        assert responses.calls[0].request.headers['data-partition-id'] == 'opendes'
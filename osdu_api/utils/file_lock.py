@@ -0,0 +1,106 @@
+# Copyright © 2020 Amazon Web Services
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Advisory file locks shared by the processes and threads of a host."""
+
+import os
+import time
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # not available on Windows, only the cache and the token store take file locks
+    fcntl = None
+
+
+class FileLockTimeout(Exception):
+    """Raised when a file lock is not acquired within the given timeout."""
+
+
+class FileLock:
+    """
+    Exclusive or shared flock(2) lock on a lock file, created if missing.
+
+    Every acquisition opens the lock file anew, so the lock also excludes other threads
+    of the same process. The lock is released when the holder closes it, exits, or dies.
+    Lock files are never removed, removing them while another process waits would let two
+    holders in.
+    """
+
+    def __init__(self, path: str, shared: bool = False, timeout: Optional[float] = None,
+                 poll_interval: float = 0.05):
+        """
+        :param path: Path of the lock file
+        :type path: str
+        :param shared: Take a shared instead of an exclusive lock, defaults to False
+        :type shared: bool, optional
+        :param timeout: Seconds to wait for the lock, None waits forever, defaults to None
+        :type timeout: float, optional
+        :param poll_interval: Seconds between attempts when a timeout is given, defaults to 0.05
+        :type poll_interval: float, optional
+        """
+        self.path = path
+        self.shared = shared
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._fd = None
+
+    @property
+    def is_locked(self) -> bool:
+        return self._fd is not None
+
+    def acquire(self):
+        """
+        Wait for the lock.
+
+        :raises FileLockTimeout: When the lock is not acquired within the timeout
+        """
+        if self._fd is not None:
+            raise RuntimeError(f"Lock {self.path} is already held.")
+        if fcntl is None:
+            raise NotImplementedError("File locks require fcntl, which is not available on this platform.")
+        operation = fcntl.LOCK_SH if self.shared else fcntl.LOCK_EX
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+        try:
+            if self.timeout is None:
+                fcntl.flock(fd, operation)
+            else:
+                deadline = time.monotonic() + self.timeout
+                while True:
+                    try:
+                        fcntl.flock(fd, operation | fcntl.LOCK_NB)
+                        break
+                    except BlockingIOError:
+                        if time.monotonic() >= deadline:
+                            raise FileLockTimeout(f"Lock {self.path} not acquired within {self.timeout}s.")
+                        time.sleep(self.poll_interval)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._fd = fd
+
+    def release(self):
+        """
+        Release the lock if it is held.
+        """
+        if self._fd is not None:
+            fd, self._fd = self._fd, None
+            # closing the descriptor releases the lock
+            os.close(fd)
+
+    def __enter__(self) -> "FileLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
@@ -0,0 +1,188 @@
+# Copyright © 2020 Amazon Web Services
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Iterators that fetch the next items of a slow source in the background."""
+
+import asyncio
+import collections
+import threading
+from typing import AsyncIterator, Callable, Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar('T')
+
+_DONE = object()
+
+
+class PrefetchIterator(Iterator[T]):
+    """
+    Iterates over source while a background thread already fetches up to depth items ahead,
+    e.g. the next page of a paginated api while the caller processes the current one.
+
+    When max_bytes is set, no new item is fetched while the buffered items, measured by size_of,
+    take max_bytes or more; the buffer may exceed the bound by the size of one item.
+    Errors raised by source are raised by next() once the items fetched before were consumed.
+    Call close() (or use it as context manager) to stop fetching when not iterating to the end.
+    """
+
+    def __init__(self, source: Iterable[T], depth: int = 1, max_bytes: Optional[int] = None,
+                 size_of: Callable[[T], int] = None):
+        """
+        :param source: Items to iterate over
+        :type source: Iterable[T]
+        :param depth: Maximum number of items fetched ahead, 0 fetches on demand without a thread, defaults to 1
+        :type depth: int, optional
+        :param max_bytes: Bound of the size of the buffered items, defaults to None for no bound
+        :type max_bytes: int, optional
+        :param size_of: Size of an item in bytes, required with max_bytes
+        :type size_of: Callable[[T], int], optional
+        """
+        if max_bytes is not None and size_of is None:
+            raise ValueError("size_of is required to bound the prefetched bytes")
+        self._source = iter(source)
+        self._depth = max(0, depth)
+        self._max_bytes = max_bytes
+        self._size_of = size_of
+        self._buffer = collections.deque()
+        self._buffered_bytes = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = None
+        if self._depth:
+            self._thread = threading.Thread(target=self._fetch, name='prefetch', daemon=True)
+            self._thread.start()
+
+    def _is_full(self) -> bool:
+        if len(self._buffer) >= self._depth:
+            return True
+        return self._max_bytes is not None and bool(self._buffer) and self._buffered_bytes >= self._max_bytes
+
+    def _fetch(self):
+        while True:
+            with self._condition:
+                while self._is_full() and not self._closed:
+                    self._condition.wait()
+                if self._closed:
+                    return
+            try:
+                item = next(self._source)
+                size = self._size_of(item) if self._max_bytes is not None else 0
+            except StopIteration:
+                item, size = _DONE, 0
+            except BaseException as err:
+                item, size = err, 0
+            with self._condition:
+                self._buffer.append((item, size))
+                self._buffered_bytes += size
+                self._condition.notify_all()
+            if item is _DONE or isinstance(item, BaseException):
+                return
+
+    def __iter__(self) -> "PrefetchIterator[T]":
+        return self
+
+    def __next__(self) -> T:
+        if self._thread is None:
+            if self._closed:
+                raise StopIteration
+            return next(self._source)
+
+        with self._condition:
+            while not self._buffer and not self._closed:
+                self._condition.wait()
+            if not self._buffer:
+                raise StopIteration
+            item, size = self._buffer[0]
+            if item is _DONE:
+                raise StopIteration
+            self._buffer.popleft()
+            self._buffered_bytes -= size
+            self._condition.notify_all()
+        if isinstance(item, BaseException):
+            self._closed = True
+            raise item
+        return item
+
+    def close(self):
+        """
+        Stop fetching and drop the buffered items. An item being fetched is completed first.
+        """
+        with self._condition:
+            self._closed = True
+            self._buffer.clear()
+            self._buffered_bytes = 0
+            self._condition.notify_all()
+
+    def __enter__(self) -> "PrefetchIterator[T]":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+async def prefetch_async(source: AsyncIterator[T], depth: int = 1, max_bytes: Optional[int] = None,
+                         size_of: Callable[[T], int] = None) -> AsyncIterator[T]:
+    """
+    Asyncio counterpart of PrefetchIterator: a task fetches up to depth items of source
+    ahead of the caller, bounded by max_bytes as measured by size_of.
+    """
+    if max_bytes is not None and size_of is None:
+        raise ValueError("size_of is required to bound the prefetched bytes")
+    if depth <= 0:
+        async for item in source:
+            yield item
+        return
+
+    buffer = collections.deque()
+    buffered_bytes = 0
+    changed = asyncio.Event()
+
+    def is_full() -> bool:
+        if len(buffer) >= depth:
+            return True
+        return max_bytes is not None and bool(buffer) and buffered_bytes >= max_bytes
+
+    async def fetch():
+        nonlocal buffered_bytes
+        while True:
+            while is_full():
+                changed.clear()
+                await changed.wait()
+            try:
+                item = await source.__anext__()
+                size = size_of(item) if max_bytes is not None else 0
+            except StopAsyncIteration:
+                item, size = _DONE, 0
+            except Exception as err:
+                item, size = err, 0
+            buffer.append((item, size))
+            buffered_bytes += size
+            changed.set()
+            if item is _DONE or isinstance(item, Exception):
+                return
+
+    task = asyncio.ensure_future(fetch())
+    try:
+        while True:
+            while not buffer:
+                changed.clear()
+                await changed.wait()
+            item, size = buffer.popleft()
+            buffered_bytes -= size
+            changed.set()
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        task.cancel()
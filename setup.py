@@ -57,7 +57,10 @@ setuptools.setup(
         "dataclasses==0.8;python_version<'3.7'"
     ],
     extras_require={
-        "all": ["requests==2.25.1", "tenacity==6.2.0"]
+        "all": ["requests==2.25.1", "tenacity==6.2.0"],
+        "async": ["aiohttp==3.7.4"],
+        "fast-json": ["orjson==3.5.2"],
+        "zstd": ["zstandard==0.15.2"]
     },
     python_requires='>=3.6',
 )